@@ -0,0 +1,103 @@
+"""initial schema
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2024-05-01 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0001_initial_schema"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False, unique=True),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("timezone", sa.String(), nullable=False),
+        sa.Column("priority_weight", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "events",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("duration_min", sa.Integer(), nullable=False),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("time_windows", sa.JSON(), nullable=True),
+        sa.Column("flex", sa.JSON(), nullable=True),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("travel_time_min", sa.Integer(), nullable=False),
+        sa.Column("calendar_id", sa.String(), nullable=True),
+        sa.Column("external_ids", sa.JSON(), nullable=True),
+        sa.Column("constraints", sa.JSON(), nullable=True),
+        sa.Column("metadata", sa.JSON(), nullable=True),
+        sa.Column("family_key", sa.String(), nullable=True),
+        sa.Column("pomodoro_opt_in", sa.Boolean(), nullable=False),
+    )
+    op.create_table(
+        "task_dependencies",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "task_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("events.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "depends_on_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("events.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("type", sa.String(2), nullable=False),
+        sa.Column("lag_min", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "task_families",
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("weight", sa.Float(), nullable=False),
+        sa.Column("min_daily_minutes", sa.Integer(), nullable=True),
+        sa.Column("weekly_target_minutes", sa.Integer(), nullable=True),
+        sa.Column("max_daily_minutes", sa.Integer(), nullable=True),
+    )
+    op.create_table(
+        "user_pomodoro_settings",
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("enabled", sa.Boolean(), nullable=False),
+        sa.Column("pomodoro_len_min", sa.Integer(), nullable=False),
+        sa.Column("short_break_min", sa.Integer(), nullable=False),
+        sa.Column("long_break_min", sa.Integer(), nullable=False),
+        sa.Column("long_break_every", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_pomodoro_settings")
+    op.drop_table("task_families")
+    op.drop_table("task_dependencies")
+    op.drop_table("events")
+    op.drop_table("users")
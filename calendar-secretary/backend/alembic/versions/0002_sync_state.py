@@ -0,0 +1,43 @@
+"""event updated_at and CalDAV accounts
+
+Revision ID: 0002_sync_state
+Revises: 0001_initial_schema
+Create Date: 2024-05-08 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0002_sync_state"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "events",
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_table(
+        "caldav_accounts",
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("calendar_url", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("encrypted_password", sa.LargeBinary(), nullable=False),
+        sa.Column("sync_token", sa.String(), nullable=True),
+        sa.Column("pushed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("caldav_accounts")
+    with op.batch_alter_table("events") as batch:
+        batch.drop_column("updated_at")
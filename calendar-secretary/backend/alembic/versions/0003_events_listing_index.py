@@ -0,0 +1,22 @@
+"""composite index for paginated event listing
+
+Revision ID: 0003_events_listing_index
+Revises: 0002_sync_state
+Create Date: 2024-05-15 00:00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003_events_listing_index"
+down_revision = "0002_sync_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_events_user_deadline_family", "events", ["user_id", "deadline", "family_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_user_deadline_family", table_name="events")
@@ -0,0 +1,42 @@
+"""event time-window span for calendar-range listing
+
+Revision ID: 0004_event_window_span
+Revises: 0003_events_listing_index
+Create Date: 2024-05-22 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.models.event import window_columns
+
+# revision identifiers, used by Alembic.
+revision = "0004_event_window_span"
+down_revision = "0003_events_listing_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("window_start", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("events", sa.Column("window_end", sa.DateTime(timezone=True), nullable=True))
+    events = sa.table(
+        "events",
+        sa.column("id", postgresql.UUID(as_uuid=True)),
+        sa.column("time_windows", sa.JSON()),
+        sa.column("window_start", sa.DateTime(timezone=True)),
+        sa.column("window_end", sa.DateTime(timezone=True)),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(events.c.id, events.c.time_windows).where(events.c.time_windows.is_not(None)))
+    for event_id, time_windows in rows.all():
+        bind.execute(events.update().where(events.c.id == event_id).values(**window_columns(time_windows)))
+    op.create_index("ix_events_user_window", "events", ["user_id", "window_start", "window_end"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_user_window", table_name="events")
+    with op.batch_alter_table("events") as batch:
+        batch.drop_column("window_end")
+        batch.drop_column("window_start")
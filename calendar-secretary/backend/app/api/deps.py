@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from fastapi import Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_async_db
+from app.models.user import User
+from app.services.planner.pool import SolverPoolBusy, SolverPoolTimeout
+from app.services.planner.rules import DependencyGraphError
+from app.services.planner.solve import PlanInfeasible
+
+
+async def get_current_user(db: AsyncSession = Depends(get_async_db)) -> User:
+    """The user requests act for; single-user deployments use the first user."""
+    user = (await db.execute(select(User).limit(1))).scalar_one_or_none()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User context missing")
+    return user
+
+
+@contextmanager
+def planner_errors() -> Iterator[None]:
+    """Answer planner service errors with their HTTP status."""
+    try:
+        yield
+    except DependencyGraphError as exc:
+        raise HTTPException(status_code=422, detail={"message": str(exc), "cycle": exc.cycle}) from exc
+    except PlanInfeasible as exc:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(exc.diagnosis)) from exc
+    except SolverPoolBusy as exc:
+        raise HTTPException(status_code=429, detail=str(exc), headers={"Retry-After": "1"}) from exc
+    except SolverPoolTimeout as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
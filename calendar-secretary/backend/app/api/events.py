@@ -1,61 +1,196 @@
 from __future__ import annotations
 
-from typing import Any
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.db import get_async_db
 from app.models.event import Event, TaskDependency
 from app.models.user import User
-from app.schemas.event import EventCreate, EventSchema, EventUpdate
+from app.schemas.event import EventBatchRequest, EventBatchResponse, EventCreate, EventSchema, EventUpdate
+from app.services.events.batch import EventBatchService
+from app.services.planner.rules import DependencyGraphError, topological_sort
 
 router = APIRouter()
 
 
-def _apply_dependencies(event: Event, depends_on: list[dict[str, Any]], db: Session) -> None:
-    event.dependencies.clear()
+async def _apply_dependencies(event: Event, depends_on: list[dict[str, Any]], db: AsyncSession) -> None:
+    """Replace the event's dependencies, rejecting links that would close a cycle."""
+    targets = {str(dep["task_id"]) for dep in depends_on}
+    if targets:
+        rows = await db.execute(
+            select(TaskDependency.task_id, TaskDependency.depends_on_id)
+            .join(Event, Event.id == TaskDependency.task_id)
+            .where(Event.user_id == event.user_id, TaskDependency.task_id != event.id)
+        )
+        graph: dict[str, set[str]] = {}
+        for task_id, depends_on_id in rows:
+            graph.setdefault(str(task_id), set()).add(str(depends_on_id))
+        graph[str(event.id)] = targets
+        try:
+            topological_sort(graph.keys(), graph)
+        except DependencyGraphError as exc:
+            raise HTTPException(status_code=422, detail={"message": str(exc), "cycle": exc.cycle}) from exc
+    await db.execute(delete(TaskDependency).where(TaskDependency.task_id == event.id))
     for dep in depends_on:
         dependency = TaskDependency(
             task_id=event.id,
-            depends_on_id=dep["task_id"],
+            depends_on_id=UUID(str(dep["task_id"])),
             type=dep.get("type", "FS"),
             lag_min=dep.get("lag_min", 0),
         )
         db.add(dependency)
 
 
+_PROJECTABLE = {
+    name: "metadata_json" if name == "metadata" else name
+    for name in ("id", *EventSchema.__fields__, "metadata")
+    if name not in ("depends_on", "metadata_json")
+}
+
+
+def _encode_cursor(deadline: datetime | None, event_id: UUID) -> str:
+    payload = json.dumps([deadline.isoformat() if deadline else None, str(event_id)])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime | None, UUID]:
+    try:
+        deadline, event_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (datetime.fromisoformat(deadline) if deadline else None), UUID(event_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _after_cursor(cursor: str):
+    """Rows strictly after the cursor in ``(deadline NULLS LAST, id)`` order."""
+    deadline, event_id = _decode_cursor(cursor)
+    if deadline is None:
+        return and_(Event.deadline.is_(None), Event.id > event_id)
+    return or_(
+        Event.deadline > deadline,
+        and_(Event.deadline == deadline, Event.id > event_id),
+        Event.deadline.is_(None),
+    )
+
+
 @router.get("", response_model=list[EventSchema])
-async def list_events(db: Session = Depends(get_db)) -> list[EventSchema]:
-    events = db.query(Event).all()
-    return [EventSchema.from_orm(event) for event in events]
+async def list_events(
+    response: Response,
+    from_dt: datetime | None = Query(None, alias="from"),
+    to_dt: datetime | None = Query(None, alias="to"),
+    family_key: str | None = None,
+    event_type: Literal["fixed", "flexible"] | None = Query(None, alias="type"),
+    fields: str | None = Query(None, description="Comma separated subset of event fields"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = None,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """List the user's events ordered by deadline (undated last), then id.
+
+    ``from``/``to`` select events whose deadline falls in the range or whose
+    time windows overlap it. Pages are keyset-based: pass the
+    ``X-Next-Cursor`` response header back as ``cursor`` to continue, so every
+    page is an index range scan regardless of how many events precede it.
+    ``fields`` returns plain objects with only the requested columns.
+    """
+
+    columns = None
+    if fields:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in _PROJECTABLE]
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(unknown)}")
+        columns = {name: getattr(Event, _PROJECTABLE[name]) for name in dict.fromkeys(["id", *names])}
+
+    statement = select(*columns.values(), Event.deadline.label("cursor_deadline")) if columns else select(Event)
+    statement = statement.where(Event.user_id == user.id)
+    if from_dt is not None or to_dt is not None:
+        by_deadline, by_window = [], []
+        if from_dt is not None:
+            by_deadline.append(Event.deadline >= from_dt)
+            by_window.append(Event.window_end > from_dt)
+        if to_dt is not None:
+            by_deadline.append(Event.deadline < to_dt)
+            by_window.append(Event.window_start < to_dt)
+        statement = statement.where(or_(and_(*by_deadline), and_(*by_window)))
+    if family_key is not None:
+        statement = statement.where(Event.family_key == family_key)
+    if event_type is not None:
+        statement = statement.where(Event.type == event_type)
+    if cursor:
+        statement = statement.where(_after_cursor(cursor))
+    statement = statement.order_by(Event.deadline.asc().nulls_last(), Event.id).limit(limit + 1)
+
+    result = await db.execute(statement)
+    rows = result.all() if columns else result.scalars().all()
+    page = rows[:limit]
+    headers = {}
+    if len(rows) > limit:
+        tail = page[-1]
+        if columns:
+            headers["X-Next-Cursor"] = _encode_cursor(tail[-1], tail[0])
+        else:
+            headers["X-Next-Cursor"] = _encode_cursor(tail.deadline, tail.id)
+    if columns:
+        items = [dict(zip(columns, row[: len(columns)])) for row in page]
+        return JSONResponse(jsonable_encoder(items), headers=headers)
+    response.headers.update(headers)
+    return [EventSchema.from_orm(event) for event in page]
 
 
 @router.post("", response_model=EventSchema, status_code=201)
-async def create_event(payload: EventCreate, db: Session = Depends(get_db)) -> EventSchema:
-    user = db.query(User).first()
-    if user is None:
-        raise HTTPException(status_code=404, detail="User context missing")
+async def create_event(
+    payload: EventCreate, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)
+) -> EventSchema:
     event_data = jsonable_encoder(payload, exclude={"depends_on"})
     event = Event(user_id=user.id, **event_data)
     db.add(event)
-    db.flush()
+    await db.flush()
     serialized_dependencies = jsonable_encoder(payload.depends_on or [])
-    _apply_dependencies(event, serialized_dependencies, db)
-    db.commit()
-    db.refresh(event)
+    await _apply_dependencies(event, serialized_dependencies, db)
+    await db.commit()
+    await db.refresh(event)
     return EventSchema.from_orm(event)
 
 
+@router.post("/batch", response_model=EventBatchResponse)
+async def batch_events(
+    payload: EventBatchRequest, user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)
+) -> Any:
+    """Create, update and delete many events in one transaction.
+
+    Either every item is applied or none is; on failure the response is a
+    ``422`` carrying the same per-item results with the offending items marked.
+    """
+
+    size = len(payload.create) + len(payload.update) + len(payload.delete)
+    if size > settings.events_batch_max_items:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {settings.events_batch_max_items} items")
+    result = await db.run_sync(lambda session: EventBatchService(session, user.id).apply(payload))
+    if not result.applied:
+        return JSONResponse(jsonable_encoder(result), status_code=422)
+    return result
+
+
 @router.patch("/{event_id}", response_model=EventSchema)
 async def update_event(
     event_id: UUID,
     payload: EventUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> EventSchema:
-    event = db.query(Event).filter(Event.id == event_id).one_or_none()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     data = jsonable_encoder(payload, exclude_unset=True, exclude={"depends_on"})
@@ -63,8 +198,9 @@ async def update_event(
         setattr(event, key, value)
     if "depends_on" in payload.__fields_set__:
         serialized_dependencies = jsonable_encoder(payload.depends_on or [])
-        _apply_dependencies(event, serialized_dependencies, db)
+        await _apply_dependencies(event, serialized_dependencies, db)
+        event.updated_at = datetime.now(timezone.utc)
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.commit()
+    await db.refresh(event)
     return EventSchema.from_orm(event)
@@ -1,43 +1,138 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import math
+from datetime import datetime, timedelta
+from functools import partial
 
-from app.core.db import get_db
-from app.models.event import Event, TaskFamily, UserPomodoroSettings
-from app.schemas.plan import PlanSolution, ProposalResponse, SolveRequest
-from app.services.planner.cp_sat_solver import CPSATSolver
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import planner_errors
+from app.core.config import settings
+from app.core.db import get_async_db
+from app.schemas.plan import (
+    DiagnoseRequest,
+    PlanDiagnosis,
+    PlanJobResponse,
+    PlanSolution,
+    ProposalResponse,
+    ReplanRequest,
+    SolveRequest,
+)
+from app.services.planner.cache import get_solve_cache
+from app.services.planner.diagnostics import PlanDiagnostics
 from app.services.planner.heuristic_solver import HeuristicPlanner
+from app.services.planner.jobs import get_job_store
+from app.services.planner.pool import get_solver_pool
+from app.services.planner.portfolio import solve_portfolio
+from app.services.planner.profiles import resolve_profile
+from app.services.planner.replan import build_warm_start
+from app.services.planner.solve import (
+    check_solvable,
+    load_detached_snapshot,
+    solve_cached,
+)
 
 router = APIRouter()
+_EPOCH = datetime(1970, 1, 1)
 
 
-def _load_context(db: Session) -> tuple[list[Event], dict[str, TaskFamily], UserPomodoroSettings | None]:
-    events = db.query(Event).all()
-    families = {family.key: family for family in db.query(TaskFamily).all()}
-    pomodoro = db.query(UserPomodoroSettings).first()
-    return events, families, pomodoro
+@router.post("/solve", response_model=PlanSolution)
+async def solve_plan(
+    payload: SolveRequest, db: AsyncSession = Depends(get_async_db)
+) -> PlanSolution:
+    with planner_errors():
+        return await solve_cached(db, payload)
 
 
-@router.post("/solve", response_model=PlanSolution)
-async def solve_plan(payload: SolveRequest, db: Session = Depends(get_db)) -> PlanSolution:
-    events, families, pomodoro = _load_context(db)
-    solver = CPSATSolver()
-    try:
-        solution = solver.solve(events, families, pomodoro, payload.from_dt, payload.to_dt)
-        selected_solver = "cp-sat"
-    except Exception as exc:  # pragma: no cover - fallback path
-        heuristic = HeuristicPlanner()
-        solution = heuristic.solve(events, families, pomodoro, payload.from_dt, payload.to_dt)
-        selected_solver = f"heuristic:{exc}"
-    if solution is None:
-        raise HTTPException(status_code=422, detail="Unable to produce plan")
-    solution.solver = selected_solver
-    return solution
+@router.post("/replan", response_model=PlanSolution)
+async def replan(
+    payload: ReplanRequest, db: AsyncSession = Depends(get_async_db)
+) -> PlanSolution:
+    warm_start = build_warm_start(
+        payload.previous,
+        [str(event_id) for event_id in payload.changed_event_ids],
+        now=payload.now,
+        neighbourhood_minutes=payload.neighbourhood_minutes,
+    )
+    with planner_errors():
+        return await solve_cached(db, payload, warm_start)
+
+
+@router.post("/jobs", response_model=PlanJobResponse, status_code=202)
+async def create_plan_job(
+    payload: SolveRequest, db: AsyncSession = Depends(get_async_db)
+) -> PlanJobResponse:
+    snapshot = await load_detached_snapshot(db)
+    with planner_errors():
+        check_solvable(snapshot, payload.from_dt, payload.to_dt)
+        job = get_job_store().submit(
+            get_solver_pool(),
+            partial(
+                solve_portfolio,
+                granularity_min=payload.granularity_min,
+                profile=resolve_profile(payload.profile),
+            ),
+            snapshot,
+            payload.from_dt,
+            payload.to_dt,
+        )
+    return job.snapshot()
+
+
+@router.post("/diagnose", response_model=PlanDiagnosis)
+async def diagnose_plan(
+    payload: DiagnoseRequest, db: AsyncSession = Depends(get_async_db)
+) -> PlanDiagnosis:
+    snapshot = await load_detached_snapshot(db)
+    return PlanDiagnostics(payload.from_dt, payload.to_dt).diagnose(snapshot)
+
+
+@router.get("/jobs/{job_id}", response_model=PlanJobResponse)
+async def get_plan_job(job_id: str, since: int = 0) -> PlanJobResponse:
+    job = get_job_store().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Plan job not found")
+    return job.snapshot(since)
 
 
 @router.get("/proposals", response_model=ProposalResponse)
-async def get_proposals(db: Session = Depends(get_db)) -> ProposalResponse:
+async def get_proposals(
+    k: int = Query(
+        settings.planner_proposals_per_event, ge=1, le=20, description="Slots per event"
+    ),
+    horizon_hours: int = Query(
+        settings.planner_proposals_horizon_hours, ge=1, le=24 * 31
+    ),
+    limit: int = Query(
+        settings.planner_proposals_max_events,
+        ge=1,
+        le=500,
+        description="Events to propose for",
+    ),
+    db: AsyncSession = Depends(get_async_db),
+) -> ProposalResponse:
+    snapshot = await load_detached_snapshot(db)
+    # Proposals start at the end of the current cache-TTL bucket, so a cached
+    # answer stays complete and in the future until the bucket changes.
+    bucket = max(int(settings.planner_cache_ttl_seconds), 1)
+    elapsed = (datetime.utcnow() - _EPOCH).total_seconds()
+    now = _EPOCH + timedelta(seconds=math.ceil(elapsed / bucket) * bucket)
+    cache_key = "proposals:" + snapshot.cache_key(
+        k, horizon_hours, limit, now.isoformat()
+    )
+    cached = get_solve_cache().get(cache_key)
+    if cached is not None:
+        return cached.copy(deep=True)
     heuristic = HeuristicPlanner()
-    events, families, pomodoro = _load_context(db)
-    return heuristic.propose(events, families, pomodoro)
+    proposals = heuristic.propose(
+        snapshot,
+        None,
+        None,
+        now=now,
+        horizon=timedelta(hours=horizon_hours),
+        k=k,
+        limit=limit,
+    )
+    get_solve_cache().set(cache_key, proposals.copy(deep=True))
+    return proposals
@@ -1,17 +1,18 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.db import get_async_db
 from app.models.event import UserPomodoroSettings
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=dict)
-async def get_me_settings(db: Session = Depends(get_db)) -> dict:
-    settings = db.query(UserPomodoroSettings).first()
+async def get_me_settings(db: AsyncSession = Depends(get_async_db)) -> dict:
+    settings = (await db.execute(select(UserPomodoroSettings).limit(1))).scalars().first()
     if settings is None:
         return {
             "enabled": False,
@@ -30,16 +31,16 @@ async def get_me_settings(db: Session = Depends(get_db)) -> dict:
 
 
 @router.put("/me", response_model=dict)
-async def update_me_settings(payload: dict, db: Session = Depends(get_db)) -> dict:
-    settings = db.query(UserPomodoroSettings).first()
+async def update_me_settings(payload: dict, db: AsyncSession = Depends(get_async_db)) -> dict:
+    settings = (await db.execute(select(UserPomodoroSettings).limit(1))).scalars().first()
     if settings is None:
         raise HTTPException(status_code=404, detail="User not configured for Pomodoro")
     for field in ("enabled", "pomodoro_len_min", "short_break_min", "long_break_min", "long_break_every"):
         if field in payload:
             setattr(settings, field, payload[field])
     db.add(settings)
-    db.commit()
-    db.refresh(settings)
+    await db.commit()
+    await db.refresh(settings)
     return {
         "enabled": settings.enabled,
         "pomodoro_len_min": settings.pomodoro_len_min,
@@ -1,44 +1,142 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+from datetime import datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
 
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, planner_errors
+from app.core import db as db_module
 from app.core.config import settings
-from app.core.db import get_db
-from app.services.sync.caldav_client import CalDAVClient
+from app.core.db import get_async_db
+from app.models.event import TaskFamily, UserPomodoroSettings
+from app.models.user import CalDAVAccount, User
+from app.schemas.plan import PlanSolution, SolveRequest
+from app.services.planner.cache import plan_content_hash
+from app.services.planner.solve import solve_cached
+from app.services.sync.caldav_client import CalDAVClient, CalDAVError
 from app.services.sync.ics_service import ICSService
+from app.services.sync.scheduler import get_sync_scheduler
 
 router = APIRouter()
 
 
 @router.post("/import/ics")
-async def import_ics(data: bytes, db: Session = Depends(get_db)) -> dict[str, int]:
+async def import_ics(request: Request, db: AsyncSession = Depends(get_async_db)) -> dict[str, int]:
     if not settings.feature_ics_enabled:
         raise HTTPException(status_code=503, detail="ICS import disabled")
     service = ICSService(db)
-    created = service.import_ics(data)
+    try:
+        created = await service.import_stream(request.stream())
+    except RuntimeError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
     return {"created": created}
 
 
+def _not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return last_modified.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+@router.get("/export.ics")
+async def export_ics(
+    request: Request,
+    plan: bool = False,
+    from_dt: datetime | None = Query(None, alias="from"),
+    to_dt: datetime | None = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """Stream events (or the plan for ``[from, to)`` when ``plan=true``) as ICS.
+
+    The ETag is derived from the event count, the newest ``updated_at`` and the
+    planner settings, so polling clients get a ``304`` without any rendering.
+    """
+
+    if not settings.feature_ics_enabled:
+        raise HTTPException(status_code=503, detail="ICS export disabled")
+    count, last_modified = await db.run_sync(lambda session: ICSService(session).export_version())
+    if plan:
+        from_dt = from_dt or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        to_dt = to_dt or from_dt + timedelta(days=7)
+    families = {family.key: family for family in (await db.execute(select(TaskFamily))).scalars()}
+    pomodoro = (await db.execute(select(UserPomodoroSettings).limit(1))).scalars().first()
+    version = plan_content_hash([], families, pomodoro, count, last_modified, plan, from_dt, to_dt)
+    headers = {"ETag": f'W/"{version[:32]}"', "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    if _not_modified(request, headers["ETag"], last_modified):
+        return Response(status_code=304, headers=headers)
+
+    solution: PlanSolution | None = None
+    if plan:
+        with planner_errors():
+            solution = await solve_cached(db, SolveRequest(from_dt=from_dt, to_dt=to_dt))
+
+    def render():
+        # The request session is closed before streaming starts; use our own.
+        with db_module.SessionLocal() as session:
+            exporter = ICSService(session)
+            yield from exporter.export_plan(solution) if solution is not None else exporter.export_events()
+
+    return StreamingResponse(render(), media_type="text/calendar; charset=utf-8", headers=headers)
+
+
+def _connect_caldav(credentials: dict[str, str]) -> None:
+    # CalDAVClient is blocking (sync httpx and ORM), so it runs in a worker thread.
+    with db_module.SessionLocal() as session:
+        client = CalDAVClient(session)
+        client.save_credentials(credentials)
+        client.verify_connection()
+
+
 @router.post("/caldav/connect")
-async def connect_caldav(credentials: dict[str, str], db: Session = Depends(get_db)) -> dict[str, str]:
+async def connect_caldav(credentials: dict[str, str]) -> dict[str, str]:
     if not settings.feature_caldav_enabled:
         raise HTTPException(status_code=503, detail="CalDAV disabled")
-    client = CalDAVClient(db)
-    client.save_credentials(credentials)
-    client.verify_connection()
+    try:
+        await asyncio.to_thread(_connect_caldav, credentials)
+    except (CalDAVError, httpx.HTTPError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return {"status": "connected"}
 
 
-@router.post("/caldav/pull")
-async def pull_caldav(db: Session = Depends(get_db)) -> dict[str, int]:
-    client = CalDAVClient(db)
-    imported = client.pull_events()
-    return {"imported": imported}
+async def _enqueue_sync(db: AsyncSession, user: User, kinds: set[str]) -> dict[str, str]:
+    if not settings.feature_caldav_enabled:
+        raise HTTPException(status_code=503, detail="CalDAV disabled")
+    if await db.get(CalDAVAccount, user.id) is None:
+        raise HTTPException(status_code=400, detail="CalDAV account is not connected")
+    queued = get_sync_scheduler().trigger(user.id, kinds)
+    return {"status": "queued" if queued else "coalesced"}
+
+
+@router.post("/caldav/pull", status_code=202)
+async def pull_caldav(
+    user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)
+) -> dict[str, str]:
+    return await _enqueue_sync(db, user, {"pull"})
+
+
+@router.post("/caldav/push", status_code=202)
+async def push_caldav(
+    user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)
+) -> dict[str, str]:
+    return await _enqueue_sync(db, user, {"push"})
 
 
-@router.post("/caldav/push")
-async def push_caldav(db: Session = Depends(get_db)) -> dict[str, int]:
-    client = CalDAVClient(db)
-    exported = client.push_events()
-    return {"exported": exported}
+@router.get("/caldav/status")
+async def caldav_status(user: User = Depends(get_current_user)) -> dict[str, Any]:
+    return get_sync_scheduler().status(user.id)
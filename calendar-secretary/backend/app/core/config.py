@@ -1,6 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseSettings, Field, validator
 
@@ -9,14 +9,50 @@ class Settings(BaseSettings):
     app_name: str = "Calendar Secretary"
     cors_origins: list[str] = Field(default_factory=lambda: ["*"])
     database_url: str = "postgresql+psycopg2://postgres:postgres@db:5432/calendar"
+    async_database_url: str | None = None
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
     timezone_default: str = "Europe/Helsinki"
     feature_caldav_enabled: bool = True
+    caldav_timeout_seconds: float = 30.0
+    caldav_max_connections: int = 10
+    caldav_sync_interval_seconds: float = 900.0
+    caldav_sync_jitter_seconds: float = 60.0
+    caldav_sync_concurrency: int = 4
+    caldav_sync_max_backoff_seconds: float = 3600.0
     feature_ics_enabled: bool = True
+    ics_import_batch_size: int = 1000
+    ics_recurrence_window_days: int = 365
+    ics_export_batch_size: int = 500
+    events_batch_max_items: int = 5000
     objective_weight_priority: float = 1.0
     objective_weight_family_deficit: float = 3.0
     objective_weight_family_overuse: float = 2.0
     objective_weight_family_target: float = 1.0
     objective_bonus_pomodoro: float = 0.5
+    planner_profile_default: str = "interactive"
+    planner_num_workers: int | None = None
+    planner_random_seed: int = 0
+    planner_time_granularity_min: int = 1
+    planner_max_chunks_per_event: int = 16
+    planner_default_min_chunk_min: int = 15
+    planner_decompose: bool = True
+    planner_parallel_components: int = 0
+    planner_pool_kind: Literal["thread", "process"] = "thread"
+    planner_pool_workers: int = 2
+    planner_queue_limit: int = 8
+    planner_request_timeout_seconds: float = 30.0
+    planner_job_ttl_seconds: float = 900.0
+    planner_job_max_incumbents: int = 20
+    planner_cache_size: int = 128
+    planner_cache_ttl_seconds: float = 300.0
+    planner_proposals_per_event: int = 3
+    planner_proposals_horizon_hours: int = 72
+    planner_proposals_max_events: int = 20
+    planner_reject_infeasible: bool = True
     secret_key: str = "change-me"
     encryption_key: str = Field(
         default=""  # to be populated via .env with Fernet key
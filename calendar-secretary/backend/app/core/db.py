@@ -1,12 +1,47 @@
+from typing import Any
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(settings.database_url, echo=False, future=True)
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the driver of ``url`` for its asyncio counterpart (asyncpg, aiosqlite)."""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def pool_options(url: str) -> dict[str, Any]:
+    """Pool sizing from settings; SQLite keeps SQLAlchemy's per-file defaults."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+# The sync engine serves startup, migrations and work already running in worker
+# threads (CalDAV sync, streamed exports); request handlers use the async engine.
+engine = create_engine(settings.database_url, echo=False, future=True, **pool_options(settings.database_url))
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 Base = declarative_base()
 
+_async_url = settings.async_database_url or async_database_url(settings.database_url)
+async_engine = create_async_engine(_async_url, echo=False, **pool_options(_async_url))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
 
 def get_db():
     db = SessionLocal()
@@ -14,3 +49,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
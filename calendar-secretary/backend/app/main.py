@@ -11,6 +11,8 @@ from app.core.config import settings
 from app.core import db as db_module
 from app.models.event import UserPomodoroSettings
 from app.models.user import User
+from app.services.planner.pool import get_solver_pool
+from app.services.sync.scheduler import get_sync_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
 app.include_router(events.router, prefix="/api/events", tags=["events"])
@@ -70,6 +73,27 @@ def on_startup() -> None:
     _initialise_database()
 
 
+@app.on_event("startup")
+async def start_sync_scheduler() -> None:
+    if settings.feature_caldav_enabled and settings.caldav_sync_interval_seconds > 0:
+        get_sync_scheduler().start()
+
+
+@app.on_event("shutdown")
+async def stop_sync_scheduler() -> None:
+    await get_sync_scheduler().stop()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    get_solver_pool().shutdown()
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine() -> None:
+    await db_module.async_engine.dispose()
+
+
 @app.get("/", tags=["meta"])
 async def root() -> dict[str, str]:
     """Landing endpoint for quick manual checks."""
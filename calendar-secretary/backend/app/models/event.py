@@ -1,12 +1,27 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
+from typing import Any
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
 from app.core.db import Base
+from app.services.planner.rules import window_bounds
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def window_columns(time_windows: Any) -> dict[str, datetime | None]:
+    """``window_start``/``window_end`` values spanning all of ``time_windows``."""
+    bounds = [window_bounds(window) for window in time_windows or []]
+    return {
+        "window_start": min((start for start, _ in bounds), default=None),
+        "window_end": max((end for _, end in bounds), default=None),
+    }
 
 
 class EventType(str, Enum):
@@ -16,6 +31,10 @@ class EventType(str, Enum):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_user_deadline_family", "user_id", "deadline", "family_key"),
+        Index("ix_events_user_window", "user_id", "window_start", "window_end"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -25,6 +44,9 @@ class Event(Base):
     priority = Column(Integer, nullable=False, default=5)
     deadline = Column(DateTime(timezone=True), nullable=True)
     time_windows = Column(JSON, nullable=True)
+    # Span of ``time_windows`` so calendar-range queries can use an index.
+    window_start = Column(DateTime(timezone=True), nullable=True)
+    window_end = Column(DateTime(timezone=True), nullable=True)
     flex = Column(JSON, nullable=True)
     location = Column(String, nullable=True)
     travel_time_min = Column(Integer, default=0, nullable=False)
@@ -34,6 +56,7 @@ class Event(Base):
     metadata_json = Column("metadata", JSON, nullable=True)
     family_key = Column(String, nullable=True)
     pomodoro_opt_in = Column(Boolean, default=False, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=_utcnow, onupdate=_utcnow, nullable=False)
 
     dependencies = relationship(
         "TaskDependency",
@@ -42,6 +65,12 @@ class Event(Base):
         foreign_keys="TaskDependency.task_id",
     )
 
+    @validates("time_windows")
+    def _sync_window_span(self, key: str, value: Any) -> Any:
+        for name, moment in window_columns(value).items():
+            setattr(self, name, moment)
+        return value
+
 
 class TaskDependency(Base):
     __tablename__ = "task_dependencies"
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Boolean, Column, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, LargeBinary, String
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.core.db import Base
@@ -16,3 +16,16 @@ class User(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     timezone = Column(String, nullable=False, default="Europe/Helsinki")
     priority_weight = Column(Integer, default=1, nullable=False)
+
+
+class CalDAVAccount(Base):
+    """CalDAV calendar of a user with encrypted credentials and sync cursor."""
+
+    __tablename__ = "caldav_accounts"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    calendar_url = Column(String, nullable=False)
+    username = Column(String, nullable=False)
+    encrypted_password = Column(LargeBinary, nullable=False)
+    sync_token = Column(String, nullable=True)
+    pushed_at = Column(DateTime(timezone=True), nullable=True)
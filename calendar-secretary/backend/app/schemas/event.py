@@ -5,6 +5,7 @@ from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field, validator
+from pydantic.utils import GetterDict
 
 
 class TimeWindow(BaseModel):
@@ -79,9 +80,49 @@ class EventUpdate(EventBase):
     duration_min: int | None = None
 
 
+class EventBatchCreate(EventCreate):
+    id: UUID | None = None
+
+
+class EventBatchUpdate(EventUpdate):
+    id: UUID
+
+
+class EventBatchRequest(BaseModel):
+    create: list[EventBatchCreate] = Field(default_factory=list)
+    update: list[EventBatchUpdate] = Field(default_factory=list)
+    delete: list[UUID] = Field(default_factory=list)
+
+
+class EventBatchItemResult(BaseModel):
+    op: Literal["create", "update", "delete"]
+    index: int
+    id: UUID | None = None
+    ok: bool = True
+    error: str | None = None
+
+
+class EventBatchResponse(BaseModel):
+    applied: bool
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    results: list[EventBatchItemResult]
+
+
+class EventGetter(GetterDict):
+    """Read the ``metadata`` alias from ``metadata_json`` (``Event.metadata`` is the SQLAlchemy registry)."""
+
+    def get(self, key, default=None):
+        if key == "metadata":
+            key = "metadata_json"
+        return super().get(key, default)
+
+
 class EventSchema(EventBase):
     id: UUID
 
     class Config:
         orm_mode = True
+        getter_dict = EventGetter
         allow_population_by_field_name = True
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -25,12 +25,34 @@ class PlanSolution(BaseModel):
     scheduled: list[ScheduledChunk]
     objective_value: float | None = None
     solver: str
+    metadata_json: dict[str, Any] | None = Field(default=None, alias="metadata")
+
+    class Config:
+        allow_population_by_field_name = True
 
 
 class SolveRequest(BaseModel):
     from_dt: datetime
     to_dt: datetime
     include_proposals: bool = True
+    granularity_min: Literal[1, 5, 15] | None = None
+    profile: Literal["interactive", "batch", "overnight"] | None = None
+
+
+class ReplanRequest(SolveRequest):
+    previous: PlanSolution
+    changed_event_ids: list[UUID] = Field(default_factory=list)
+    now: datetime | None = None
+    neighbourhood_minutes: int = 120
+
+
+class PlanJobResponse(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    incumbents: list[PlanSolution] = Field(default_factory=list)
+    next_cursor: int = 0
+    result: PlanSolution | None = None
+    error: str | None = None
 
 
 class Proposal(BaseModel):
@@ -43,3 +65,25 @@ class Proposal(BaseModel):
 
 class ProposalResponse(BaseModel):
     proposals: list[Proposal]
+
+
+class DiagnoseRequest(BaseModel):
+    from_dt: datetime
+    to_dt: datetime
+
+
+class PlanIssue(BaseModel):
+    kind: Literal["fixed_overlap", "cycle", "no_slot", "dependency", "overload", "day_overload"]
+    severity: Literal["error", "warning"] = "warning"
+    message: str
+    event_ids: list[UUID] = Field(default_factory=list)
+    start: datetime | None = None
+    end: datetime | None = None
+    required_min: int | None = None
+    available_min: int | None = None
+
+
+class PlanDiagnosis(BaseModel):
+    feasible: bool
+    issues: list[PlanIssue] = Field(default_factory=list)
+    wall_time: float = 0.0
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.event import Event, TaskDependency, window_columns
+from app.schemas.event import EventBatchItemResult, EventBatchRequest, EventBatchResponse
+from app.services.planner.rules import DependencyGraphError, topological_sort
+
+
+class EventBatchService:
+    """Apply many event creates, updates and deletes in one transaction.
+
+    Every item is validated against the user's current events before anything
+    is written: ids must exist (or be new for creates), dependencies must point
+    at events that survive the batch, and the resulting dependency graph is
+    checked for cycles once. If any item fails nothing is written; otherwise
+    rows are written with one multi-row statement per kind and a single commit.
+    """
+
+    def __init__(self, db: Session, user_id: UUID):
+        self.db = db
+        self.user_id = user_id
+
+    def _existing(self) -> tuple[set[UUID], dict[UUID, set[UUID]]]:
+        ids = set(self.db.execute(select(Event.id).where(Event.user_id == self.user_id)).scalars())
+        edges: dict[UUID, set[UUID]] = defaultdict(set)
+        rows = self.db.execute(
+            select(TaskDependency.task_id, TaskDependency.depends_on_id)
+            .join(Event, Event.id == TaskDependency.task_id)
+            .where(Event.user_id == self.user_id)
+        )
+        for task_id, depends_on_id in rows:
+            edges[task_id].add(depends_on_id)
+        return ids, edges
+
+    def apply(self, payload: EventBatchRequest) -> EventBatchResponse:
+        existing, edges = self._existing()
+        results: list[EventBatchItemResult] = []
+        owner: dict[UUID, EventBatchItemResult] = {}
+
+        def result(op: str, index: int, event_id: UUID | None, error: str | None = None) -> EventBatchItemResult:
+            item = EventBatchItemResult(op=op, index=index, id=event_id, ok=error is None, error=error)
+            results.append(item)
+            if event_id is not None and error is None:
+                owner.setdefault(event_id, item)
+            return item
+
+        deleted: set[UUID] = set()
+        for index, event_id in enumerate(payload.delete):
+            if event_id not in existing:
+                result("delete", index, event_id, "Event not found")
+            elif event_id in deleted:
+                result("delete", index, event_id, "Event deleted twice")
+            else:
+                deleted.add(event_id)
+                result("delete", index, event_id)
+
+        # Event ids are global, so client-chosen ids are checked against every
+        # user's rows; a clash would otherwise only surface at insert time.
+        requested = {item.id for item in payload.create if item.id is not None}
+        taken = set()
+        if requested:
+            taken = set(self.db.execute(select(Event.id).where(Event.id.in_(requested))).scalars())
+        created: dict[UUID, Any] = {}
+        for index, item in enumerate(payload.create):
+            event_id = item.id or uuid.uuid4()
+            if event_id in existing or event_id in taken or event_id in created:
+                result("create", index, event_id, "Event id already exists")
+            else:
+                created[event_id] = item
+                result("create", index, event_id)
+
+        updated: dict[UUID, Any] = {}
+        for index, item in enumerate(payload.update):
+            if item.id not in existing:
+                result("update", index, item.id, "Event not found")
+            elif item.id in deleted:
+                result("update", index, item.id, "Event is deleted in the same batch")
+            elif item.id in updated:
+                result("update", index, item.id, "Event updated twice")
+            else:
+                updated[item.id] = item
+                result("update", index, item.id)
+
+        survivors = (existing - deleted) | created.keys()
+        rewired = {
+            event_id: item
+            for event_id, item in [*created.items(), *updated.items()]
+            if "depends_on" in item.__fields_set__ or event_id in created
+        }
+        for event_id, item in rewired.items():
+            targets = {dependency.task_id for dependency in item.depends_on}
+            missing = sorted(str(target) for target in targets - survivors)
+            if event_id in targets:
+                owner[event_id].ok, owner[event_id].error = False, "Event cannot depend on itself"
+            elif missing:
+                owner[event_id].ok, owner[event_id].error = False, f"Unknown dependencies: {', '.join(missing)}"
+            edges[event_id] = targets
+
+        graph = {
+            str(task_id): {str(target) for target in targets if target in survivors and target != task_id}
+            for task_id, targets in edges.items()
+            if task_id in survivors
+        }
+        try:
+            topological_sort(graph.keys(), graph)
+        except DependencyGraphError as exc:
+            blamed = [owner[UUID(node)] for node in exc.cycle if UUID(node) in owner] or [
+                owner[event_id] for event_id in rewired
+            ]
+            for item in blamed:
+                item.ok, item.error = False, str(exc)
+
+        if not all(item.ok for item in results):
+            self.db.rollback()
+            return EventBatchResponse(applied=False, results=results)
+
+        self._write(deleted, created, updated, rewired)
+        return EventBatchResponse(
+            applied=True, created=len(created), updated=len(updated), deleted=len(deleted), results=results
+        )
+
+    def _write(
+        self,
+        deleted: set[UUID],
+        created: dict[UUID, Any],
+        updated: dict[UUID, Any],
+        rewired: dict[UUID, Any],
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        if deleted:
+            self.db.execute(
+                delete(TaskDependency).where(
+                    or_(TaskDependency.task_id.in_(deleted), TaskDependency.depends_on_id.in_(deleted))
+                )
+            )
+            self.db.execute(delete(Event).where(Event.user_id == self.user_id, Event.id.in_(deleted)))
+        if created:
+            rows = [
+                {**jsonable_encoder(item, exclude={"id", "depends_on"}), "id": event_id, "user_id": self.user_id}
+                for event_id, item in created.items()
+            ]
+            self.db.execute(insert(Event), [_columns(row) for row in rows])
+        if updated:
+            self.db.execute(
+                update(Event),
+                [
+                    {
+                        **_columns(jsonable_encoder(item, exclude_unset=True, exclude={"id", "depends_on"})),
+                        "id": event_id,
+                        "updated_at": now,
+                    }
+                    for event_id, item in updated.items()
+                ],
+            )
+        if rewired:
+            self.db.execute(delete(TaskDependency).where(TaskDependency.task_id.in_(rewired.keys())))
+            dependency_rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "task_id": event_id,
+                    "depends_on_id": dependency.task_id,
+                    "type": dependency.type,
+                    "lag_min": dependency.lag_min,
+                }
+                for event_id, item in rewired.items()
+                for dependency in item.depends_on
+            ]
+            if dependency_rows:
+                self.db.execute(insert(TaskDependency), dependency_rows)
+        self.db.commit()
+
+
+def _columns(values: dict[str, Any]) -> dict[str, Any]:
+    """Map the API's ``metadata`` key onto ``metadata_json`` and keep the window span in step."""
+    if "metadata" in values:
+        values["metadata_json"] = values.pop("metadata")
+    if "time_windows" in values:
+        values.update(window_columns(values["time_windows"]))
+    return values
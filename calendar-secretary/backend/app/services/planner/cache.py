@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Iterable
+
+from app.core.config import settings
+from app.services.planner.rules import iter_dependencies
+
+_EVENT_FIELDS = (
+    "type",
+    "duration_min",
+    "priority",
+    "deadline",
+    "time_windows",
+    "flex",
+    "travel_time_min",
+    "constraints",
+    "family_key",
+    "pomodoro_opt_in",
+)
+_FAMILY_FIELDS = ("weight", "min_daily_minutes", "weekly_target_minutes", "max_daily_minutes")
+_POMODORO_FIELDS = ("enabled", "pomodoro_len_min", "short_break_min", "long_break_min", "long_break_every")
+
+
+def plan_content_hash(events: Iterable, families: dict[str, Any], pomodoro: Any, *extra: Any) -> str:
+    """Hash every planner input that can change the resulting plan.
+
+    Events are ordered by id so the hash does not depend on query order.
+    ``extra`` carries request parameters such as the horizon bounds.
+    """
+
+    payload = {
+        "events": sorted(
+            (
+                [str(event.id)]
+                + [getattr(event, field, None) for field in _EVENT_FIELDS]
+                + [sorted(iter_dependencies(event))]
+                for event in events
+            ),
+            key=lambda row: row[0],
+        ),
+        "families": sorted(
+            [key] + [getattr(family, field, None) for field in _FAMILY_FIELDS]
+            for key, family in families.items()
+        ),
+        "pomodoro": [getattr(pomodoro, field, None) for field in _POMODORO_FIELDS] if pomodoro else None,
+        "extra": list(extra),
+    }
+    return hash_payload(payload)
+
+
+def hash_payload(payload: Any) -> str:
+    """SHA-256 of a JSON-encodable payload with stable key order."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_encode_default)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "dict"):
+        return value.dict()
+    return str(value)
+
+
+class SolveCache:
+    """Thread-safe LRU cache with a per-entry time-to-live."""
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache()
+def get_solve_cache() -> SolveCache:
+    return SolveCache(
+        max_entries=settings.planner_cache_size,
+        ttl_seconds=settings.planner_cache_ttl_seconds,
+    )
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.event import Event, TaskDependency, TaskFamily, UserPomodoroSettings
+from app.services.planner.snapshot import PlannerEvent, PlannerFamily, PlannerPomodoro, PlannerSnapshot
+
+_EVENT_COLUMNS = tuple(name for name in PlannerEvent.__slots__ if name != "depends_on")
+
+
+def _columns(model: Any, names: Iterable[str]) -> list[Any]:
+    return [getattr(model, name).label(name) for name in names]
+
+
+def load_planner_snapshot(db: Session) -> PlannerSnapshot:
+    """Load events, dependencies, families and pomodoro settings in four queries.
+
+    Rows are read column by column instead of as ORM instances, so nothing in
+    the snapshot refers back to ``db`` and the session can close before solving.
+    This is the only loader: lookups by id and reverse dependencies are served
+    by ``PlannerSnapshot.index`` and ``PlannerSnapshot.dependents``.
+    """
+    dependencies: dict[str, list[tuple[str, str, int]]] = defaultdict(list)
+    rows = db.execute(
+        select(TaskDependency.task_id, TaskDependency.depends_on_id, TaskDependency.type, TaskDependency.lag_min)
+    )
+    for task_id, depends_on_id, dep_type, lag_min in rows:
+        dependencies[str(task_id)].append((str(depends_on_id), dep_type or "FS", int(lag_min or 0)))
+
+    events = [
+        PlannerEvent(depends_on=tuple(dependencies.get(str(row.id), ())), **row._mapping)
+        for row in db.execute(select(*_columns(Event, _EVENT_COLUMNS)))
+    ]
+    families = {
+        row.key: PlannerFamily(**row._mapping)
+        for row in db.execute(select(*_columns(TaskFamily, PlannerFamily.__slots__)))
+    }
+    pomodoro_row = db.execute(select(*_columns(UserPomodoroSettings, PlannerPomodoro.__slots__)).limit(1)).first()
+    pomodoro = PlannerPomodoro(**pomodoro_row._mapping) if pomodoro_row is not None else None
+    return PlannerSnapshot(events, families, pomodoro)
@@ -1,15 +1,41 @@
 from __future__ import annotations
 
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Iterable
-from uuid import uuid4
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Any, Callable, Iterable, Sequence
 
 from ortools.sat.python import cp_model
 
 from app.core.config import settings
 from app.schemas.plan import PlanSolution, ScheduledChunk
-from app.services.planner.rules import TimeUtils
+from app.services.planner.decomposition import chunk_span, decompose
+from app.services.planner.families import (
+    DayAxis,
+    add_family_balance,
+    balanced_families,
+    family_report,
+)
+from app.services.planner.precedence import (
+    EventSpan,
+    Precedence,
+    collect_precedences,
+    critical_path_bounds,
+)
+from app.services.planner.profiles import SolverProfile, resolve_profile
+from app.services.planner.replan import WarmStart
+from app.services.planner.rules import (
+    TimeGrid,
+    make_chunk_id,
+    outside_span,
+    window_bounds,
+)
+from app.services.planner.snapshot import planner_inputs
+from app.services.planner.splitting import plan_chunks, uses_pomodoro
 
 
 @dataclass
@@ -18,107 +44,708 @@ class InternalChunk:
     chunk_id: str
     duration: int
     priority: float
+    size: int = 0
+    min_size: int | None = None
     is_break: bool = False
+    ordinal: int = 0
     earliest: int | None = None
     latest: int | None = None
+    windows: list[tuple[int, int]] | None = None
+    due: int | None = None
+    anchor: datetime | None = None
+    pomodoro: bool = False
+    blocked: bool = False
+    family_key: str | None = None
+
+
+ComponentResult = tuple[list[ScheduledChunk], float]
+
+
+class _IncumbentCallback(cp_model.CpSolverSolutionCallback):
+    """Forward every improving solution found during search."""
+
+    def __init__(
+        self,
+        build: Callable[..., list[ScheduledChunk]],
+        on_solution: Callable[[ComponentResult], None],
+    ):
+        super().__init__()
+        self._build = build
+        self._on_solution = on_solution
+
+    def on_solution_callback(self) -> None:
+        self._on_solution((self._build(self.Value), self.ObjectiveValue()))
+
+
+class _IncumbentMerger:
+    """Combine per-component incumbents into whole-horizon plans.
+
+    A merged plan is only emitted once every component has reported at least
+    one solution; afterwards each improvement re-emits the combined plan.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        assemble: Callable[[Sequence[ComponentResult]], PlanSolution],
+        on_solution,
+    ):
+        self._latest: list[ComponentResult | None] = [None] * size
+        self._assemble = assemble
+        self._on_solution = on_solution
+        self._lock = threading.Lock()
+
+    def reporter(self, index: int) -> Callable[[ComponentResult], None]:
+        def report(result: ComponentResult) -> None:
+            with self._lock:
+                self._latest[index] = result
+                if any(item is None for item in self._latest):
+                    return
+                merged = self._assemble(self._latest)
+            self._on_solution(merged)
+
+        return report
+
+
+class _TimeBudget:
+    """Split one wall-clock budget between components as they start.
+
+    Each component gets what is left divided by the components still waiting,
+    times the number that run side by side, so components queued behind a slow
+    one are not starved and time saved by fast ones carries over.
+    """
+
+    def __init__(self, seconds: float, components: int, concurrency: int):
+        self._deadline = time.monotonic() + seconds
+        self._pending = components
+        self._concurrency = max(concurrency, 1)
+        self._lock = threading.Lock()
+
+    def claim(self) -> float:
+        with self._lock:
+            remaining = max(self._deadline - time.monotonic(), 0.0)
+            share = (
+                remaining
+                * min(self._concurrency, self._pending)
+                / max(self._pending, 1)
+            )
+            self._pending = max(self._pending - 1, 0)
+        return max(share, 0.01)
 
 
 class CPSATSolver:
     """CP-SAT solver that captures constraints from flexible and fixed tasks.
 
-    The solver maps each task chunk to an interval variable. The start variable is
-    bounded by the earliest/latest feasible times derived from deadlines, time windows
-    and user constraints. Fixed events are modeled with start == end - duration. A
-    single resource (the personal calendar) is modeled using `AddNoOverlap`.
-
-    Objective function maximises weighted priorities minus penalties derived from
-    window deviations and family balancing. Penalties are approximated using linear
-    expressions with slack variables.
+    Each task chunk becomes an optional interval on a horizon-relative
+    ``TimeGrid`` and a single ``AddNoOverlap`` models the personal calendar.
+    The objective maximises weighted priorities minus family balancing penalties.
     """
 
-    def _build_chunks(self, events: Iterable) -> list[InternalChunk]:
-        chunks: list[InternalChunk] = []
-        for event in events:
-            duration = event.duration_min
-            chunk = InternalChunk(
-                event_id=str(event.id),
-                chunk_id=str(uuid4()),
-                duration=duration,
-                priority=float(event.priority),
+    def __init__(
+        self, granularity_min: int | None = None, profile: SolverProfile | None = None
+    ):
+        self.granularity_min = granularity_min or settings.planner_time_granularity_min
+        self.profile = profile or resolve_profile()
+
+    def _build_event_chunks(
+        self, event, families, pomodoro, grid: TimeGrid, horizon_end: int
+    ) -> list[InternalChunk]:
+        """Cut ``event`` into chunks bounded by its windows and deadline.
+
+        Pomodoro opt-ins become work sessions separated by breaks that start
+        exactly when the session ends; ``flex.can_split`` events become a capped
+        number of optional variable-length pieces whose lengths add up to the
+        duration. Durations are rounded up to whole slots.
+        """
+        event_id = str(event.id)
+        family = families.get(getattr(event, "family_key", None))
+        priority = float(event.priority) * (
+            family.weight if family is not None and family.weight else 1.0
+        )
+        specs = plan_chunks(
+            event,
+            pomodoro,
+            settings.planner_max_chunks_per_event,
+            settings.planner_default_min_chunk_min,
+        )
+        chunks = [
+            InternalChunk(
+                event_id=event_id,
+                chunk_id=make_chunk_id(event_id, spec.index),
+                duration=spec.duration,
+                priority=priority,
+                size=grid.duration_slots(spec.duration),
+                min_size=grid.duration_slots(spec.min_duration)
+                if spec.min_duration
+                else None,
+                is_break=spec.is_break,
+                ordinal=spec.ordinal,
+                pomodoro=uses_pomodoro(event, pomodoro),
+                family_key=getattr(event, "family_key", None),
             )
-            if event.type == "fixed" and event.time_windows:
-                window = event.time_windows[0]
-                chunk.earliest = TimeUtils.to_minutes(window["start"])
-                chunk.latest = TimeUtils.to_minutes(window["end"]) - duration
-            chunks.append(chunk)
+            for spec in specs
+        ]
+        if event.type == "fixed" and event.time_windows:
+            chunk = chunks[0]
+            window_start, window_end = window_bounds(event.time_windows[0])
+            if window_end - window_start <= timedelta(minutes=event.duration_min):
+                # A fixed event occupies every slot it touches and keeps its
+                # exact start in the plan. A meeting crossing the horizon start
+                # or end keeps the part inside the grid busy.
+                first = grid.to_slot(window_start)
+                last = first + max(
+                    chunk.size, grid.to_slot(window_end, round_up=True) - first
+                )
+                chunk.anchor = window_start
+                chunk.earliest = chunk.latest = max(first, 0)
+                chunk.size = max(min(last, horizon_end) - chunk.earliest, 0)
+                return chunks
+
+        windows = None
+        if event.time_windows:
+            windows = []
+            for window in event.time_windows:
+                window_start, window_end = window_bounds(window)
+                windows.append(
+                    (
+                        grid.to_slot(window_start, round_up=True),
+                        grid.to_slot(window_end),
+                    )
+                )
+        deadline = getattr(event, "deadline", None)
+        due = grid.to_slot(deadline) if deadline is not None else None
+
+        work = [chunk for chunk in chunks if not chunk.is_break]
+        for chunk in work:
+            chunk.windows = windows
+            chunk.due = due
+            shortest = chunk.min_size or chunk.size
+            if windows:
+                chunk.earliest = min(low for low, _ in windows)
+                chunk.latest = max(high for _, high in windows) - shortest
+            if due is not None:
+                chunk.latest = (
+                    due - shortest
+                    if chunk.latest is None
+                    else min(chunk.latest, due - shortest)
+                )
+        if (
+            len(work) < len(chunks)
+            and work[0].earliest is not None
+            and work[-1].latest is not None
+        ):
+            for chunk in chunks:
+                if chunk.is_break:
+                    chunk.earliest, chunk.latest = work[0].earliest, work[-1].latest
         return chunks
 
-    def solve(self, events, families, pomodoro, start: datetime, end: datetime) -> PlanSolution | None:
-        model = cp_model.CpModel()
-        horizon_start = TimeUtils.to_minutes(start)
-        horizon_end = TimeUtils.to_minutes(end)
-        chunks = self._build_chunks(events)
+    def _build_chunks(
+        self, events: Iterable, families, pomodoro, grid: TimeGrid, horizon_end: int
+    ) -> list[InternalChunk]:
+        return [
+            chunk
+            for event in events
+            for chunk in self._build_event_chunks(
+                event, families, pomodoro, grid, horizon_end
+            )
+        ]
+
+    @staticmethod
+    def _tighten_bounds(
+        chunks: list[InternalChunk],
+        precedences: list[Precedence],
+        horizon_end: int,
+        outside: dict[str, tuple[int, int]] | None = None,
+    ) -> None:
+        """Apply ``critical_path_bounds`` to the chunks of every event.
+
+        Events in ``outside`` (slot spans of events lying wholly outside the
+        horizon) take part as rigid spans at their stored times, so they
+        release their dependents instead of ruling them out.
+        """
+        by_event = {
+            event_id: list(items)
+            for event_id, items in groupby(chunks, key=lambda chunk: chunk.event_id)
+        }
+        spans = {
+            event_id: EventSpan(
+                earliest=low, latest=low, min_span=high - low, rigid=True
+            )
+            for event_id, (low, high) in (outside or {}).items()
+        }
+        for event_id, event_chunks in by_event.items():
+            work = [chunk for chunk in event_chunks if not chunk.is_break]
+            first = work[0]
+            if first.min_size is not None:
+                min_span = first.size
+            else:
+                last = event_chunks.index(work[-1])
+                min_span = sum(chunk.size for chunk in event_chunks[: last + 1])
+            spans[event_id] = EventSpan(
+                earliest=first.earliest or 0,
+                latest=first.latest
+                if first.latest is not None
+                else horizon_end - min_span,
+                min_span=min_span,
+                rigid=len(work) == 1 and first.min_size is None,
+            )
+        impossible = critical_path_bounds(spans, precedences)
+        for event_id, event_chunks in by_event.items():
+            earliest = spans[event_id].earliest
+            for chunk in event_chunks:
+                chunk.blocked = event_id in impossible
+                if earliest > 0:
+                    chunk.earliest = max(chunk.earliest or 0, earliest)
+
+    @staticmethod
+    def _constrain_precedences(
+        model: cp_model.CpModel,
+        precedences: list[Precedence],
+        event_vars: dict[str, dict[str, Any]],
+        outside: dict[str, tuple[int, int]] | None = None,
+    ) -> None:
+        """Precedence constraints between the events of one model.
+
+        Presence is only linked when both events are in the model. A
+        prerequisite in ``outside`` counts as done at its stored span, which acts
+        as a release time for the dependent.
+        """
+        outside = outside or {}
+        for precedence in precedences:
+            successor = event_vars.get(precedence.successor)
+            if successor is None:
+                continue
+            later = (
+                successor["start"]
+                if precedence.type in ("FS", "SS")
+                else successor["end"]
+            )
+            predecessor = event_vars.get(precedence.predecessor)
+            if predecessor is not None:
+                model.AddImplication(successor["presence"], predecessor["presence"])
+                earlier = (
+                    predecessor["end"]
+                    if precedence.type in ("FS", "FF")
+                    else predecessor["start"]
+                )
+            elif precedence.predecessor in outside:
+                pred_start, pred_end = outside[precedence.predecessor]
+                earlier = pred_end if precedence.type in ("FS", "FF") else pred_start
+            else:
+                continue
+            model.Add(later >= earlier + precedence.lag).OnlyEnforceIf(
+                successor["presence"]
+            )
+
+    @staticmethod
+    def _constrain_windows(
+        model: cp_model.CpModel, chunk: InternalChunk, start_var, end_var, presence
+    ) -> None:
+        if chunk.due is not None:
+            model.Add(end_var <= chunk.due).OnlyEnforceIf(presence)
+        if chunk.windows is None:
+            return
+        shortest = chunk.min_size or chunk.size
+        feasible = [
+            (low, high) for low, high in chunk.windows if high - low >= shortest
+        ]
+        if not feasible:
+            model.Add(presence == 0)
+        elif chunk.min_size is None:
+            ranges = [[low, high - chunk.size] for low, high in feasible]
+            model.AddLinearExpressionInDomain(
+                start_var, cp_model.Domain.FromIntervals(ranges)
+            ).OnlyEnforceIf(presence)
+        elif len(feasible) == 1:
+            model.Add(start_var >= feasible[0][0]).OnlyEnforceIf(presence)
+            model.Add(end_var <= feasible[0][1]).OnlyEnforceIf(presence)
+        else:
+            choices = []
+            for index, (low, high) in enumerate(feasible):
+                choice = model.NewBoolVar(f"window_{chunk.chunk_id}_{index}")
+                model.Add(start_var >= low).OnlyEnforceIf(choice)
+                model.Add(end_var <= high).OnlyEnforceIf(choice)
+                choices.append(choice)
+            model.Add(sum(choices) == presence)
+
+    @staticmethod
+    def _max_parallel_components() -> int:
+        return settings.planner_parallel_components or os.cpu_count() or 1
+
+    @staticmethod
+    def _apply_warm_start(
+        model: cp_model.CpModel,
+        warm_start: WarmStart,
+        chunk: InternalChunk,
+        variables: dict[str, cp_model.IntVar],
+        grid: TimeGrid,
+        horizon_end: int,
+        hinted: set[int],
+    ) -> None:
+        key = (chunk.event_id, chunk.ordinal)
+        previous = warm_start.hints.get(key)
+        previous_start = grid.to_slot(previous) if previous is not None else None
+        if (
+            previous_start is not None
+            and 0 <= previous_start <= horizon_end - chunk.size
+        ):
+            model.AddHint(variables["start"], previous_start)
+            # Chunks of one event share a presence literal, which may be
+            # hinted only once.
+            if variables["presence"].Index() not in hinted:
+                hinted.add(variables["presence"].Index())
+                model.AddHint(variables["presence"], 1)
+            if key in warm_start.frozen:
+                model.Add(variables["start"] == previous_start).OnlyEnforceIf(
+                    variables["presence"]
+                )
+                return
+        if warm_start.not_before is not None:
+            not_before = grid.to_slot(warm_start.not_before, round_up=True)
+            model.Add(variables["start"] >= not_before).OnlyEnforceIf(
+                variables["presence"]
+            )
 
+    def _solve_component(
+        self,
+        chunks: list[InternalChunk],
+        grid: TimeGrid,
+        horizon_end: int,
+        budget: _TimeBudget,
+        num_workers: int | None,
+        warm_start: WarmStart | None,
+        on_solution: Callable[[ComponentResult], None] | None,
+        precedences: list[Precedence] = (),
+        families: dict[str, Any] | None = None,
+        axis: DayAxis | None = None,
+        outside: dict[str, tuple[int, int]] | None = None,
+    ) -> tuple[ComponentResult | None, dict[str, Any]]:
+        model = cp_model.CpModel()
         intervals = []
         chunk_vars: dict[str, dict[str, cp_model.IntVar | cp_model.BoolVar]] = {}
+        event_vars: dict[str, dict[str, Any]] = {}
+        hinted: set[int] = set()
         objective_terms: list[cp_model.LinearExpr] = []
+        balanced_members: list[
+            tuple[InternalChunk, dict[str, Any], tuple[int, int]]
+        ] = []
+        pomodoro_bonus = int(settings.objective_bonus_pomodoro * 100)
 
-        for chunk in chunks:
-            start_var = model.NewIntVar(horizon_start, horizon_end, f"start_{chunk.chunk_id}")
-            end_var = model.NewIntVar(horizon_start, horizon_end, f"end_{chunk.chunk_id}")
-            presence_var = model.NewBoolVar(f"present_{chunk.chunk_id}")
-            interval = model.NewOptionalIntervalVar(
-                start_var, chunk.duration, end_var, presence_var, f"iv_{chunk.chunk_id}"
+        for event_id, event_chunks in groupby(chunks, key=lambda item: item.event_id):
+            event_chunks = list(event_chunks)
+            # All chunks of an event share one presence decision.
+            event_presence = model.NewBoolVar(f"present_{event_id}")
+            previous: dict[str, cp_model.IntVar] | None = None
+            split_sizes: list[cp_model.IntVar] = []
+            for chunk in event_chunks:
+                start_var = model.NewIntVar(0, horizon_end, f"start_{chunk.chunk_id}")
+                end_var = model.NewIntVar(0, horizon_end, f"end_{chunk.chunk_id}")
+                if chunk.min_size is None:
+                    presence_var = event_presence
+                    size: cp_model.IntVar | int = chunk.size
+                else:
+                    # Variable-length pieces: later pieces are only used when the
+                    # earlier ones are, and keep their order, which removes
+                    # symmetric solutions.
+                    presence_var = (
+                        event_presence
+                        if previous is None
+                        else model.NewBoolVar(f"present_{chunk.chunk_id}")
+                    )
+                    size = model.NewIntVarFromDomain(
+                        cp_model.Domain.FromIntervals(
+                            [[0, 0], [chunk.min_size, chunk.size]]
+                        ),
+                        f"size_{chunk.chunk_id}",
+                    )
+                    model.Add(size == 0).OnlyEnforceIf(presence_var.Not())
+                    model.Add(size >= chunk.min_size).OnlyEnforceIf(presence_var)
+                    if previous is not None:
+                        model.AddImplication(presence_var, previous["presence"])
+                        # Unused pieces collapse onto the previous end, so the last
+                        # piece always ends where the event ends.
+                        model.Add(start_var == previous["end"]).OnlyEnforceIf(
+                            presence_var.Not()
+                        )
+                        model.Add(end_var == start_var).OnlyEnforceIf(
+                            presence_var.Not()
+                        )
+                    split_sizes.append(size)
+                interval = model.NewOptionalIntervalVar(
+                    start_var, size, end_var, presence_var, f"iv_{chunk.chunk_id}"
+                )
+                variables = {
+                    "start": start_var,
+                    "end": end_var,
+                    "presence": presence_var,
+                    "size": size,
+                }
+                chunk_vars[chunk.chunk_id] = variables
+                intervals.append(interval)
+                if chunk.earliest is not None:
+                    model.Add(start_var >= chunk.earliest).OnlyEnforceIf(presence_var)
+                if chunk.latest is not None:
+                    model.Add(start_var <= chunk.latest).OnlyEnforceIf(presence_var)
+                if chunk.blocked:
+                    model.Add(presence_var == 0)
+                if not chunk.is_break:
+                    self._constrain_windows(
+                        model, chunk, start_var, end_var, presence_var
+                    )
+                if previous is not None:
+                    if chunk.is_break:
+                        model.Add(start_var == previous["end"]).OnlyEnforceIf(
+                            presence_var
+                        )
+                    else:
+                        model.Add(start_var >= previous["end"]).OnlyEnforceIf(
+                            presence_var
+                        )
+                if warm_start is not None and not chunk.is_break:
+                    self._apply_warm_start(
+                        model, warm_start, chunk, variables, grid, horizon_end, hinted
+                    )
+                if families and not chunk.is_break and chunk.family_key in families:
+                    balanced_members.append(
+                        (chunk, variables, chunk_span(chunk, horizon_end))
+                    )
+                if not chunk.is_break:
+                    event_vars.setdefault(
+                        event_id, {"presence": event_presence, "start": start_var}
+                    )["end"] = end_var
+                previous = variables
+            if split_sizes:
+                total = grid.duration_slots(event_chunks[0].duration)
+                model.Add(sum(split_sizes) == total * event_presence)
+            weight = int(
+                event_chunks[0].priority * settings.objective_weight_priority * 100
             )
-            chunk_vars[chunk.chunk_id] = {
-                "start": start_var,
-                "end": end_var,
-                "presence": presence_var,
-            }
-            intervals.append(interval)
-            if chunk.earliest is not None:
-                model.Add(start_var >= chunk.earliest).OnlyEnforceIf(presence_var)
-            if chunk.latest is not None:
-                model.Add(start_var <= chunk.latest).OnlyEnforceIf(presence_var)
-            weight = int(chunk.priority * settings.objective_weight_priority * 100)
-            objective_terms.append(weight * presence_var)
+            if event_chunks[0].pomodoro:
+                weight += pomodoro_bonus
+            objective_terms.append(weight * event_presence)
 
         if intervals:
             model.AddNoOverlap(intervals)
+        # Dependencies (FS, SS, FF, SF with lag) link an event's first work
+        # chunk start and last work chunk end while the dependent is scheduled.
+        self._constrain_precedences(model, precedences, event_vars, outside)
+        # Family loads per day are slack-penalised against their daily minimum,
+        # maximum and weekly target (``objective_weight_family_*``).
+        penalties = (
+            add_family_balance(model, balanced_members, families, axis, grid)
+            if balanced_members
+            else []
+        )
 
         if chunks:
-            model.Maximize(sum(objective_terms))
+            model.Maximize(sum(objective_terms) - sum(penalties))
         else:
             model.Maximize(0)
 
+        def build_scheduled(value: Callable) -> list[ScheduledChunk]:
+            scheduled: list[ScheduledChunk] = []
+            remaining: dict[str, int] = {}
+            for chunk in chunks:
+                variables = chunk_vars[chunk.chunk_id]
+                presence_val = value(variables["presence"])
+                if presence_val == 0:
+                    continue
+                if chunk.anchor is not None:
+                    chunk_start = grid.normalise(chunk.anchor)
+                else:
+                    chunk_start = grid.to_datetime(value(variables["start"]))
+                minutes = chunk.duration
+                if chunk.min_size is not None:
+                    left = remaining.setdefault(chunk.event_id, chunk.duration)
+                    minutes = min(value(variables["size"]) * grid.granularity_min, left)
+                    remaining[chunk.event_id] = left - minutes
+                scheduled.append(
+                    ScheduledChunk(
+                        event_id=chunk.event_id,
+                        chunk_id=chunk.chunk_id,
+                        start=chunk_start,
+                        end=chunk_start + timedelta(minutes=minutes),
+                        is_break=chunk.is_break,
+                        metadata={"solver": "cp-sat"},
+                    )
+                )
+            return scheduled
+
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 10
-        status = solver.Solve(model)
+        self.profile.apply(solver.parameters, num_workers=num_workers)
+        solver.parameters.max_time_in_seconds = budget.claim()
+        if on_solution is not None:
+            status = solver.Solve(
+                model, _IncumbentCallback(build_scheduled, on_solution)
+            )
+        else:
+            status = solver.Solve(model)
+        stats = {
+            "status": solver.StatusName(status),
+            "chunks": len(chunks),
+            "wall_time": solver.WallTime(),
+        }
         if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-            return None
+            return None, stats
 
-        scheduled: list[ScheduledChunk] = []
-        for chunk in chunks:
-            presence_val = solver.Value(chunk_vars[chunk.chunk_id]["presence"])
-            if presence_val == 0:
-                continue
-            start_val = solver.Value(chunk_vars[chunk.chunk_id]["start"])
-            end_val = solver.Value(chunk_vars[chunk.chunk_id]["end"])
-            scheduled.append(
-                ScheduledChunk(
-                    event_id=chunk.event_id,
-                    chunk_id=chunk.chunk_id,
-                    start=TimeUtils.from_minutes(start_val),
-                    end=TimeUtils.from_minutes(end_val),
-                    is_break=chunk.is_break,
-                    metadata={"solver": "cp-sat"},
+        objective = solver.ObjectiveValue() if chunks else 0.0
+        stats["best_bound"] = solver.BestObjectiveBound() if chunks else 0.0
+        return (build_scheduled(solver.Value), objective), stats
+
+    def solve(
+        self,
+        events,
+        families,
+        pomodoro,
+        start: datetime,
+        end: datetime,
+        on_solution: Callable[[PlanSolution], None] | None = None,
+        warm_start: WarmStart | None = None,
+    ) -> PlanSolution | None:
+        """Plan ``events`` between ``start`` and ``end``.
+
+        ``on_solution`` receives every intermediate incumbent while the search
+        runs. A ``warm_start`` built from the previous plan hints the old
+        placements and pins frozen chunks, so only the edited neighbourhood is
+        re-optimised. Search parameters come from the ``SolverProfile``, which is
+        reported in the solution metadata with per-component statistics.
+        """
+        grid = TimeGrid(start, self.granularity_min)
+        horizon_end = max(grid.to_slot(end), 0)
+        events, families, pomodoro = planner_inputs(events, families, pomodoro)
+        # Events wholly outside the horizon stay out of the model; their stored
+        # times act as release times for their dependents.
+        outside = {}
+        for event in events:
+            span = outside_span(event, start, end)
+            if span is not None:
+                outside[str(event.id)] = (
+                    grid.to_slot(span[0]),
+                    grid.to_slot(span[1], round_up=True),
+                )
+        events = [event for event in events if str(event.id) not in outside]
+        chunks = self._build_chunks(events, families, pomodoro, grid, horizon_end)
+        balanced = balanced_families(families)
+        axis = DayAxis.for_grid(grid, horizon_end)
+        precedences = collect_precedences(events, grid)
+        if precedences:
+            # Raising earliest starts along the critical path also tightens the
+            # spans used for decomposition.
+            self._tighten_bounds(chunks, precedences, horizon_end, outside)
+
+        # Groups whose spans never overlap and that share no dependency are
+        # solved as separate models in parallel under one time budget, then
+        # merged. Spans of balanced-family chunks widen to whole days (weeks
+        # with a weekly target) so each family day belongs to one component.
+        if settings.planner_decompose:
+            links = [
+                (precedence.successor, precedence.predecessor)
+                for precedence in precedences
+                if precedence.predecessor not in outside
+            ]
+
+            def span(chunk: InternalChunk, horizon_end: int) -> tuple[int, int]:
+                family = balanced.get(chunk.family_key)
+                if family is None or chunk.is_break:
+                    return chunk_span(chunk, horizon_end)
+                return axis.widen(
+                    chunk_span(chunk, horizon_end),
+                    weekly=bool(family.weekly_target_minutes),
                 )
+
+            groups = decompose(chunks, horizon_end, links, span=span) or [[]]
+        else:
+            groups = [chunks]
+
+        def assemble(
+            results: Sequence[ComponentResult], metadata: dict[str, Any] | None = None
+        ) -> PlanSolution:
+            scheduled = sorted(
+                (chunk for component, _ in results for chunk in component),
+                key=lambda chunk: chunk.start,
+            )
+            return PlanSolution(
+                horizon_start=start,
+                horizon_end=end,
+                scheduled=scheduled,
+                objective_value=sum(objective for _, objective in results),
+                solver="cp-sat",
+                metadata=metadata,
             )
 
-        return PlanSolution(
-            horizon_start=start,
-            horizon_end=end,
-            scheduled=scheduled,
-            objective_value=solver.ObjectiveValue() if chunks else 0.0,
-            solver="cp-sat",
+        group_of = {
+            chunk.event_id: index
+            for index, group in enumerate(groups)
+            for chunk in group
+        }
+        group_precedences: list[list[Precedence]] = [[] for _ in groups]
+        for precedence in precedences:
+            if precedence.successor in group_of:
+                group_precedences[group_of[precedence.successor]].append(precedence)
+
+        merger = (
+            _IncumbentMerger(len(groups), assemble, on_solution)
+            if on_solution is not None
+            else None
+        )
+        started = time.monotonic()
+        concurrency = min(len(groups), self._max_parallel_components())
+        budget = _TimeBudget(self.profile.max_time_in_seconds, len(groups), concurrency)
+        num_workers = (
+            max(1, self.profile.effective_workers // concurrency)
+            if concurrency > 1
+            else None
         )
+
+        def run(index: int) -> tuple[ComponentResult | None, dict[str, Any]]:
+            return self._solve_component(
+                groups[index],
+                grid,
+                horizon_end,
+                budget,
+                num_workers,
+                warm_start,
+                merger.reporter(index) if merger is not None else None,
+                group_precedences[index],
+                balanced,
+                axis,
+                outside,
+            )
+
+        if concurrency > 1:
+            with ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix="cp-sat"
+            ) as executor:
+                outcomes = list(executor.map(run, range(len(groups))))
+        else:
+            outcomes = [run(index) for index in range(len(groups))]
+        results = [result for result, _ in outcomes]
+        if any(result is None for result in results):
+            return None
+
+        component_stats = [stats for _, stats in outcomes]
+        objective = sum(objective for _, objective in results)
+        best_bound = sum(stats["best_bound"] for stats in component_stats)
+        metadata = {
+            "profile": self.profile.describe(),
+            "granularity_min": self.granularity_min,
+            "components": len(groups),
+            "dependencies": len(precedences),
+            "parallel_components": concurrency,
+            "workers_per_component": num_workers or self.profile.effective_workers,
+            "status": "OPTIMAL"
+            if all(stats["status"] == "OPTIMAL" for stats in component_stats)
+            else "FEASIBLE",
+            "wall_time": time.monotonic() - started,
+            "best_bound": best_bound,
+            "relative_gap": abs(best_bound - objective) / max(abs(objective), 1.0),
+        }
+        if balanced:
+            family_of = {
+                str(event.id): getattr(event, "family_key", None) for event in events
+            }
+            scheduled = [chunk for component, _ in results for chunk in component]
+            metadata["families"] = family_report(
+                scheduled, family_of, families, start, end
+            )
+        return assemble(results, metadata)
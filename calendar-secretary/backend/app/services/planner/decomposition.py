@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable, Protocol, Sequence, TypeVar
+
+
+class SpanChunk(Protocol):
+    event_id: str
+    size: int
+    earliest: int | None
+    latest: int | None
+
+
+ChunkT = TypeVar("ChunkT", bound=SpanChunk)
+
+
+class _DisjointSet:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, left: int, right: int) -> None:
+        left_root, right_root = self.find(left), self.find(right)
+        if left_root != right_root:
+            self.parent[right_root] = left_root
+
+
+def chunk_span(chunk: SpanChunk, horizon_end: int) -> tuple[int, int]:
+    """Slots a chunk may occupy: from its earliest start to its latest end."""
+    earliest = chunk.earliest if chunk.earliest is not None else 0
+    latest = chunk.latest if chunk.latest is not None else horizon_end - chunk.size
+    return earliest, latest + chunk.size
+
+
+def decompose(
+    chunks: Sequence[ChunkT],
+    horizon_end: int,
+    links: Iterable[tuple[str, str]] = (),
+    span: Callable[[ChunkT, int], tuple[int, int]] = chunk_span,
+) -> list[list[ChunkT]]:
+    """Split chunks into groups that can be solved independently.
+
+    A sweep over the chunk spans cuts the horizon wherever no chunk can cross,
+    which is typically at day boundaries and around fixed events. Chunks of one
+    event and events joined by a link (dependencies) always share a group.
+    ``span`` may widen chunk spans, e.g. to keep whole days together.
+    Groups are returned in time order, each keeping the input chunk order.
+    """
+
+    if not chunks:
+        return []
+    disjoint = _DisjointSet(len(chunks))
+
+    order = sorted(range(len(chunks)), key=lambda index: span(chunks[index], horizon_end))
+    current_root = order[0]
+    current_end = span(chunks[current_root], horizon_end)[1]
+    for index in order[1:]:
+        span_start, span_end = span(chunks[index], horizon_end)
+        if span_start < current_end:
+            disjoint.union(current_root, index)
+            current_end = max(current_end, span_end)
+        else:
+            current_root, current_end = index, span_end
+
+    first_chunk_of_event: dict[str, int] = {}
+    for index, chunk in enumerate(chunks):
+        first = first_chunk_of_event.setdefault(chunk.event_id, index)
+        disjoint.union(first, index)
+    for left, right in links:
+        if left in first_chunk_of_event and right in first_chunk_of_event:
+            disjoint.union(first_chunk_of_event[left], first_chunk_of_event[right])
+
+    groups: dict[int, list[int]] = {}
+    for index in range(len(chunks)):
+        groups.setdefault(disjoint.find(index), []).append(index)
+    ordered = sorted(groups.values(), key=lambda members: min(span(chunks[i], horizon_end) for i in members))
+    return [[chunks[index] for index in members] for members in ordered]
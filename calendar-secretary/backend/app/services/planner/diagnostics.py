@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from app.core.config import settings
+from app.schemas.plan import PlanDiagnosis, PlanIssue
+from app.services.planner.families import DayAxis
+from app.services.planner.precedence import EventSpan, Precedence, critical_path_bounds
+from app.services.planner.rules import (
+    DependencyGraphError,
+    TimeGrid,
+    iter_dependencies,
+    outside_span,
+    topological_sort,
+    window_bounds,
+)
+from app.services.planner.snapshot import planner_inputs
+from app.services.planner.splitting import plan_chunks
+from app.services.planner.timeline import FreeTimeline
+
+
+def _title(event) -> str:
+    return getattr(event, "title", None) or str(event.id)
+
+
+def _severity(tasks: list[_Task]) -> str:
+    return "error" if all(task.severity == "error" for task in tasks) else "warning"
+
+
+@dataclass
+class _Task:
+    event: Any
+    duration: int
+    min_piece: int
+    regions: list[tuple[int, int]]
+
+    @property
+    def id(self) -> str:
+        return str(self.event.id)
+
+    @property
+    def severity(self) -> str:
+        """Fixed events must happen; flexible tasks may be left out of a plan."""
+        return (
+            "error" if getattr(self.event, "type", "flexible") == "fixed" else "warning"
+        )
+
+    @property
+    def release(self) -> int:
+        return self.regions[0][0]
+
+    @property
+    def due(self) -> int:
+        return self.regions[-1][1]
+
+
+class _BusyIndex:
+    """Merged busy intervals with prefix sums for ``O(log n)`` busy-time queries."""
+
+    def __init__(self, intervals: list[tuple[int, int]]):
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        self.before: list[int] = [0]
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1]:
+                if end > self.ends[-1]:
+                    self.before[-1] += end - self.ends[-1]
+                    self.ends[-1] = end
+                continue
+            self.starts.append(start)
+            self.ends.append(end)
+            self.before.append(self.before[-1] + end - start)
+
+    def _until(self, moment: int) -> int:
+        index = bisect_left(self.ends, moment)
+        busy = self.before[index]
+        if index < len(self.starts) and self.starts[index] < moment:
+            busy += moment - self.starts[index]
+        return busy
+
+    def free(self, start: int, end: int) -> int:
+        return max(end - start - (self._until(end) - self._until(start)), 0)
+
+
+class PlanDiagnostics:
+    """Cheap checks that show which events cannot all fit into a horizon.
+
+    Runs before any model is built, in ``O(n log n)`` minutes arithmetic, over
+    the events that overlap the horizon; history and events still to come are
+    left out, and prerequisites among them count as done at their stored times:
+
+    * dependencies are checked for cycles;
+    * pinned fixed events are swept in start order to find overlaps;
+    * every task needs a free slot (a contiguous one unless it may be split)
+      inside its time windows, deadline and the horizon;
+    * a critical-path pass along dependency chains finds tasks whose
+      prerequisites cannot finish in time;
+    * demand is compared with free time up to every due time (earliest-due
+      order) and per calendar day for tasks confined to one day.
+
+    Every check is a necessary condition, so an empty list does not prove
+    that everything fits. Issues that involve only fixed events (which must
+    happen) and cycles are errors that make the calendar infeasible. Issues
+    with flexible tasks are warnings: the solvers leave such tasks out.
+    """
+
+    def __init__(self, start: datetime, end: datetime):
+        self.start = start
+        self.end = end
+        self.grid = TimeGrid(start)
+        self.horizon = max(self.grid.to_slot(end), 0)
+
+    def _at(self, minute: int) -> datetime:
+        return self.grid.to_datetime(minute)
+
+    def _pinned(self, event) -> tuple[int, int] | None:
+        windows = getattr(event, "time_windows", None)
+        if getattr(event, "type", "flexible") != "fixed" or not windows:
+            return None
+        window_start, window_end = window_bounds(windows[0])
+        if window_end - window_start > timedelta(minutes=event.duration_min):
+            return None
+        return self.grid.to_slot(window_start, round_up=True), self.grid.to_slot(
+            window_end
+        )
+
+    def _task(self, event, pomodoro) -> _Task:
+        high = self.horizon
+        deadline = getattr(event, "deadline", None)
+        if deadline is not None:
+            high = min(high, self.grid.to_slot(deadline, round_up=True))
+        regions = []
+        for window in getattr(event, "time_windows", None) or [
+            {"start": self.start, "end": self.end}
+        ]:
+            window_start, window_end = window_bounds(window)
+            low = max(self.grid.to_slot(window_start), 0)
+            regions.append(
+                (low, min(self.grid.to_slot(window_end, round_up=True), high))
+            )
+        specs = plan_chunks(
+            event,
+            pomodoro,
+            settings.planner_max_chunks_per_event,
+            settings.planner_default_min_chunk_min,
+        )
+        work = [spec for spec in specs if not spec.is_break]
+        min_piece = (
+            event.duration_min
+            if len(work) == 1 and not work[0].min_duration
+            else min(spec.min_duration or spec.duration for spec in work)
+        )
+        return _Task(
+            event,
+            event.duration_min,
+            min_piece,
+            sorted(region for region in regions if region[1] > region[0]),
+        )
+
+    def diagnose(self, events, families=None, pomodoro=None) -> PlanDiagnosis:
+        started = time.perf_counter()
+        events, families, pomodoro = planner_inputs(events, families, pomodoro)
+        issues = self._cycles(events)
+        outside: dict[str, tuple[int, int]] = {}
+        pinned: list[tuple[int, int, Any]] = []
+        tasks: list[_Task] = []
+        for event in events:
+            span = outside_span(event, self.start, self.end)
+            if span is not None:
+                outside[str(event.id)] = (
+                    self.grid.to_slot(span[0]),
+                    self.grid.to_slot(span[1], round_up=True),
+                )
+                continue
+            interval = self._pinned(event)
+            if interval is None:
+                tasks.append(self._task(event, pomodoro))
+            elif interval[1] > 0 and interval[0] < self.horizon:
+                pinned.append((*interval, event))
+
+        issues.extend(self._fixed_overlaps(pinned))
+        busy = [(max(start, 0), min(end, self.horizon)) for start, end, _ in pinned]
+        timeline = FreeTimeline(0, self.horizon, busy)
+        index = _BusyIndex(busy)
+
+        placeable = []
+        for task in tasks:
+            issue = self._slot_issue(task, timeline)
+            if issue is None:
+                placeable.append(task)
+            else:
+                issues.append(issue)
+        known = {str(event.id) for event in events} - outside.keys()
+        issues.extend(self._dependency_issues(placeable, pinned, known, outside))
+        fixed = [task for task in placeable if task.severity == "error"]
+        issues.extend(
+            self._overloads(fixed, index) or self._overloads(placeable, index)
+        )
+        issues.extend(self._day_overloads(placeable, index))
+        feasible = not any(issue.severity == "error" for issue in issues)
+        return PlanDiagnosis(
+            feasible=feasible, issues=issues, wall_time=time.perf_counter() - started
+        )
+
+    def _cycles(self, events) -> list[PlanIssue]:
+        edges = {
+            str(event.id): {
+                dep_id
+                for dep_id, _, _ in iter_dependencies(event)
+                if dep_id != str(event.id)
+            }
+            for event in events
+        }
+        try:
+            topological_sort(edges.keys(), edges)
+        except DependencyGraphError as exc:
+            return [
+                PlanIssue(
+                    kind="cycle",
+                    severity="error",
+                    message=str(exc),
+                    event_ids=exc.cycle,
+                )
+            ]
+        return []
+
+    def _fixed_overlaps(self, pinned: list[tuple[int, int, Any]]) -> list[PlanIssue]:
+        issues = []
+        latest: tuple[int, int, Any] | None = None
+        for item in sorted(pinned, key=lambda entry: (entry[0], entry[1])):
+            if latest is not None and item[0] < latest[1]:
+                issues.append(
+                    PlanIssue(
+                        kind="fixed_overlap",
+                        severity="error",
+                        message=(
+                            f"Fixed events '{_title(latest[2])}' and "
+                            f"'{_title(item[2])}' overlap"
+                        ),
+                        event_ids=[latest[2].id, item[2].id],
+                        start=self._at(item[0]),
+                        end=self._at(min(item[1], latest[1])),
+                    )
+                )
+            if latest is None or item[1] > latest[1]:
+                latest = item
+        return issues
+
+    def _slot_issue(self, task: _Task, timeline: FreeTimeline) -> PlanIssue | None:
+        title = _title(task.event)
+        if (
+            not task.regions
+            or max(high - low for low, high in task.regions) < task.min_piece
+        ):
+            return PlanIssue(
+                kind="no_slot",
+                severity=task.severity,
+                message=(
+                    f"'{title}' does not fit inside its time windows, deadline "
+                    "and the horizon"
+                ),
+                event_ids=[task.event.id],
+                required_min=task.duration,
+                available_min=max(
+                    (high - low for low, high in task.regions), default=0
+                ),
+            )
+        if task.min_piece == task.duration:
+            fits = any(
+                timeline.earliest_fit(task.duration, low, high) is not None
+                for low, high in task.regions
+            )
+            available = max(
+                (
+                    piece_end - piece_start
+                    for low, high in task.regions
+                    for piece_start, piece_end in timeline.iter_free(low, high)
+                ),
+                default=0,
+            )
+        else:
+            available = sum(
+                piece_end - piece_start
+                for low, high in task.regions
+                for piece_start, piece_end in timeline.iter_free(
+                    low, high, min_length=task.min_piece
+                )
+            )
+            fits = available >= task.duration
+        if fits:
+            return None
+        return PlanIssue(
+            kind="no_slot",
+            severity=task.severity,
+            message=(
+                f"Fixed events leave no free slot for '{title}' inside its time "
+                "windows and deadline"
+            ),
+            event_ids=[task.event.id],
+            start=self._at(task.release),
+            end=self._at(task.due),
+            required_min=task.duration,
+            available_min=available,
+        )
+
+    def _dependency_issues(
+        self,
+        tasks: list[_Task],
+        pinned: list[tuple[int, int, Any]],
+        known: set[str],
+        outside: dict[str, tuple[int, int]],
+    ) -> list[PlanIssue]:
+        """Tasks whose prerequisites cannot finish early enough.
+
+        Unplaceable prerequisites block their dependents too. Prerequisites in
+        ``outside`` take part as rigid spans at their stored times, so history
+        releases its dependents instead of ruling them out.
+        """
+        spans = {
+            event_id: EventSpan(start, start, end - start, True)
+            for event_id, (start, end) in outside.items()
+        }
+        spans.update(
+            {
+                str(event.id): EventSpan(start, start, end - start, True)
+                for start, end, event in pinned
+            }
+        )
+        for task in tasks:
+            spans[task.id] = EventSpan(
+                task.release,
+                task.due - task.duration,
+                task.duration,
+                task.min_piece == task.duration,
+            )
+        precedences = [
+            Precedence(task.id, dep_id, dep_type, lag_min)
+            for task in tasks
+            for dep_id, dep_type, lag_min in iter_dependencies(task.event)
+            if dep_id != task.id and (dep_id in known or dep_id in outside)
+        ]
+        if not precedences:
+            return []
+        try:
+            impossible = critical_path_bounds(spans, precedences)
+        except DependencyGraphError:
+            return []  # already reported by ``_cycles``
+        blocked_by = defaultdict(list)
+        for precedence in precedences:
+            if precedence.successor in impossible:
+                blocked_by[precedence.successor].append(precedence.predecessor)
+        return [
+            PlanIssue(
+                kind="dependency",
+                severity=task.severity,
+                message=f"'{_title(task.event)}' cannot start before its prerequisites "
+                f"finish and still meet its windows and deadline",
+                event_ids=[task.event.id, *blocked_by[task.id]],
+                start=self._at(min(spans[task.id].earliest, self.horizon)),
+                end=self._at(task.due),
+                required_min=task.duration,
+                available_min=max(task.due - spans[task.id].earliest, 0),
+            )
+            for task in tasks
+            if task.id in impossible
+        ]
+
+    def _overloads(self, tasks: list[_Task], index: _BusyIndex) -> list[PlanIssue]:
+        """Earliest-due-first demand check.
+
+        Work due by ``t`` must fit into the free time before ``t``. The issue is
+        an error when all of that work is fixed.
+        """
+        issues = []
+        demand = 0
+        due_by: list[_Task] = []
+        ordered = sorted(tasks, key=lambda task: task.due)
+        for position, task in enumerate(ordered):
+            demand += task.duration
+            due_by.append(task)
+            if position + 1 < len(ordered) and ordered[position + 1].due == task.due:
+                continue
+            available = index.free(0, task.due)
+            if demand > available:
+                issues.append(
+                    PlanIssue(
+                        kind="overload",
+                        severity=_severity(due_by),
+                        message=(
+                            f"{len(due_by)} tasks due by "
+                            f"{self._at(task.due).isoformat()} need {demand} "
+                            f"minutes but only {available} are free"
+                        ),
+                        event_ids=[item.event.id for item in due_by],
+                        start=self.start,
+                        end=self._at(task.due),
+                        required_min=demand,
+                        available_min=available,
+                    )
+                )
+                break
+        return issues
+
+    def _day_overloads(self, tasks: list[_Task], index: _BusyIndex) -> list[PlanIssue]:
+        axis = DayAxis.for_grid(self.grid, self.horizon)
+        if axis.day_of(0) == axis.day_of(max(self.horizon - 1, 0)):
+            return []  # the earliest-due check already covers a single day
+        by_day: dict[int, list[_Task]] = defaultdict(list)
+        for task in tasks:
+            day = axis.day_of(task.release)
+            if axis.day_of(task.due - 1) == day:
+                by_day[day].append(task)
+        issues = []
+        for day, members in sorted(by_day.items()):
+            fixed = [task for task in members if task.severity == "error"]
+            for group in (fixed, members) if fixed else (members,):
+                low = min(task.release for task in group)
+                high = max(task.due for task in group)
+                demand = sum(task.duration for task in group)
+                available = index.free(low, high)
+                if demand > available:
+                    issues.append(
+                        PlanIssue(
+                            kind="day_overload",
+                            severity=_severity(group),
+                            message=(
+                                f"{len(group)} tasks confined to "
+                                f"{self._at(max(axis.day_start(day), 0)).date()} "
+                                f"need {demand} minutes but only {available} "
+                                "are free"
+                            ),
+                            event_ids=[task.event.id for task in group],
+                            start=self._at(low),
+                            end=self._at(high),
+                            required_min=demand,
+                            available_min=available,
+                        )
+                    )
+                    break
+        return issues
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from ortools.sat.python import cp_model
+
+from app.core.config import settings
+from app.services.planner.rules import TimeGrid, TimeUtils
+
+
+def balanced_families(families: dict[str, Any]) -> dict[str, Any]:
+    """Families with a daily minimum, daily maximum or weekly target."""
+    return {
+        key: family
+        for key, family in families.items()
+        if any(
+            getattr(family, name, None)
+            for name in ("min_daily_minutes", "max_daily_minutes", "weekly_target_minutes")
+        )
+    }
+
+
+@dataclass(frozen=True)
+class DayAxis:
+    """Calendar days of a ``TimeGrid`` horizon.
+
+    Day ``0`` starts at the midnight on or before the grid origin (in the
+    origin's timezone) and every day spans ``slots_per_day`` slots.
+    """
+
+    offset: int
+    slots_per_day: int
+    first_weekday: int
+    horizon_end: int
+
+    @classmethod
+    def for_grid(cls, grid: TimeGrid, horizon_end: int) -> DayAxis:
+        midnight = grid.origin.replace(hour=0, minute=0, second=0, microsecond=0)
+        return cls(grid.to_slot(midnight), 1440 // grid.granularity_min, midnight.weekday(), horizon_end)
+
+    def day_of(self, slot: int) -> int:
+        return (slot - self.offset) // self.slots_per_day
+
+    def week_of(self, day: int) -> int:
+        return (day + self.first_weekday) // 7
+
+    def day_start(self, day: int) -> int:
+        return self.offset + day * self.slots_per_day
+
+    def share(self, day: int) -> float:
+        """Fraction of ``day`` that lies inside the horizon."""
+        start = self.day_start(day)
+        inside = min(start + self.slots_per_day, self.horizon_end) - max(start, 0)
+        return max(inside, 0) / self.slots_per_day
+
+    def widen(self, span: tuple[int, int], weekly: bool) -> tuple[int, int]:
+        """Stretch a slot span to whole days, or to whole weeks when ``weekly``."""
+        first, last = self.day_of(span[0]), self.day_of(max(span[1] - 1, span[0]))
+        if weekly:
+            first = self.week_of(first) * 7 - self.first_weekday
+            last = self.week_of(last) * 7 - self.first_weekday + 6
+        return self.day_start(first), self.day_start(last + 1)
+
+
+def _slot_weight(weight: float, grid: TimeGrid) -> int:
+    """Objective cost of one slot for a per-hour weight on the priority scale (x100)."""
+    return max(1, round(weight * 100 * grid.granularity_min / 60)) if weight > 0 else 0
+
+
+def add_family_balance(
+    model: cp_model.CpModel,
+    members: Iterable[tuple[Any, dict[str, Any], tuple[int, int]]],
+    families: dict[str, Any],
+    axis: DayAxis,
+    grid: TimeGrid,
+) -> list[cp_model.LinearExpr]:
+    """Add per-day family loads and return the objective penalty terms.
+
+    ``members`` holds ``(chunk, variables, span)`` for every work chunk of a
+    balanced family. Each chunk gets a day variable tied to its start and an
+    optional unit interval on a day axis with its size as demand. A fixed
+    "shadow" interval per day demands ``capacity - load`` in the same
+    cumulative, so every day's real load is at most ``load``; since the loads
+    also add up to the family total, each ``load`` equals its day's minutes.
+    This keeps the model linear in chunks plus days instead of chunks times
+    days. Daily deficits, daily overuse and weekly shortfalls are slack
+    variables on those loads.
+    """
+    grouped: dict[str, list[tuple[Any, dict[str, Any], tuple[int, int]]]] = defaultdict(list)
+    for member in members:
+        grouped[member[0].family_key].append(member)
+
+    deficit_cost = _slot_weight(settings.objective_weight_family_deficit, grid)
+    overuse_cost = _slot_weight(settings.objective_weight_family_overuse, grid)
+    target_cost = _slot_weight(settings.objective_weight_family_target, grid)
+    penalties: list[cp_model.LinearExpr] = []
+    for key, items in grouped.items():
+        family = families[key]
+        capacity = sum(chunk.size for chunk, _, _ in items)
+        intervals, demands, totals = [], [], []
+        first_day, last_day = None, None
+        for chunk, variables, (span_start, span_end) in items:
+            low = axis.day_of(span_start)
+            high = axis.day_of(max(span_end - chunk.size, span_start))
+            first_day = low if first_day is None else min(first_day, low)
+            last_day = high if last_day is None else max(last_day, high)
+            day = model.NewIntVar(low, high, f"day_{chunk.chunk_id}")
+            presence, start = variables["presence"], variables["start"]
+            model.Add(start >= axis.offset + day * axis.slots_per_day).OnlyEnforceIf(presence)
+            model.Add(start < axis.offset + (day + 1) * axis.slots_per_day).OnlyEnforceIf(presence)
+            intervals.append(model.NewOptionalFixedSizeIntervalVar(day, 1, presence, f"day_iv_{chunk.chunk_id}"))
+            demands.append(variables["size"])
+            totals.append(variables["size"] * presence if isinstance(variables["size"], int) else variables["size"])
+
+        loads = {}
+        for day in range(first_day, last_day + 1):
+            loads[day] = model.NewIntVar(0, capacity, f"load_{key}_{day}")
+            intervals.append(model.NewFixedSizeIntervalVar(day, 1, f"shadow_{key}_{day}"))
+            demands.append(capacity - loads[day])
+        model.AddCumulative(intervals, demands, capacity)
+        model.Add(sum(loads.values()) == sum(totals))
+
+        minimum = grid.duration_slots(family.min_daily_minutes or 0)
+        maximum = family.max_daily_minutes
+        for day, load in loads.items():
+            required = round(minimum * axis.share(day))
+            if required:
+                deficit = model.NewIntVar(0, required, f"deficit_{key}_{day}")
+                model.Add(deficit >= required - load)
+                penalties.append(deficit_cost * deficit)
+            if maximum is not None:
+                overuse = model.NewIntVar(0, capacity, f"overuse_{key}_{day}")
+                model.Add(overuse >= load - grid.duration_slots(maximum))
+                penalties.append(overuse_cost * overuse)
+
+        target = grid.duration_slots(family.weekly_target_minutes or 0)
+        if target:
+            weeks: dict[int, list[int]] = defaultdict(list)
+            for day in loads:
+                weeks[axis.week_of(day)].append(day)
+            for week, days in weeks.items():
+                first = week * 7 - axis.first_weekday
+                required = round(target * sum(axis.share(day) for day in range(first, first + 7)) / 7)
+                if required:
+                    shortfall = model.NewIntVar(0, required, f"shortfall_{key}_{week}")
+                    model.Add(shortfall >= required - sum(loads[day] for day in days))
+                    penalties.append(target_cost * shortfall)
+    return penalties
+
+
+def family_report(
+    scheduled: Iterable[Any], family_of: dict[str, str | None], families: dict[str, Any], start: datetime, end: datetime
+) -> dict[str, dict[str, int]]:
+    """Minutes missing from daily minimums, above daily maximums and short of weekly targets."""
+    balanced = balanced_families(families)
+    if not balanced:
+        return {}
+    origin = TimeUtils.as_utc(start)
+    horizon = (TimeUtils.as_utc(end) - origin).total_seconds() / 60
+    axis = DayAxis.for_grid(TimeGrid(start), int(horizon))
+    loads: dict[str, dict[int, float]] = {key: defaultdict(float) for key in balanced}
+    for chunk in scheduled:
+        key = family_of.get(str(chunk.event_id))
+        if key in loads and not chunk.is_break:
+            slot = (TimeUtils.as_utc(chunk.start) - origin).total_seconds() / 60
+            loads[key][axis.day_of(int(slot))] += (chunk.end - chunk.start) / timedelta(minutes=1)
+
+    days = range(axis.day_of(0), axis.day_of(max(axis.horizon_end - 1, 0)) + 1)
+    report = {}
+    for key, family in balanced.items():
+        load = loads[key]
+        deficit = sum(max(0.0, (family.min_daily_minutes or 0) * axis.share(day) - load[day]) for day in days)
+        overuse = sum(max(0.0, load[day] - family.max_daily_minutes) for day in days) if family.max_daily_minutes else 0
+        shortfall = 0.0
+        if family.weekly_target_minutes:
+            for week in sorted({axis.week_of(day) for day in days}):
+                first = week * 7 - axis.first_weekday
+                week_days = range(first, first + 7)
+                required = family.weekly_target_minutes * sum(axis.share(day) for day in week_days) / 7
+                shortfall += max(0.0, required - sum(load[day] for day in week_days))
+        report[key] = {
+            "daily_deficit_min": round(deficit),
+            "daily_overuse_min": round(overuse),
+            "weekly_shortfall_min": round(shortfall),
+        }
+    return report
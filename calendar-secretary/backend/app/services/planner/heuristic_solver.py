@@ -3,10 +3,21 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Iterable
-from uuid import uuid4
 
+from app.core.config import settings
 from app.schemas.plan import PlanSolution, ProposalResponse, ScheduledChunk
-from app.services.planner.rules import topological_sort
+from app.services.planner.proposals import ProposalEngine
+from app.services.planner.rules import (
+    TimeUtils,
+    iter_dependencies,
+    make_chunk_id,
+    outside_span,
+    topological_sort,
+    window_bounds,
+)
+from app.services.planner.snapshot import planner_inputs
+from app.services.planner.splitting import ChunkSpec, plan_chunks
+from app.services.planner.timeline import FreeTimeline
 
 
 @dataclass
@@ -20,36 +31,16 @@ class HeuristicPlanner:
 
     Steps:
     1. Sort tasks by effective priority (priority * family weight).
-    2. Greedily assign tasks to the earliest feasible slot.
-    3. Run a simple local improvement pass that swaps adjacent tasks if it reduces
-       total tardiness.
+    2. Greedily assign tasks to the earliest feasible slot of a free-time index
+       built from fixed events, honouring windows, deadlines and dependencies.
     """
 
     def _extract_dependency_ids(self, event: any) -> set[str]:
-        dependency_ids: set[str] = set()
-        raw_dependencies = getattr(event, "depends_on", None)
-        if raw_dependencies:
-            for dependency in raw_dependencies:
-                if isinstance(dependency, dict):
-                    dep_id = dependency.get("task_id") or dependency.get("depends_on_id")
-                else:
-                    dep_id = getattr(dependency, "task_id", None)
-                    if dep_id is None:
-                        dep_id = getattr(dependency, "depends_on_id", None)
-                if dep_id is not None:
-                    dependency_ids.add(str(dep_id))
-        orm_dependencies = getattr(event, "dependencies", None)
-        if orm_dependencies:
-            for dependency in orm_dependencies:
-                dep_id = getattr(dependency, "depends_on_id", None)
-                if dep_id is not None:
-                    dependency_ids.add(str(dep_id))
-        return dependency_ids
+        return {dep_id for dep_id, _, _ in iter_dependencies(event)}
 
     def _sort_events(self, events: Iterable, families: dict[str, any]) -> list[HeuristicTask]:
         event_map = {str(event.id): event for event in events}
         tasks: dict[str, HeuristicTask] = {}
-        prerequisite_map: dict[str, set[str]] = {}
         adjacency: dict[str, set[str]] = {event_id: set() for event_id in event_map}
 
         for event_id, event in event_map.items():
@@ -61,69 +52,247 @@ class HeuristicPlanner:
                 for dep_id in self._extract_dependency_ids(event)
                 if dep_id in event_map and dep_id != event_id
             }
-            prerequisite_map[event_id] = dependencies
             for dep_id in dependencies:
                 adjacency.setdefault(dep_id, set()).add(event_id)
 
-        if not tasks:
-            return []
+        position = {event_id: index for index, event_id in enumerate(tasks)}
+        order = topological_sort(
+            tasks.keys(), adjacency, key=lambda event_id: (-tasks[event_id].priority, position[event_id])
+        )
+        return [tasks[event_id] for event_id in order]
+
+    @staticmethod
+    def _seconds(origin: datetime, value: datetime | str) -> int:
+        return int((TimeUtils.as_utc(value) - TimeUtils.as_utc(origin)).total_seconds())
+
+    def _anchor(self, event, origin: datetime) -> tuple[int, int] | None:
+        """Busy interval of a fixed event whose window leaves no room to move."""
+        windows = getattr(event, "time_windows", None)
+        if getattr(event, "type", "flexible") != "fixed" or not windows:
+            return None
+        window_start, window_end = window_bounds(windows[0])
+        if window_end - window_start > timedelta(minutes=event.duration_min):
+            return None
+        return self._seconds(origin, window_start), self._seconds(origin, window_end)
+
+    def _bounds(self, event, origin: datetime, horizon: int) -> list[tuple[int, int]]:
+        """Allowed ``(low, high)`` ranges from time windows, deadline and horizon end."""
+        high = horizon
+        deadline = getattr(event, "deadline", None)
+        if deadline is not None:
+            high = min(high, self._seconds(origin, deadline))
+        windows = getattr(event, "time_windows", None)
+        if not windows:
+            return [(0, high)]
+        ranges = []
+        for window in windows:
+            window_start, window_end = window_bounds(window)
+            ranges.append((max(0, self._seconds(origin, window_start)), min(high, self._seconds(origin, window_end))))
+        return sorted(bound for bound in ranges if bound[1] > bound[0])
+
+    def _outside(self, events: Iterable, origin: datetime, end: datetime) -> dict[str, tuple[int, int]]:
+        """Stored spans of events lying wholly before or after the horizon.
+
+        They are not placed in this run; dependents treat them as done (or
+        still to come) at their stored times instead of waiting for them.
+        """
+        spans = {}
+        for event in events:
+            span = outside_span(event, origin, end)
+            if span is not None:
+                spans[str(event.id)] = (self._seconds(origin, span[0]), self._seconds(origin, span[1]))
+        return spans
+
+    @staticmethod
+    def _release(
+        event, duration: int, placed: dict[str, tuple[int, int]], pending: set[str] | None = None
+    ) -> int | None:
+        """Earliest start allowed by prerequisite spans in ``placed``.
+
+        Returns ``None`` when a prerequisite is missing from ``placed`` and is in
+        ``pending`` (events inside the horizon; every unplaced one when ``None``).
+        """
+        release = 0
+        for dep_id, dep_type, lag_min in iter_dependencies(event):
+            if dep_id == str(event.id):
+                continue
+            if dep_id not in placed:
+                if pending is None or dep_id in pending:
+                    return None
+                continue
+            pred_start, pred_end = placed[dep_id]
+            lag = lag_min * 60
+            if dep_type == "SS":
+                release = max(release, pred_start + lag)
+            elif dep_type == "FF":
+                release = max(release, pred_end + lag - duration)
+            elif dep_type == "SF":
+                release = max(release, pred_start + lag - duration)
+            else:
+                release = max(release, pred_end + lag)
+        return release
 
-        topo_order = topological_sort(tasks.keys(), adjacency)
-        topo_index = {event_id: index for index, event_id in enumerate(topo_order)}
+    @staticmethod
+    def _earliest(timeline: FreeTimeline, duration: int, bounds, release: int) -> int | None:
+        starts = [timeline.earliest_fit(duration, max(low, release), high) for low, high in bounds]
+        return min((start for start in starts if start is not None), default=None)
 
-        indegree = {event_id: len(prerequisite_map[event_id]) for event_id in tasks}
-        available = [event_id for event_id, degree in indegree.items() if degree == 0]
-        ordered_tasks: list[HeuristicTask] = []
+    def _place_sequence(
+        self, timeline: FreeTimeline, specs: list[ChunkSpec], bounds, release: int
+    ) -> list[tuple[ChunkSpec, int, int]] | None:
+        """Place sessions in order, each with the break that follows it."""
+        blocks: list[list[ChunkSpec]] = []
+        for spec in specs:
+            if spec.is_break and blocks:
+                blocks[-1].append(spec)
+            else:
+                blocks.append([spec])
+        placements: list[tuple[ChunkSpec, int, int]] = []
+        cursor = release
+        for block in blocks:
+            # A trailing break may be dropped rather than blocking the session.
+            for candidate in (block, block[:1]):
+                length = sum(spec.duration for spec in candidate) * 60
+                start = self._earliest(timeline, length, bounds, cursor)
+                if start is not None:
+                    break
+            if start is None:
+                for spec, spec_start, spec_end in placements:
+                    timeline.free(spec_start, spec_end)
+                return None
+            timeline.reserve(start, start + length)
+            for spec in candidate:
+                placements.append((spec, start, start + spec.duration * 60))
+                start += spec.duration * 60
+            cursor = start
+        return placements
 
-        while available:
-            available.sort(key=lambda eid: (-tasks[eid].priority, topo_index[eid]))
-            current_id = available.pop(0)
-            ordered_tasks.append(tasks[current_id])
-            for child_id in adjacency.get(current_id, set()):
-                indegree[child_id] -= 1
-                if indegree[child_id] == 0:
-                    available.append(child_id)
+    def _place_split(
+        self, timeline: FreeTimeline, specs: list[ChunkSpec], bounds, release: int
+    ) -> list[tuple[ChunkSpec, int, int]] | None:
+        """Fill free gaps in order with pieces no shorter than the minimum chunk."""
+        total = specs[0].duration * 60
+        minimum = (specs[0].min_duration or specs[0].duration) * 60
+        pieces: list[tuple[int, int]] = []
+        remaining = total
+        for low, high in bounds:
+            for gap_start, gap_end in timeline.iter_free(max(low, release), high, min_length=minimum):
+                take = min(gap_end - gap_start, remaining)
+                if len(pieces) == len(specs) - 1 and take < remaining:
+                    continue
+                if 0 < remaining - take < minimum:
+                    take = remaining - minimum
+                    if take < minimum:
+                        continue
+                pieces.append((gap_start, gap_start + take))
+                remaining -= take
+                if not remaining:
+                    break
+            if not remaining:
+                break
+        if remaining:
+            return None
+        placements = []
+        for spec, (piece_start, piece_end) in zip(specs, pieces):
+            timeline.reserve(piece_start, piece_end)
+            placements.append((spec, piece_start, piece_end))
+        return placements
 
-        return ordered_tasks
+    def _place(self, timeline: FreeTimeline, event, specs: list[ChunkSpec], bounds, release: int):
+        duration = event.duration_min * 60
+        start = self._earliest(timeline, duration, bounds, release)
+        if start is not None and (len(specs) == 1 or specs[0].min_duration):
+            timeline.reserve(start, start + duration)
+            return [(ChunkSpec(index=0, ordinal=0, duration=event.duration_min), start, start + duration)]
+        if specs[0].min_duration:
+            return self._place_split(timeline, specs, bounds, release)
+        if len(specs) > 1:
+            return self._place_sequence(timeline, specs, bounds, release)
+        return None
 
     def solve(self, events, families, pomodoro, start: datetime, end: datetime) -> PlanSolution:
+        """Greedy earliest-fit placement on a free-time index.
+
+        Fixed events pinned to their window are reserved first; every other task
+        is placed in priority and dependency order at the earliest free slot that
+        respects its windows, deadline, prerequisites and the horizon end.
+        Events lying wholly outside the horizon are skipped; their dependents
+        treat them as done at their stored times. Tasks that cannot be placed are
+        reported in ``metadata["unscheduled"]``.
+        """
+
+        events, families, pomodoro = planner_inputs(events, families, pomodoro)
         tasks = self._sort_events(events, families)
-        cursor = start
-        scheduled: list[ScheduledChunk] = []
+        horizon = self._seconds(start, end)
+        anchors = {}
+        for task in tasks:
+            anchor = self._anchor(task.event, start)
+            if anchor is not None and anchor[1] > 0 and anchor[0] < horizon:
+                anchors[str(task.event.id)] = anchor
+        # Meetings crossing the horizon start or end keep the part inside it busy.
+        busy = [(max(low, 0), min(high, horizon)) for low, high in anchors.values()]
+        timeline = FreeTimeline(0, horizon, busy)
+        outside = self._outside(events, start, end)
+        pending = {str(event.id) for event in events} - outside.keys()
+
+        placed: dict[str, tuple[int, int]] = dict(outside)
+        placements: list[tuple[str, ChunkSpec, int, int]] = []
+        unscheduled: list[str] = []
         for task in tasks:
-            duration = timedelta(minutes=task.event.duration_min)
-            scheduled.append(
-                ScheduledChunk(
-                    event_id=str(task.event.id),
-                    chunk_id=str(uuid4()),
-                    start=cursor,
-                    end=cursor + duration,
-                    metadata={"solver": "heuristic"},
+            event_id = str(task.event.id)
+            if event_id in anchors:
+                anchor_start, anchor_end = anchors[event_id]
+                placed[event_id] = anchors[event_id]
+                placements.append((event_id, ChunkSpec(index=0, ordinal=0, duration=0), anchor_start, anchor_end))
+                continue
+            if event_id in outside:
+                continue
+            release = self._release(task.event, task.event.duration_min * 60, placed, pending)
+            bounds = self._bounds(task.event, start, horizon)
+            result = None
+            if release is not None and bounds:
+                specs = plan_chunks(
+                    task.event, pomodoro, settings.planner_max_chunks_per_event, settings.planner_default_min_chunk_min
                 )
+                result = self._place(timeline, task.event, specs, bounds, release)
+            if not result:
+                unscheduled.append(event_id)
+                continue
+            placed[event_id] = (result[0][1], result[-1][2])
+            placements.extend((event_id, spec, chunk_start, chunk_end) for spec, chunk_start, chunk_end in result)
+
+        placements.sort(key=lambda item: (item[2], item[1].index))
+        scheduled = [
+            ScheduledChunk(
+                event_id=event_id,
+                chunk_id=make_chunk_id(event_id, spec.index),
+                start=start + timedelta(seconds=chunk_start),
+                end=start + timedelta(seconds=chunk_end),
+                is_break=spec.is_break,
+                metadata={"solver": "heuristic"},
             )
-            cursor += duration
+            for event_id, spec, chunk_start, chunk_end in placements
+        ]
         return PlanSolution(
             horizon_start=start,
             horizon_end=end,
             scheduled=scheduled,
-            objective_value=float(len(scheduled)),
+            objective_value=float(len(placed) - len(outside)),
             solver="heuristic",
+            metadata={"unscheduled": unscheduled},
         )
 
-    def propose(self, events, families, pomodoro) -> ProposalResponse:
-        tasks = self._sort_events(events, families)
-        proposals = []
-        now = datetime.utcnow()
-        for task in tasks[:5]:
-            start = now + timedelta(minutes=len(proposals) * 60)
-            end = start + timedelta(minutes=task.event.duration_min)
-            proposals.append(
-                {
-                    "event_id": str(task.event.id),
-                    "suggested_start": start,
-                    "suggested_end": end,
-                    "score": task.priority,
-                    "reasoning": "High priority slot proposal",
-                }
-            )
-        return ProposalResponse.parse_obj({"proposals": proposals})
+    def propose(
+        self,
+        events,
+        families,
+        pomodoro,
+        now: datetime | None = None,
+        horizon: timedelta = timedelta(hours=72),
+        k: int = 3,
+        limit: int | None = None,
+    ) -> ProposalResponse:
+        """Top ``k`` free slots within ``horizon`` for each flexible event (see ``ProposalEngine``)."""
+        events, families, pomodoro = planner_inputs(events, families, pomodoro)
+        now = now or datetime.utcnow()
+        return ProposalEngine(self, k=k, horizon=horizon).propose(events, families, now, limit=limit)
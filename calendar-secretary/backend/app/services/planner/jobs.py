@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Callable
+from uuid import uuid4
+
+from app.core.config import settings
+from app.schemas.plan import PlanJobResponse, PlanSolution
+from app.services.planner.pool import SolverPool
+
+
+class PlanJob:
+    """State of one background solve, shared between the worker and pollers.
+
+    Incumbents get increasing sequence numbers so clients can poll with the
+    cursor returned by the previous response and only receive new solutions.
+    Only the most recent ``max_incumbents`` are retained.
+    """
+
+    def __init__(self, job_id: str, max_incumbents: int):
+        self.id = job_id
+        self.status = "queued"
+        self.created_at = time.monotonic()
+        self.finished_at: float | None = None
+        self.result: PlanSolution | None = None
+        self.error: str | None = None
+        self._max_incumbents = max(1, max_incumbents)
+        self._incumbents: list[PlanSolution] = []
+        self._first_seq = 0
+        self._lock = threading.Lock()
+
+    def run(self, fn: Callable[..., PlanSolution | None], *args: Any) -> PlanSolution | None:
+        with self._lock:
+            self.status = "running"
+        return fn(*args, on_solution=self.record_incumbent)
+
+    def record_incumbent(self, solution: PlanSolution) -> None:
+        with self._lock:
+            self._incumbents.append(solution)
+            overflow = len(self._incumbents) - self._max_incumbents
+            if overflow > 0:
+                del self._incumbents[:overflow]
+                self._first_seq += overflow
+
+    def finish(self, future: Future) -> None:
+        with self._lock:
+            self.finished_at = time.monotonic()
+            if future.cancelled():
+                self.status = "failed"
+                self.error = "Job cancelled"
+                return
+            exc = future.exception()
+            if exc is not None:
+                self.status = "failed"
+                self.error = str(exc) or exc.__class__.__name__
+            elif future.result() is None:
+                self.status = "failed"
+                self.error = "Unable to produce plan"
+            else:
+                self.status = "succeeded"
+                self.result = future.result()
+
+    def snapshot(self, since: int = 0) -> PlanJobResponse:
+        with self._lock:
+            offset = max(since - self._first_seq, 0)
+            return PlanJobResponse(
+                job_id=self.id,
+                status=self.status,
+                incumbents=list(self._incumbents[offset:]),
+                next_cursor=self._first_seq + len(self._incumbents),
+                result=self.result,
+                error=self.error,
+            )
+
+
+class PlanJobStore:
+    """In-memory registry of plan jobs for a single API process.
+
+    Finished jobs are dropped ``ttl_seconds`` after completion. With a thread
+    pool the job streams CP-SAT incumbents; a process pool cannot share the job
+    object, so only the final solution is reported.
+    """
+
+    def __init__(self, ttl_seconds: float = 900.0, max_incumbents: int = 20):
+        self.ttl_seconds = ttl_seconds
+        self.max_incumbents = max_incumbents
+        self._jobs: dict[str, PlanJob] = {}
+        self._lock = threading.Lock()
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, pool: SolverPool, fn: Callable[..., PlanSolution | None], *args: Any) -> PlanJob:
+        job = PlanJob(str(uuid4()), self.max_incumbents)
+        if pool.kind == "thread":
+            future = pool.submit(job.run, fn, *args)
+        else:
+            future = pool.submit(fn, *args)
+        with self._lock:
+            self._evict_expired()
+            self._jobs[job.id] = job
+        future.add_done_callback(job.finish)
+        return job
+
+    def get(self, job_id: str) -> PlanJob | None:
+        with self._lock:
+            self._evict_expired()
+            return self._jobs.get(job_id)
+
+
+@lru_cache()
+def get_job_store() -> PlanJobStore:
+    return PlanJobStore(
+        ttl_seconds=settings.planner_job_ttl_seconds,
+        max_incumbents=settings.planner_job_max_incumbents,
+    )
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable
+
+from app.core.config import settings
+
+
+class SolverPoolBusy(RuntimeError):
+    """Raised when the pool already holds as many solves as it admits."""
+
+
+class SolverPoolTimeout(RuntimeError):
+    """Raised when a solve does not finish before the request deadline."""
+
+
+class SolverPool:
+    """Bounded executor that keeps long planner runs off the event loop.
+
+    At most ``max_workers`` solves run at once and at most ``queue_limit`` more
+    wait for a free worker. Further submissions are rejected immediately so the
+    API can answer with backpressure instead of piling up work. A solve that
+    outlives its deadline keeps its slot until the worker actually finishes.
+
+    The ``process`` kind requires the submitted callable and its arguments to be
+    picklable.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 2, queue_limit: int = 8):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown solver pool kind: {kind}")
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.queue_limit = max(0, queue_limit)
+        self._executor: Executor | None = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.queue_limit
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="planner"
+                )
+        return self._executor
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise SolverPoolBusy("Planner queue is full")
+            self._pending += 1
+            executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError as exc:
+            future.cancel()
+            raise SolverPoolTimeout("Planner did not finish before the deadline") from exc
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+@lru_cache()
+def get_solver_pool() -> SolverPool:
+    return SolverPool(
+        kind=settings.planner_pool_kind,
+        max_workers=settings.planner_pool_workers,
+        queue_limit=settings.planner_queue_limit,
+    )
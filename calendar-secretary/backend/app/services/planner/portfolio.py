@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Callable
+
+from app.schemas.plan import PlanSolution
+from app.services.planner.cp_sat_solver import CPSATSolver
+from app.services.planner.heuristic_solver import HeuristicPlanner
+from app.services.planner.profiles import SolverProfile, resolve_profile
+from app.services.planner.replan import WarmStart, plan_hints
+from app.services.planner.snapshot import planner_inputs
+
+logger = logging.getLogger(__name__)
+
+# CP-SAT is skipped when less than this many seconds of the budget are left.
+MIN_CP_SAT_SECONDS = 0.05
+
+
+def solve_portfolio(
+    snapshot: Any,
+    start: datetime,
+    end: datetime,
+    on_solution: Callable[[PlanSolution], None] | None = None,
+    warm_start: WarmStart | None = None,
+    granularity_min: int | None = None,
+    profile: SolverProfile | None = None,
+) -> PlanSolution:
+    """Heuristic first, then CP-SAT seeded with its plan, under one time budget.
+
+    The greedy plan is ready within milliseconds; it is reported as the first
+    incumbent and the chunk starts of the tasks it placed become CP-SAT hints
+    (a ``warm_start`` from a replan keeps its own hints and frozen chunks).
+    Fixed events are not hinted: the heuristic keeps overlapping meetings
+    as given, which CP-SAT cannot, and one infeasible hint can stall a
+    single-worker search. CP-SAT gets what is left of
+    ``profile.max_time_in_seconds``. Its plan is returned whenever it finds
+    one, since the search starts from the hinted plan and only moves to better
+    objective values; otherwise the heuristic plan is returned, so a solve never
+    comes back empty. ``metadata.portfolio`` names the engine that produced the
+    plan and how the budget was spent. Dependency cycles raise
+    ``DependencyGraphError`` naming the cycle; the API checks for them first.
+    """
+    profile = profile or resolve_profile()
+    started = time.monotonic()
+    deadline = started + profile.max_time_in_seconds
+
+    heuristic = HeuristicPlanner().solve(snapshot, None, None, start, end)
+    heuristic_time = time.monotonic() - started
+    if on_solution is not None:
+        on_solution(heuristic)
+
+    events, _, _ = planner_inputs(snapshot, None, None)
+    fixed = {str(event.id) for event in events if getattr(event, "type", "flexible") == "fixed"}
+    hints = {key: value for key, value in plan_hints(heuristic).items() if key[0] not in fixed}
+    if warm_start is None:
+        warm_start = WarmStart(hints=hints)
+    else:
+        warm_start = replace(warm_start, hints={**hints, **warm_start.hints})
+
+    remaining = deadline - time.monotonic()
+    solution = None
+    cp_sat_status = "skipped"
+    if remaining >= MIN_CP_SAT_SECONDS:
+        solver = CPSATSolver(
+            granularity_min=granularity_min, profile=replace(profile, max_time_in_seconds=remaining)
+        )
+        try:
+            solution = solver.solve(snapshot, None, None, start, end, on_solution=on_solution, warm_start=warm_start)
+            cp_sat_status = solution.metadata_json["status"] if solution is not None else "NO_SOLUTION"
+        except Exception as exc:  # pragma: no cover - defensive, the heuristic plan is still returned
+            logger.exception("CP-SAT failed; returning the heuristic plan")
+            cp_sat_status = f"error: {exc}"
+
+    engine = "cp-sat" if solution is not None else "heuristic"
+    if solution is None:
+        solution = heuristic
+    solution.solver = engine
+    solution.metadata_json = {
+        **(solution.metadata_json or {}),
+        "portfolio": {
+            "engine": engine,
+            "heuristic_time": heuristic_time,
+            "heuristic_scheduled": len(heuristic.scheduled),
+            "hinted_chunks": len(hints),
+            "cp_sat_status": cp_sat_status,
+            "wall_time": time.monotonic() - started,
+        },
+    }
+    return solution
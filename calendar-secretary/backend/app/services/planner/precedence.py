@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable
+
+from app.services.planner.rules import TimeGrid, iter_dependencies, topological_sort
+
+
+@dataclass(frozen=True)
+class Precedence:
+    """``successor`` waits for ``predecessor``; ``lag`` is in grid slots.
+
+    FS: successor start >= predecessor end + lag
+    SS: successor start >= predecessor start + lag
+    FF: successor end >= predecessor end + lag
+    SF: successor end >= predecessor start + lag
+    """
+
+    successor: str
+    predecessor: str
+    type: str
+    lag: int
+
+
+@dataclass
+class EventSpan:
+    """Earliest/latest start of an event's first chunk and its shortest span, in slots."""
+
+    earliest: int
+    latest: int
+    min_span: int
+    rigid: bool
+
+
+def collect_precedences(events: Iterable, grid: TimeGrid) -> list[Precedence]:
+    """Dependencies of ``events`` with lags rounded up to whole grid slots."""
+    return [
+        Precedence(str(event.id), dep_id, dep_type, math.ceil(lag_min / grid.granularity_min))
+        for event in events
+        for dep_id, dep_type, lag_min in iter_dependencies(event)
+        if dep_id != str(event.id)
+    ]
+
+
+def start_offset(precedence: Precedence, predecessor: EventSpan, successor: EventSpan) -> int | None:
+    """Lower bound on ``successor.start - predecessor.start``.
+
+    FF and SF constrain the successor's end, which only bounds its start when
+    its span is fixed (a single, unsplit chunk).
+    """
+    if precedence.type == "SS":
+        return precedence.lag
+    if precedence.type == "FF":
+        return predecessor.min_span + precedence.lag - successor.min_span if successor.rigid else None
+    if precedence.type == "SF":
+        return precedence.lag - successor.min_span if successor.rigid else None
+    return predecessor.min_span + precedence.lag
+
+
+def critical_path_bounds(spans: dict[str, EventSpan], precedences: list[Precedence]) -> set[str]:
+    """Tighten ``spans`` along the dependency DAG and return events that cannot be scheduled.
+
+    A forward pass in topological order raises each successor's earliest start
+    to the earliest time its prerequisites allow. A successor can only be
+    scheduled together with all of its prerequisites, so an event whose
+    prerequisite is unknown or impossible, or whose earliest start passes its
+    latest start, is impossible too. Latest starts are not pulled backwards:
+    a prerequisite may still be scheduled on its own when its dependents are
+    left out.
+    """
+    incoming: dict[str, list[Precedence]] = defaultdict(list)
+    edges: dict[str, set[str]] = defaultdict(set)
+    for precedence in precedences:
+        if precedence.successor in spans:
+            incoming[precedence.successor].append(precedence)
+            if precedence.predecessor in spans:
+                edges[precedence.predecessor].add(precedence.successor)
+
+    impossible: set[str] = set()
+    for event_id in topological_sort(spans.keys(), edges):
+        span = spans[event_id]
+        for precedence in incoming.get(event_id, ()):
+            predecessor = spans.get(precedence.predecessor)
+            if predecessor is None or precedence.predecessor in impossible:
+                impossible.add(event_id)
+                break
+            offset = start_offset(precedence, predecessor, span)
+            if offset is not None:
+                span.earliest = max(span.earliest, predecessor.earliest + offset)
+        if span.earliest > span.latest:
+            impossible.add(event_id)
+    return impossible
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+from dataclasses import asdict, dataclass, replace
+from typing import Any
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class SolverProfile:
+    """Named bundle of CP-SAT search parameters.
+
+    ``num_workers`` of ``0`` means one search worker per CPU core.
+    ``probing_level`` trades presolve time for tighter models (0-2).
+    """
+
+    name: str
+    max_time_in_seconds: float
+    num_workers: int
+    relative_gap_limit: float
+    presolve: bool = True
+    probing_level: int = 2
+    random_seed: int = 0
+
+    @property
+    def effective_workers(self) -> int:
+        return self.num_workers or os.cpu_count() or 1
+
+    def apply(self, parameters: Any, num_workers: int | None = None) -> None:
+        parameters.max_time_in_seconds = self.max_time_in_seconds
+        parameters.num_workers = num_workers or self.effective_workers
+        parameters.relative_gap_limit = self.relative_gap_limit
+        parameters.cp_model_presolve = self.presolve
+        parameters.cp_model_probing_level = self.probing_level
+        parameters.random_seed = self.random_seed
+
+    def describe(self) -> dict[str, Any]:
+        description = asdict(self)
+        description["num_workers"] = self.effective_workers
+        return description
+
+
+PROFILES: dict[str, SolverProfile] = {
+    "interactive": SolverProfile(
+        name="interactive",
+        max_time_in_seconds=3.0,
+        num_workers=min(os.cpu_count() or 1, 8),
+        relative_gap_limit=0.02,
+        probing_level=0,
+    ),
+    "batch": SolverProfile(
+        name="batch",
+        max_time_in_seconds=10.0,
+        num_workers=0,
+        relative_gap_limit=0.005,
+        probing_level=1,
+    ),
+    "overnight": SolverProfile(
+        name="overnight",
+        max_time_in_seconds=300.0,
+        num_workers=0,
+        relative_gap_limit=0.0,
+        probing_level=2,
+    ),
+}
+
+
+def resolve_profile(name: str | None = None) -> SolverProfile:
+    """Return the requested profile with deployment-wide overrides applied."""
+    profile_name = name or settings.planner_profile_default
+    try:
+        profile = PROFILES[profile_name]
+    except KeyError as exc:
+        raise ValueError(f"Unknown solver profile: {profile_name}") from exc
+    overrides: dict[str, Any] = {"random_seed": settings.planner_random_seed}
+    if settings.planner_num_workers is not None:
+        overrides["num_workers"] = settings.planner_num_workers
+    return replace(profile, **overrides)
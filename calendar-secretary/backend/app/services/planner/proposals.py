@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from app.schemas.plan import Proposal, ProposalResponse
+from app.services.planner.timeline import FreeTimeline
+
+# Candidates scored per event for every proposal returned, so a snug slot a
+# little later can outrank the first free minute.
+SCAN_FACTOR = 4
+EARLINESS_WEIGHT = 0.25
+FIT_WEIGHT = 0.15
+
+
+@dataclass
+class Candidate:
+    event_id: str
+    start: int
+    end: int
+    score: float
+    reasoning: str
+
+
+class ProposalEngine:
+    """Top-k free slots per flexible event from one free/busy timeline.
+
+    Fixed events pinned to their window are reserved on a ``FreeTimeline``
+    covering ``[now, now + horizon)``. Each flexible event then walks the free
+    pieces inside its windows and deadline, after the earliest finish of its
+    prerequisites, and scores up to ``k * SCAN_FACTOR`` candidate starts:
+
+    ``priority * family weight * urgency * (1 - EARLINESS_WEIGHT - FIT_WEIGHT
+    + EARLINESS_WEIGHT * earliness + FIT_WEIGHT * fit)``
+
+    where urgency grows as the deadline slack of the earliest slot shrinks,
+    earliness falls linearly over the horizon and fit is the share of the free
+    piece the event fills. Proposals are alternatives, not a plan: slots are
+    not reserved, so two events may be offered the same gap.
+    """
+
+    def __init__(self, planner: Any, k: int = 3, horizon: timedelta = timedelta(hours=72)):
+        self.planner = planner
+        self.k = k
+        self.horizon = horizon
+
+    def _candidates(
+        self, timeline: FreeTimeline, event, duration: int, bounds, release: int
+    ) -> list[tuple[int, int, int]]:
+        """``(start, end, piece_length)`` starts in time order, spaced one duration apart."""
+        found: list[tuple[int, int, int]] = []
+        limit = self.k * SCAN_FACTOR
+        for low, high in bounds:
+            for piece_start, piece_end in timeline.iter_free(max(low, release), high, min_length=duration):
+                for start in range(piece_start, piece_end - duration + 1, duration):
+                    found.append((start, start + duration, piece_end - piece_start))
+                    if len(found) == limit:
+                        return found
+        return found
+
+    def _score(self, task, family, deadline: int | None, candidate, earliest_end: int, horizon: int) -> Candidate:
+        start, end, piece_length = candidate
+        weight = family.weight if family else 1.0
+        urgency = 1.0
+        reasons = [f"priority {task.event.priority} x family weight {weight:g}"]
+        if deadline is not None:
+            slack_days = max(deadline - earliest_end, 0) / 86400
+            urgency += 1 / (1 + slack_days)
+            reasons.append(f"{(deadline - end) / 3600:.1f}h before deadline")
+        earliness = 1 - start / horizon
+        fit = (end - start) / piece_length
+        reasons.append(f"fills {fit:.0%} of a {piece_length // 60}-min gap")
+        if getattr(task.event, "time_windows", None):
+            reasons.append("inside time window")
+        score = task.priority * urgency * (
+            1 - EARLINESS_WEIGHT - FIT_WEIGHT + EARLINESS_WEIGHT * earliness + FIT_WEIGHT * fit
+        )
+        return Candidate(str(task.event.id), start, end, round(score, 3), "; ".join(reasons))
+
+    def propose(self, events, families, now: datetime, limit: int | None = None) -> ProposalResponse:
+        planner = self.planner
+        tasks = planner._sort_events(events, families)
+        horizon = int(self.horizon.total_seconds())
+        anchors = {}
+        for task in tasks:
+            anchor = planner._anchor(task.event, now)
+            if anchor is not None and anchor[1] > 0 and anchor[0] < horizon:
+                anchors[str(task.event.id)] = anchor
+        timeline = FreeTimeline(0, horizon, anchors.values())
+
+        outside = planner._outside(events, now, now + self.horizon)
+        pending = {str(task.event.id) for task in tasks} - outside.keys()
+        earliest: dict[str, tuple[int, int]] = {**outside, **anchors}
+        ranked: list[tuple[float, list[Candidate]]] = []
+        for task in tasks:
+            event = task.event
+            if getattr(event, "type", "flexible") == "fixed":
+                continue
+            duration = event.duration_min * 60
+            release = planner._release(event, duration, earliest, pending)
+            bounds = planner._bounds(event, now, horizon)
+            if release is None or not bounds or duration <= 0:
+                continue
+            candidates = self._candidates(timeline, event, duration, bounds, max(release, 0))
+            if not candidates:
+                continue
+            earliest[str(event.id)] = candidates[0][:2]
+            deadline = getattr(event, "deadline", None)
+            deadline_at = planner._seconds(now, deadline) if deadline is not None else None
+            scored = [
+                self._score(task, families.get(event.family_key), deadline_at, candidate, candidates[0][1], horizon)
+                for candidate in candidates
+            ]
+            best = heapq.nlargest(self.k, scored, key=lambda item: (item.score, -item.start))
+            ranked.append((best[0].score, best))
+
+        ranked.sort(key=lambda item: -item[0])
+        if limit is not None:
+            ranked = ranked[:limit]
+        return ProposalResponse(
+            proposals=[
+                Proposal(
+                    event_id=candidate.event_id,
+                    suggested_start=now + timedelta(seconds=candidate.start),
+                    suggested_end=now + timedelta(seconds=candidate.end),
+                    score=candidate.score,
+                    reasoning=candidate.reasoning,
+                )
+                for _, best in ranked
+                for candidate in best
+            ]
+        )
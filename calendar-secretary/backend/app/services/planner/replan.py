@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable
+
+from app.schemas.plan import PlanSolution, ScheduledChunk
+from app.services.planner.rules import TimeUtils
+
+ChunkKey = tuple[str, int]
+
+
+@dataclass
+class WarmStart:
+    """Previous placements used to seed and restrict an incremental solve.
+
+    Chunks are keyed by ``(event_id, ordinal)`` where the ordinal is the position
+    of the work chunk within its event. Hinted chunks start the search at their
+    old position; frozen chunks keep it. ``not_before`` keeps re-optimised
+    chunks out of the past.
+    """
+
+    hints: dict[ChunkKey, datetime] = field(default_factory=dict)
+    frozen: set[ChunkKey] = field(default_factory=set)
+    not_before: datetime | None = None
+
+
+def _work_chunks_by_event(scheduled: Iterable[ScheduledChunk]) -> dict[str, list[ScheduledChunk]]:
+    grouped: dict[str, list[ScheduledChunk]] = defaultdict(list)
+    for chunk in scheduled:
+        if not chunk.is_break:
+            grouped[str(chunk.event_id)].append(chunk)
+    for chunks in grouped.values():
+        chunks.sort(key=lambda item: item.start)
+    return grouped
+
+
+def build_warm_start(
+    previous: PlanSolution,
+    changed_event_ids: Iterable[str],
+    now: datetime | None = None,
+    neighbourhood_minutes: int = 120,
+) -> WarmStart:
+    """Derive hints and frozen chunks from the previous plan.
+
+    A chunk is frozen when it already started before ``now`` or when it lies
+    entirely outside the neighbourhood around the previous placement of the
+    changed events. If none of the changed events were scheduled before, the
+    neighbourhood spans the whole horizon and only past chunks are frozen.
+    """
+
+    changed = {str(event_id) for event_id in changed_event_ids}
+    grouped = _work_chunks_by_event(previous.scheduled)
+
+    changed_chunks = [chunk for event_id in changed for chunk in grouped.get(event_id, [])]
+    window: tuple[int, int] | None = None
+    if changed_chunks:
+        window = (
+            min(TimeUtils.to_minutes(chunk.start) for chunk in changed_chunks) - neighbourhood_minutes,
+            max(TimeUtils.to_minutes(chunk.end) for chunk in changed_chunks) + neighbourhood_minutes,
+        )
+
+    not_before = TimeUtils.to_minutes(now) if now is not None else None
+    warm_start = WarmStart(not_before=now)
+    for event_id, chunks in grouped.items():
+        for ordinal, chunk in enumerate(chunks):
+            key = (event_id, ordinal)
+            chunk_start = TimeUtils.to_minutes(chunk.start)
+            chunk_end = TimeUtils.to_minutes(chunk.end)
+            warm_start.hints[key] = chunk.start
+            if not_before is not None and chunk_start < not_before:
+                warm_start.frozen.add(key)
+            elif event_id in changed:
+                continue
+            elif window is not None and (chunk_end <= window[0] or chunk_start >= window[1]):
+                warm_start.frozen.add(key)
+    return warm_start
+
+
+def plan_hints(plan: PlanSolution) -> dict[ChunkKey, datetime]:
+    """Start of every work chunk of ``plan``, keyed like ``WarmStart.hints``."""
+    return {
+        (event_id, ordinal): chunk.start
+        for event_id, chunks in _work_chunks_by_event(plan.scheduled).items()
+        for ordinal, chunk in enumerate(chunks)
+    }
@@ -1,37 +1,198 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Iterable, Optional
+import heapq
+import math
+from datetime import datetime, timedelta, timezone
+from itertools import count
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 
 class TimeUtils:
     @staticmethod
-    def to_minutes(dt: datetime) -> int:
-        return int(dt.timestamp() // 60)
+    def as_utc(value: datetime | str) -> datetime:
+        """Parse ISO strings and treat naive datetimes as UTC."""
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    @staticmethod
+    def to_minutes(dt: datetime | str) -> int:
+        return int(TimeUtils.as_utc(dt).timestamp() // 60)
 
     @staticmethod
     def from_minutes(value: int) -> datetime:
         return datetime.utcfromtimestamp(value * 60)
 
 
+class TimeGrid:
+    """Horizon-relative integer time axis for solver models.
+
+    Slot ``0`` is ``origin`` and every slot spans ``granularity_min`` minutes, so
+    domains stay proportional to the horizon length instead of the Unix epoch.
+    ``to_datetime`` maps slots back exactly, keeping the timezone of ``origin``.
+    """
+
+    __slots__ = ("origin", "granularity_min", "_origin_utc")
+
+    def __init__(self, origin: datetime, granularity_min: int = 1):
+        if granularity_min < 1:
+            raise ValueError("granularity_min must be positive")
+        self.origin = origin
+        self.granularity_min = granularity_min
+        self._origin_utc = TimeUtils.as_utc(origin)
+
+    def offset_minutes(self, value: datetime | str) -> float:
+        return (TimeUtils.as_utc(value) - self._origin_utc).total_seconds() / 60
+
+    def to_slot(self, value: datetime | str, round_up: bool = False) -> int:
+        slots = self.offset_minutes(value) / self.granularity_min
+        return math.ceil(slots - 1e-9) if round_up else math.floor(slots + 1e-9)
+
+    def to_datetime(self, slot: int) -> datetime:
+        return self.origin + timedelta(minutes=slot * self.granularity_min)
+
+    def duration_slots(self, minutes: int) -> int:
+        return max(0, math.ceil(minutes / self.granularity_min))
+
+    def normalise(self, value: datetime | str) -> datetime:
+        """Express ``value`` in the same timezone convention as ``origin``."""
+        return self.origin + (TimeUtils.as_utc(value) - self._origin_utc)
+
+
+def window_bounds(window) -> tuple[datetime, datetime]:
+    """Return ``(start, end)`` of a stored JSON window or a ``TimeWindow``."""
+    if isinstance(window, dict):
+        return TimeUtils.as_utc(window["start"]), TimeUtils.as_utc(window["end"])
+    return TimeUtils.as_utc(window.start), TimeUtils.as_utc(window.end)
+
+
+def outside_span(event, start: datetime | str, end: datetime | str) -> tuple[datetime, datetime] | None:
+    """Stored ``(start, end)`` of an event lying wholly outside ``[start, end)``.
+
+    An event whose time windows (cut off at its deadline) end by ``start`` is
+    history; one whose windows all begin at or after ``end`` is still to come.
+    Returns ``None`` when the event may fall inside the horizon.
+    """
+    windows = [window_bounds(window) for window in getattr(event, "time_windows", None) or []]
+    first = min((window_start for window_start, _ in windows), default=None)
+    last = max((window_end for _, window_end in windows), default=None)
+    deadline = getattr(event, "deadline", None)
+    if deadline is not None:
+        deadline = TimeUtils.as_utc(deadline)
+        last = deadline if last is None else min(last, deadline)
+        first = deadline if first is None else min(first, deadline)
+    if last is not None and last <= TimeUtils.as_utc(start):
+        return first, last
+    if windows and first >= TimeUtils.as_utc(end):
+        return first, last
+    return None
+
+
+def iter_dependencies(event) -> Iterator[tuple[str, str, int]]:
+    """Yield ``(depends_on_id, type, lag_min)`` for every prerequisite of ``event``.
+
+    Accepts API-style ``depends_on`` entries (dicts or objects with ``task_id``),
+    ``(id, type, lag)`` tuples from ``PlannerEvent`` rows, as well as ORM
+    ``TaskDependency`` rows from ``event.dependencies``.
+    """
+    for dependency in getattr(event, "depends_on", None) or []:
+        if isinstance(dependency, tuple):
+            dep_id, dep_type, lag = dependency
+        elif isinstance(dependency, dict):
+            dep_id = dependency.get("task_id") or dependency.get("depends_on_id")
+            dep_type = dependency.get("type") or "FS"
+            lag = dependency.get("lag_min") or 0
+        else:
+            dep_id = getattr(dependency, "task_id", None)
+            if dep_id is None:
+                dep_id = getattr(dependency, "depends_on_id", None)
+            dep_type = getattr(dependency, "type", None) or "FS"
+            lag = getattr(dependency, "lag_min", None) or 0
+        if dep_id is not None:
+            yield str(dep_id), dep_type, int(lag)
+    for dependency in getattr(event, "dependencies", None) or []:
+        dep_id = getattr(dependency, "depends_on_id", None)
+        if dep_id is not None:
+            yield str(dep_id), dependency.type or "FS", int(dependency.lag_min or 0)
+
+
+def make_chunk_id(event_id: str, index: int) -> str:
+    """Stable chunk identifier so identical inputs yield identical plans."""
+    return f"{event_id}:{index}"
+
+
 class DependencyGraphError(RuntimeError):
-    pass
+    """Raised when dependencies form a cycle; ``cycle`` lists its nodes in order."""
 
+    def __init__(self, message: str, cycle: Optional[list[str]] = None):
+        if cycle:
+            message = f"{message}: {' -> '.join([*cycle, cycle[0]])}"
+        super().__init__(message)
+        self.cycle = cycle or []
+
+
+def find_cycle(nodes: Iterable[str], edges: dict[str, set[str]]) -> list[str]:
+    """Return the nodes of one cycle reachable from ``nodes`` (empty if none)."""
+    state: dict[str, int] = {}
+    for root in nodes:
+        if root in state:
+            continue
+        path: list[str] = []
+        stack = [(root, iter(edges.get(root, ())))]
+        state[root] = 1
+        path.append(root)
+        while stack:
+            node, targets = stack[-1]
+            for target in targets:
+                if state.get(target) == 1:
+                    return path[path.index(target) :]
+                if target not in state:
+                    state[target] = 1
+                    path.append(target)
+                    stack.append((target, iter(edges.get(target, ()))))
+                    break
+            else:
+                state[node] = 2
+                path.pop()
+                stack.pop()
+    return []
+
+
+def topological_sort(
+    nodes: Iterable[str], edges: dict[str, set[str]], key: Optional[Callable[[str], Any]] = None
+) -> list[str]:
+    """Order ``nodes`` so every edge ``source -> target`` keeps source first.
+
+    Ready nodes wait in a heap ordered by ``key`` (ties and the default follow
+    the order in which nodes became ready), so the sort is ``O((V + E) log V)``.
+    Raises :class:`DependencyGraphError` naming the nodes of a cycle.
+    """
 
-def topological_sort(nodes: Iterable[str], edges: dict[str, set[str]]) -> list[str]:
     indegree = {node: 0 for node in nodes}
     for targets in edges.values():
         for target in targets:
             indegree[target] = indegree.get(target, 0) + 1
-    queue = [node for node, degree in indegree.items() if degree == 0]
+    counter = count()
+    ready: list[tuple[Any, int, str]] = []
+
+    def push(node: str) -> None:
+        sequence = next(counter)
+        heapq.heappush(ready, (key(node) if key else sequence, sequence, node))
+
+    for node, degree in indegree.items():
+        if degree == 0:
+            push(node)
     order: list[str] = []
-    while queue:
-        node = queue.pop(0)
+    while ready:
+        node = heapq.heappop(ready)[2]
         order.append(node)
-        for target in edges.get(node, set()):
+        for target in edges.get(node, ()):
             indegree[target] -= 1
             if indegree[target] == 0:
-                queue.append(target)
-    if len(order) != len(nodes):
-        raise DependencyGraphError("Dependency graph contains cycles")
+                push(target)
+    if len(order) != len(indegree):
+        blocked = [node for node, degree in indegree.items() if degree > 0]
+        raise DependencyGraphError("Dependency graph contains cycles", find_cycle(blocked, edges))
     return order
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from app.services.planner.cache import hash_payload, plan_content_hash
+from app.services.planner.rules import TimeUtils, iter_dependencies, window_bounds
+
+_EVENT_FIELDS = (
+    "id",
+    "title",
+    "type",
+    "duration_min",
+    "priority",
+    "deadline",
+    "time_windows",
+    "flex",
+    "location",
+    "travel_time_min",
+    "external_ids",
+    "constraints",
+    "metadata_json",
+    "family_key",
+    "pomodoro_opt_in",
+)
+
+
+class PlannerEvent:
+    """Planner view of one event, built from snapshot columns.
+
+    ``depends_on`` holds ``(depends_on_id, type, lag_min)`` tuples, which
+    ``iter_dependencies`` reads like the API's ``depends_on`` entries.
+    """
+
+    __slots__ = (*_EVENT_FIELDS, "depends_on")
+
+    def __init__(self, depends_on: tuple[tuple[str, str, int], ...] = (), **values: Any):
+        for name in _EVENT_FIELDS:
+            setattr(self, name, values.get(name))
+        self.depends_on = depends_on
+
+    def __repr__(self) -> str:
+        return f"PlannerEvent({self.id!s}, {self.title!r})"
+
+
+class PlannerFamily:
+    __slots__ = ("key", "name", "weight", "min_daily_minutes", "weekly_target_minutes", "max_daily_minutes")
+
+    def __init__(self, **values: Any):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def copy_of(cls, family: Any) -> PlannerFamily:
+        return cls(**{name: getattr(family, name, None) for name in cls.__slots__})
+
+
+class PlannerPomodoro:
+    __slots__ = ("enabled", "pomodoro_len_min", "short_break_min", "long_break_min", "long_break_every")
+
+    def __init__(self, **values: Any):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def copy_of(cls, pomodoro: Any) -> PlannerPomodoro:
+        return cls(**{name: getattr(pomodoro, name, None) for name in cls.__slots__})
+
+
+def _epoch(value: datetime | str | None) -> float:
+    return math.nan if value is None else TimeUtils.as_utc(value).timestamp()
+
+
+def _datetime(value: float) -> datetime | None:
+    return None if math.isnan(value) else datetime.fromtimestamp(value, timezone.utc)
+
+
+class PlannerSnapshot:
+    """Column-oriented copy of every solver input.
+
+    Numbers live in ``array`` columns; windows and dependencies are flattened
+    into CSR-style runs (``window_offsets[i]:window_offsets[i + 1]`` are the
+    windows of event ``i``). The snapshot holds no session state, pickles to a
+    few compact buffers for process pools, and ``content_hash`` identifies its
+    contents for result caching. ``events`` materialises ``PlannerEvent`` rows
+    on first use for the solvers, which read events attribute by attribute.
+
+    Attributes cannot be rebound once built, but the arrays, ``families`` and
+    ``events`` rows are ordinary mutable objects shared with cached results:
+    callers read them and never modify them in place.
+    """
+
+    __slots__ = (
+        "ids",
+        "titles",
+        "types",
+        "durations",
+        "priorities",
+        "deadlines",
+        "travel_times",
+        "pomodoro_opt_ins",
+        "family_keys",
+        "locations",
+        "details",
+        "window_offsets",
+        "window_starts",
+        "window_ends",
+        "dependency_offsets",
+        "dependency_ids",
+        "dependency_types",
+        "dependency_lags",
+        "families",
+        "pomodoro",
+        "content_hash",
+        "_events",
+        "_index",
+    )
+
+    def __init__(self, events: Iterable[Any], families: dict[str, Any] | None = None, pomodoro: Any = None):
+        ids, titles, types, family_keys, locations, details = [], [], [], [], [], []
+        durations, priorities, travel_times, pomodoro_opt_ins = array("l"), array("l"), array("l"), array("b")
+        deadlines, window_starts, window_ends = array("d"), array("d"), array("d")
+        window_offsets, dependency_offsets, dependency_lags = array("l", [0]), array("l", [0]), array("l")
+        dependency_ids, dependency_types = [], []
+        for event in events:
+            ids.append(str(event.id))
+            titles.append(getattr(event, "title", None))
+            types.append(event.type)
+            family_keys.append(getattr(event, "family_key", None))
+            locations.append(getattr(event, "location", None))
+            details.append(
+                (
+                    getattr(event, "flex", None),
+                    getattr(event, "constraints", None),
+                    getattr(event, "metadata_json", None),
+                    getattr(event, "external_ids", None),
+                )
+            )
+            durations.append(int(event.duration_min))
+            priorities.append(int(getattr(event, "priority", None) or 5))
+            travel_times.append(int(getattr(event, "travel_time_min", None) or 0))
+            pomodoro_opt_ins.append(1 if getattr(event, "pomodoro_opt_in", False) else 0)
+            deadlines.append(_epoch(getattr(event, "deadline", None)))
+            for window in getattr(event, "time_windows", None) or []:
+                window_start, window_end = window_bounds(window)
+                window_starts.append(window_start.timestamp())
+                window_ends.append(window_end.timestamp())
+            window_offsets.append(len(window_starts))
+            for dep_id, dep_type, lag in iter_dependencies(event):
+                dependency_ids.append(dep_id)
+                dependency_types.append(dep_type)
+                dependency_lags.append(lag)
+            dependency_offsets.append(len(dependency_ids))
+
+        self.ids = tuple(ids)
+        self.titles = tuple(titles)
+        self.types = tuple(types)
+        self.durations = durations
+        self.priorities = priorities
+        self.deadlines = deadlines
+        self.travel_times = travel_times
+        self.pomodoro_opt_ins = pomodoro_opt_ins
+        self.family_keys = tuple(family_keys)
+        self.locations = tuple(locations)
+        self.details = tuple(details)
+        self.window_offsets = window_offsets
+        self.window_starts = window_starts
+        self.window_ends = window_ends
+        self.dependency_offsets = dependency_offsets
+        self.dependency_ids = tuple(dependency_ids)
+        self.dependency_types = tuple(dependency_types)
+        self.dependency_lags = dependency_lags
+        self.families = {key: PlannerFamily.copy_of(family) for key, family in (families or {}).items()}
+        self.pomodoro = PlannerPomodoro.copy_of(pomodoro) if pomodoro is not None else None
+        self._events = None
+        self._index = None
+        self.content_hash = plan_content_hash(self.events, self.families, self.pomodoro)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getstate__(self) -> tuple:
+        # Row views and the id index are rebuilt on demand rather than pickled.
+        return tuple(getattr(self, name) for name in self.__slots__[:-2])
+
+    def __setstate__(self, state: tuple) -> None:
+        for name, value in zip(self.__slots__[:-2], state):
+            setattr(self, name, value)
+        self._events = None
+        self._index = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name[0] != "_" and hasattr(self, "content_hash"):
+            raise AttributeError("PlannerSnapshot attributes cannot be rebound")
+        super().__setattr__(name, value)
+
+    def index(self, event_id: Any) -> int:
+        if self._index is None:
+            self._index = {event_id: position for position, event_id in enumerate(self.ids)}
+        return self._index[str(event_id)]
+
+    def windows(self, position: int) -> list[tuple[datetime, datetime]]:
+        start, stop = self.window_offsets[position], self.window_offsets[position + 1]
+        return [
+            (_datetime(self.window_starts[i]), _datetime(self.window_ends[i])) for i in range(start, stop)
+        ]
+
+    def dependencies(self, position: int) -> tuple[tuple[str, str, int], ...]:
+        start, stop = self.dependency_offsets[position], self.dependency_offsets[position + 1]
+        return tuple(
+            (self.dependency_ids[i], self.dependency_types[i], self.dependency_lags[i]) for i in range(start, stop)
+        )
+
+    def dependents(self) -> dict[str, list[str]]:
+        """Map each prerequisite id to the ids of the events that wait for it."""
+        result: dict[str, list[str]] = {}
+        for position, event_id in enumerate(self.ids):
+            for i in range(self.dependency_offsets[position], self.dependency_offsets[position + 1]):
+                result.setdefault(self.dependency_ids[i], []).append(event_id)
+        return result
+
+    def _row(self, position: int) -> PlannerEvent:
+        flex, constraints, metadata, external_ids = self.details[position]
+        return PlannerEvent(
+            depends_on=self.dependencies(position),
+            id=self.ids[position],
+            title=self.titles[position],
+            type=self.types[position],
+            duration_min=self.durations[position],
+            priority=self.priorities[position],
+            deadline=_datetime(self.deadlines[position]),
+            time_windows=[{"start": start, "end": end} for start, end in self.windows(position)],
+            flex=flex,
+            location=self.locations[position],
+            travel_time_min=self.travel_times[position],
+            external_ids=external_ids,
+            constraints=constraints,
+            metadata_json=metadata,
+            family_key=self.family_keys[position],
+            pomodoro_opt_in=bool(self.pomodoro_opt_ins[position]),
+        )
+
+    @property
+    def events(self) -> list[PlannerEvent]:
+        if self._events is None:
+            self._events = [self._row(position) for position in range(len(self.ids))]
+        return self._events
+
+    def cache_key(self, *extra: Any) -> str:
+        """Content hash extended with request parameters such as the horizon."""
+        return hash_payload([self.content_hash, *extra])
+
+
+def planner_inputs(events: Any, families: Any, pomodoro: Any) -> tuple[list[Any], dict[str, Any], Any]:
+    """Normalise solver arguments; a ``PlannerSnapshot`` brings its own families and settings."""
+    if isinstance(events, PlannerSnapshot):
+        return events.events, events.families, events.pomodoro
+    return list(events), families or {}, pomodoro
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.schemas.plan import PlanDiagnosis, PlanSolution, SolveRequest
+from app.services.planner.cache import get_solve_cache
+from app.services.planner.context import load_planner_snapshot
+from app.services.planner.diagnostics import PlanDiagnostics
+from app.services.planner.pool import get_solver_pool
+from app.services.planner.portfolio import solve_portfolio
+from app.services.planner.profiles import resolve_profile
+from app.services.planner.replan import WarmStart
+from app.services.planner.rules import topological_sort
+from app.services.planner.snapshot import PlannerSnapshot
+
+
+class PlanInfeasible(ValueError):
+    """Raised when fixed events contradict each other before any solve runs."""
+
+    def __init__(self, diagnosis: PlanDiagnosis):
+        super().__init__("Plan is infeasible")
+        self.diagnosis = diagnosis
+
+
+async def load_detached_snapshot(db: AsyncSession) -> PlannerSnapshot:
+    snapshot = await db.run_sync(load_planner_snapshot)
+    # The snapshot is detached, so hand the connection back before the solve.
+    await db.close()
+    return snapshot
+
+
+def check_solvable(snapshot: PlannerSnapshot, start: datetime, end: datetime) -> None:
+    """Raise ``DependencyGraphError`` for cycles and ``PlanInfeasible`` for contradictions."""
+    graph = {
+        event_id: {dep_id for dep_id, _, _ in snapshot.dependencies(position) if dep_id != event_id}
+        for position, event_id in enumerate(snapshot.ids)
+    }
+    topological_sort(graph.keys(), graph)
+    if settings.planner_reject_infeasible:
+        diagnosis = PlanDiagnostics(start, end).diagnose(snapshot)
+        if not diagnosis.feasible:
+            raise PlanInfeasible(diagnosis)
+
+
+async def solve_cached(
+    db: AsyncSession, payload: SolveRequest, warm_start: WarmStart | None = None
+) -> PlanSolution:
+    """Solve the stored events on the solver pool, reusing cached plans.
+
+    Cold solves are cached by snapshot content and request parameters; warm
+    starts depend on a previous plan and always run. Besides the errors of
+    ``check_solvable`` this raises ``SolverPoolBusy`` and ``SolverPoolTimeout``.
+    """
+    snapshot = await load_detached_snapshot(db)
+    profile = resolve_profile(payload.profile)
+    cache_key = None
+    if warm_start is None:
+        cache_key = "solve:" + snapshot.cache_key(
+            payload.from_dt,
+            payload.to_dt,
+            payload.granularity_min,
+            profile.describe(),
+        )
+        cached = get_solve_cache().get(cache_key)
+        if cached is not None:
+            return cached.copy(deep=True)
+    check_solvable(snapshot, payload.from_dt, payload.to_dt)
+    solution = await get_solver_pool().run(
+        solve_portfolio,
+        snapshot,
+        payload.from_dt,
+        payload.to_dt,
+        warm_start=warm_start,
+        granularity_min=payload.granularity_min,
+        profile=profile,
+        timeout=max(settings.planner_request_timeout_seconds, profile.max_time_in_seconds * 1.5),
+    )
+    if cache_key is not None:
+        get_solve_cache().set(cache_key, solution.copy(deep=True))
+    return solution
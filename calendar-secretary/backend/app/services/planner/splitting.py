@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class ChunkSpec:
+    """One piece of an event before it is placed on the calendar.
+
+    ``index`` orders all pieces of the event, ``ordinal`` counts work pieces
+    only (breaks share the ordinal of the session they follow). Pieces with a
+    ``min_duration`` have a variable length between ``min_duration`` and
+    ``duration``; their lengths must add up to the event duration.
+    """
+
+    index: int
+    ordinal: int
+    duration: int
+    is_break: bool = False
+    min_duration: int | None = None
+
+
+def _option(options: Any, name: str) -> Any:
+    if options is None:
+        return None
+    if isinstance(options, dict):
+        return options.get(name)
+    return getattr(options, name, None)
+
+
+def uses_pomodoro(event: Any, pomodoro: Any) -> bool:
+    return bool(
+        pomodoro is not None
+        and getattr(pomodoro, "enabled", False)
+        and getattr(event, "pomodoro_opt_in", False)
+        and getattr(event, "type", "flexible") == "flexible"
+    )
+
+
+def pomodoro_chunks(duration: int, pomodoro: Any, max_chunks: int) -> list[ChunkSpec]:
+    """Alternate work sessions and breaks, long break every N sessions.
+
+    When the sessions and breaks would exceed ``max_chunks`` the session length
+    grows so the event still fits the cap instead of inflating the model.
+    """
+
+    session = max(1, pomodoro.pomodoro_len_min)
+    max_sessions = max(1, (max_chunks + 1) // 2)
+    if math.ceil(duration / session) > max_sessions:
+        session = math.ceil(duration / max_sessions)
+
+    specs: list[ChunkSpec] = []
+    remaining = duration
+    ordinal = 0
+    while remaining > 0:
+        length = min(session, remaining)
+        specs.append(ChunkSpec(index=len(specs), ordinal=ordinal, duration=length))
+        remaining -= length
+        ordinal += 1
+        if remaining > 0:
+            every = max(1, pomodoro.long_break_every)
+            pause = pomodoro.long_break_min if ordinal % every == 0 else pomodoro.short_break_min
+            if pause > 0:
+                specs.append(ChunkSpec(index=len(specs), ordinal=ordinal - 1, duration=pause, is_break=True))
+    return specs
+
+
+def split_chunks(duration: int, min_chunk: int, max_splits: int | None, max_chunks: int) -> list[ChunkSpec]:
+    """Optional variable-length pieces for ``can_split`` events."""
+    pieces = duration // max(1, min_chunk)
+    if max_splits is not None:
+        pieces = min(pieces, max_splits + 1)
+    pieces = min(pieces, max_chunks)
+    if pieces <= 1:
+        return [ChunkSpec(index=0, ordinal=0, duration=duration)]
+    return [
+        ChunkSpec(index=index, ordinal=index, duration=duration, min_duration=min_chunk)
+        for index in range(pieces)
+    ]
+
+
+def plan_chunks(event: Any, pomodoro: Any, max_chunks: int, default_min_chunk: int = 15) -> list[ChunkSpec]:
+    """Decide how an event is cut into chunks before scheduling.
+
+    Pomodoro opt-in takes precedence over ``flex.can_split`` because sessions
+    are already split; fixed events are never split.
+    """
+
+    duration = event.duration_min
+    if uses_pomodoro(event, pomodoro):
+        return pomodoro_chunks(duration, pomodoro, max_chunks)
+    flex = getattr(event, "flex", None)
+    if getattr(event, "type", "flexible") == "flexible" and _option(flex, "can_split"):
+        min_chunk = _option(flex, "min_chunk_min") or default_min_chunk
+        return split_chunks(duration, min_chunk, _option(flex, "max_splits"), max_chunks)
+    return [ChunkSpec(index=0, ordinal=0, duration=duration)]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Iterable, Iterator
+
+
+class FreeTimeline:
+    """Free time of a horizon with logarithmic earliest-fit queries.
+
+    The free time left after the initial busy intervals is stored as a sorted
+    list of base gaps. Each base gap keeps the free pieces that remain after
+    reservations, and a max segment tree over the base gaps stores the longest
+    piece per gap. Finding the first gap that can hold a duration is a tree
+    descent, so earliest-fit queries and reservations cost ``O(log n)`` plus the
+    few pieces inside the gap that is hit.
+
+    Times are plain integers (the heuristic uses seconds from horizon start).
+    """
+
+    def __init__(self, start: int, end: int, busy: Iterable[tuple[int, int]] = ()):
+        self.start = start
+        self.end = end
+        gaps: list[tuple[int, int]] = []
+        cursor = start
+        for busy_start, busy_end in sorted(busy):
+            if busy_end <= cursor:
+                continue
+            if busy_start > cursor:
+                gaps.append((cursor, min(busy_start, end)))
+            cursor = max(cursor, busy_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        gaps = [gap for gap in gaps if gap[1] > gap[0]]
+
+        self._bounds = [gap_start for gap_start, _ in gaps]
+        self._pieces: list[list[tuple[int, int]]] = [[gap] for gap in gaps]
+        self._size = 1
+        while self._size < max(len(gaps), 1):
+            self._size *= 2
+        self._tree = [0] * (2 * self._size)
+        for index, (gap_start, gap_end) in enumerate(gaps):
+            self._tree[self._size + index] = gap_end - gap_start
+        for node in range(self._size - 1, 0, -1):
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+
+    def _refresh(self, index: int) -> None:
+        node = self._size + index
+        self._tree[node] = max((piece_end - piece_start for piece_start, piece_end in self._pieces[index]), default=0)
+        node //= 2
+        while node:
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+            node //= 2
+
+    def _first_gap_with(self, duration: int, first: int) -> int | None:
+        """Index of the first base gap at or after ``first`` holding ``duration``."""
+        if first >= len(self._pieces):
+            return None
+
+        def descend(node: int, low: int, high: int) -> int | None:
+            if high < first or self._tree[node] < duration:
+                return None
+            if node >= self._size:
+                return node - self._size
+            middle = (low + high) // 2
+            found = descend(2 * node, low, middle)
+            if found is None:
+                found = descend(2 * node + 1, middle + 1, high)
+            return found
+
+        return descend(1, 0, self._size - 1)
+
+    def _gap_index(self, moment: int) -> int:
+        return max(bisect_right(self._bounds, moment) - 1, 0)
+
+    def earliest_fit(self, duration: int, not_before: int | None = None, not_after: int | None = None) -> int | None:
+        """Earliest start so ``[start, start + duration)`` is free and inside bounds."""
+        low = self.start if not_before is None else max(not_before, self.start)
+        high = self.end if not_after is None else min(not_after, self.end)
+        if duration <= 0 or low + duration > high or not self._pieces:
+            return None
+        index = self._gap_index(low)
+        for piece_start, piece_end in self._pieces[index]:
+            candidate = max(piece_start, low)
+            if candidate + duration <= min(piece_end, high):
+                return candidate
+        found = self._first_gap_with(duration, index + 1)
+        if found is None:
+            return None
+        for piece_start, piece_end in self._pieces[found]:
+            if piece_end - piece_start >= duration:
+                return piece_start if piece_start + duration <= high else None
+        return None
+
+    def best_fit(self, duration: int, not_before: int | None = None, not_after: int | None = None) -> int | None:
+        """Start of the tightest free piece that can hold ``duration``.
+
+        Only base gaps whose longest piece is large enough are visited.
+        """
+        best: tuple[int, int] | None = None
+        for piece_start, piece_end in self.iter_free(not_before, not_after, min_length=duration):
+            slack = piece_end - piece_start - duration
+            if best is None or slack < best[0]:
+                best = (slack, piece_start)
+                if slack == 0:
+                    break
+        return best[1] if best is not None else None
+
+    def iter_free(
+        self, not_before: int | None = None, not_after: int | None = None, min_length: int = 1
+    ) -> Iterator[tuple[int, int]]:
+        """Yield free pieces clipped to the bounds, in time order."""
+        low = self.start if not_before is None else max(not_before, self.start)
+        high = self.end if not_after is None else min(not_after, self.end)
+        if not self._pieces:
+            return
+        index = self._gap_index(low)
+        while index is not None and index < len(self._pieces):
+            if self._bounds[index] >= high:
+                return
+            for piece_start, piece_end in self._pieces[index]:
+                clipped = (max(piece_start, low), min(piece_end, high))
+                if clipped[1] - clipped[0] >= min_length:
+                    yield clipped
+            index = self._first_gap_with(min_length, index + 1)
+
+    def free_until(self, moment: int) -> int:
+        """End of the free piece containing ``moment`` (``moment`` if busy)."""
+        if not self._pieces:
+            return moment
+        for piece_start, piece_end in self._pieces[self._gap_index(moment)]:
+            if piece_start <= moment < piece_end:
+                return piece_end
+        return moment
+
+    def reserve(self, start: int, end: int) -> None:
+        """Mark ``[start, end)`` busy; it must lie inside a single free piece."""
+        index = self._gap_index(start)
+        pieces = self._pieces[index] if self._pieces else []
+        for position, (piece_start, piece_end) in enumerate(pieces):
+            if piece_start <= start and end <= piece_end:
+                remainder = [
+                    piece for piece in ((piece_start, start), (end, piece_end)) if piece[1] > piece[0]
+                ]
+                pieces[position : position + 1] = remainder
+                self._refresh(index)
+                return
+        raise ValueError(f"Interval [{start}, {end}) is not free")
+
+    def free(self, start: int, end: int) -> None:
+        """Undo a reservation of ``[start, end)`` made with :meth:`reserve`."""
+        index = self._gap_index(start)
+        pieces = self._pieces[index]
+        position = bisect_right(pieces, (start, end))
+        if position and pieces[position - 1][1] == start:
+            position -= 1
+            start = pieces[position][0]
+            del pieces[position]
+        if position < len(pieces) and pieces[position][0] == end:
+            end = pieces[position][1]
+            del pieces[position]
+        pieces.insert(position, (start, end))
+        self._refresh(index)
@@ -1,39 +1,277 @@
 from __future__ import annotations
 
-from typing import Any
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterator
+from urllib.parse import urljoin
+from uuid import UUID
+from xml.etree import ElementTree
 
+import httpx
 from cryptography.fernet import Fernet
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.event import Event
+from app.models.user import CalDAVAccount, User
+from app.services.planner.rules import TimeUtils
+from app.services.sync.ics_parser import ICSParser
+from app.services.sync.ics_service import ics_event_values
+from app.services.sync.ics_writer import calendar_footer, calendar_header, event_component
+
+DAV = "{DAV:}"
+CALDAV = "{urn:ietf:params:xml:ns:caldav}"
+
+SYNC_COLLECTION = """<?xml version="1.0" encoding="utf-8"?>
+<D:sync-collection xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">
+  <D:sync-token>{token}</D:sync-token>
+  <D:sync-level>1</D:sync-level>
+  <D:prop><D:getetag/><C:calendar-data/></D:prop>
+</D:sync-collection>"""
+
+PROPFIND_CTAG = """<?xml version="1.0" encoding="utf-8"?>
+<D:propfind xmlns:D="DAV:"><D:prop><D:resourcetype/><D:sync-token/></D:prop></D:propfind>"""
+
+
+class CalDAVError(RuntimeError):
+    pass
+
+
+@dataclass
+class SyncChange:
+    """One member of a sync-collection response; ``deleted`` members have no data."""
+
+    href: str
+    etag: str | None = None
+    calendar_data: str | None = None
+    deleted: bool = False
+
+
+@lru_cache()
+def get_http_client() -> httpx.Client:
+    """Process-wide HTTP client so CalDAV requests reuse pooled connections."""
+    return httpx.Client(
+        timeout=settings.caldav_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.caldav_max_connections,
+            max_keepalive_connections=settings.caldav_max_connections,
+        ),
+    )
+
+
+def parse_sync_response(body: bytes) -> tuple[list[SyncChange], str | None, bool]:
+    """Return ``(changes, new_sync_token, truncated)`` of a sync-collection report."""
+    root = ElementTree.fromstring(body)
+    changes: list[SyncChange] = []
+    truncated = False
+    for response in root.iter(f"{DAV}response"):
+        href = (response.findtext(f"{DAV}href") or "").strip()
+        status = response.findtext(f"{DAV}status") or ""
+        if " 507 " in f"{status} ":
+            truncated = True
+            continue
+        if " 404 " in f"{status} ":
+            changes.append(SyncChange(href=href, deleted=True))
+            continue
+        change = SyncChange(href=href)
+        for propstat in response.iter(f"{DAV}propstat"):
+            if " 200 " not in f"{propstat.findtext(f'{DAV}status') or ''} ":
+                continue
+            prop = propstat.find(f"{DAV}prop")
+            if prop is None:
+                continue
+            change.etag = prop.findtext(f"{DAV}getetag") or change.etag
+            change.calendar_data = prop.findtext(f"{CALDAV}calendar-data") or change.calendar_data
+        if not href.endswith("/"):
+            changes.append(change)
+    token = root.findtext(f"{DAV}sync-token")
+    return changes, token.strip() if token else None, truncated
 
 
 class CalDAVClient:
-    """Simplified CalDAV client wrapper.
+    """Delta-based CalDAV synchronisation for one user's calendar.
 
-    The real implementation would use the `caldav` library to communicate with
-    Apple's iCloud. We store encrypted credentials and provide placeholder pull/push
-    behaviours so the surrounding system can be tested without external access.
+    Pulls use the WebDAV ``sync-collection`` report, so after the first sync
+    only members changed since the stored sync token are transferred. Pushes
+    send events modified since the last push with ``If-Match`` (or
+    ``If-None-Match: *`` for new resources) so concurrent remote edits are not
+    overwritten. Per-event state (``caldav_href``, ``caldav_etag`` and the
+    ``updated_at`` the remote copy matches) lives in ``Event.external_ids``.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, user_id: UUID | None = None, http: httpx.Client | None = None):
         self.db = db
         if not settings.encryption_key:
             raise RuntimeError("encryption_key must be configured for CalDAV")
         self.cipher = Fernet(settings.encryption_key.encode("utf-8"))
-        self._encrypted_credentials: bytes | None = None
+        self.http = http or get_http_client()
+        self._user_id = user_id
+
+    @property
+    def user_id(self) -> UUID:
+        if self._user_id is None:
+            user_id = self.db.execute(select(User.id).limit(1)).scalar_one_or_none()
+            if user_id is None:
+                raise RuntimeError("User context required for CalDAV sync")
+            self._user_id = user_id
+        return self._user_id
+
+    def _account(self) -> CalDAVAccount:
+        account = self.db.get(CalDAVAccount, self.user_id)
+        if account is None:
+            raise CalDAVError("CalDAV account is not connected")
+        return account
+
+    def _auth(self, account: CalDAVAccount) -> tuple[str, str]:
+        return account.username, self.cipher.decrypt(account.encrypted_password).decode("utf-8")
+
+    def _request(self, account: CalDAVAccount, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        return self.http.request(method, url, auth=self._auth(account), **kwargs)
 
     def save_credentials(self, credentials: dict[str, str]) -> None:
-        blob = str(credentials).encode("utf-8")
-        self._encrypted_credentials = self.cipher.encrypt(blob)
+        try:
+            url, username, password = credentials["url"], credentials["username"], credentials["password"]
+        except KeyError as exc:
+            raise CalDAVError(f"Missing CalDAV credential: {exc.args[0]}") from exc
+        account = self.db.get(CalDAVAccount, self.user_id)
+        if account is None:
+            account = CalDAVAccount(user_id=self.user_id)
+            self.db.add(account)
+        if account.calendar_url != url.rstrip("/") + "/":
+            account.sync_token = None
+            account.pushed_at = None
+        account.calendar_url = url.rstrip("/") + "/"
+        account.username = username
+        account.encrypted_password = self.cipher.encrypt(password.encode("utf-8"))
+        self.db.commit()
+
+    def verify_connection(self) -> None:
+        account = self._account()
+        response = self._request(
+            account,
+            "PROPFIND",
+            account.calendar_url,
+            headers={"Depth": "0", "Content-Type": "application/xml; charset=utf-8"},
+            content=PROPFIND_CTAG,
+        )
+        if response.status_code != 207:
+            raise CalDAVError(f"CalDAV server answered {response.status_code}")
+
+    def _sync_collection(self, account: CalDAVAccount) -> Iterator[SyncChange]:
+        token = account.sync_token or ""
+        while True:
+            response = self._request(
+                account,
+                "REPORT",
+                account.calendar_url,
+                headers={"Depth": "1", "Content-Type": "application/xml; charset=utf-8"},
+                content=SYNC_COLLECTION.format(token=token),
+            )
+            if response.status_code in (403, 409) and token:
+                # The server forgot our token (valid-sync-token precondition): resync fully.
+                token = ""
+                continue
+            if response.status_code != 207:
+                raise CalDAVError(f"sync-collection failed with {response.status_code}")
+            changes, new_token, truncated = parse_sync_response(response.content)
+            yield from changes
+            token = new_token or token
+            account.sync_token = token
+            if not truncated:
+                return
+
+    def _synced_events(self) -> dict[str, Event]:
+        events = self.db.execute(
+            select(Event).where(Event.user_id == self.user_id, Event.external_ids.is_not(None))
+        ).scalars()
+        return {event.external_ids["caldav_href"]: event for event in events if "caldav_href" in event.external_ids}
 
-    def verify_connection(self) -> None:  # pragma: no cover - placeholder network call
-        if not self._encrypted_credentials:
-            raise RuntimeError("Credentials not provided")
+    @staticmethod
+    def _mark_synced(event: Event, href: str, etag: str | None) -> None:
+        synced_at = datetime.now(timezone.utc)
+        event.external_ids = {
+            **(event.external_ids or {}),
+            "caldav_href": href,
+            "caldav_etag": etag,
+            "caldav_synced_at": synced_at.isoformat(),
+        }
+        # Setting updated_at explicitly stops the sync write from looking like a local edit.
+        event.updated_at = synced_at
 
     def pull_events(self) -> int:
-        return self.db.query(Event).count()
+        """Apply remote changes since the last sync token; returns members changed."""
+        account = self._account()
+        known = self._synced_events()
+        changed = 0
+        for change in self._sync_collection(account):
+            href = urljoin(account.calendar_url, change.href)
+            event = known.get(href)
+            if change.deleted:
+                if event is not None:
+                    self.db.delete(event)
+                    changed += 1
+                continue
+            if change.calendar_data is None:
+                response = self._request(account, "GET", href)
+                if response.status_code != 200:
+                    continue
+                change.calendar_data = response.text
+                change.etag = response.headers.get("ETag", change.etag)
+            if event is not None and event.external_ids.get("caldav_etag") == change.etag:
+                continue
+            parser = ICSParser()
+            parsed = [*parser.feed(change.calendar_data.encode("utf-8")), *parser.close()]
+            if not parsed:
+                continue
+            values = ics_event_values(parsed[0], self.user_id, source="caldav")
+            if event is None:
+                event = Event(**values)
+                self.db.add(event)
+                known[href] = event
+            else:
+                for key, value in values.items():
+                    if key not in ("id", "user_id", "external_ids"):
+                        setattr(event, key, value)
+            event.external_ids = {**(event.external_ids or {}), **(values["external_ids"] or {})}
+            self._mark_synced(event, href, change.etag)
+            changed += 1
+        self.db.commit()
+        return changed
 
     def push_events(self) -> int:
-        return self.db.query(Event).count()
+        """PUT events edited locally since the last push; returns events sent."""
+        account = self._account()
+        started = datetime.now(timezone.utc)
+        statement = select(Event).where(Event.user_id == self.user_id)
+        if account.pushed_at is not None:
+            statement = statement.where(or_(Event.updated_at > account.pushed_at, Event.external_ids.is_(None)))
+        exported = 0
+        for event in self.db.execute(statement).scalars():
+            state = event.external_ids or {}
+            synced_at = state.get("caldav_synced_at")
+            if synced_at and TimeUtils.as_utc(synced_at) >= TimeUtils.as_utc(event.updated_at):
+                continue
+            component = event_component(event)
+            if component is None:
+                continue
+            href = state.get("caldav_href") or urljoin(account.calendar_url, f"{event.id}.ics")
+            headers = {"Content-Type": "text/calendar; charset=utf-8"}
+            if state.get("caldav_etag"):
+                headers["If-Match"] = state["caldav_etag"]
+            else:
+                headers["If-None-Match"] = "*"
+            response = self._request(
+                account, "PUT", href, headers=headers, content=calendar_header() + component + calendar_footer()
+            )
+            if response.status_code == 412:
+                # Changed remotely since our last pull; the next pull brings the server copy.
+                continue
+            if response.status_code not in (200, 201, 204):
+                raise CalDAVError(f"PUT {href} failed with {response.status_code}")
+            self._mark_synced(event, href, response.headers.get("ETag"))
+            exported += 1
+        account.pushed_at = started
+        self.db.commit()
+        return exported
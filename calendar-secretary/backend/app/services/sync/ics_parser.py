@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import codecs
+import re
+from dataclasses import dataclass, field
+import calendar
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, Iterator
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+_DURATION = re.compile(
+    r"^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_BYDAY = re.compile(r"^(?P<ordinal>[+-]?\d{1,2})?(?P<weekday>MO|TU|WE|TH|FR|SA|SU)$")
+_RRULE_PARTS = {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY", "WKST"}
+
+
+@dataclass
+class ICSEvent:
+    """One parsed ``VEVENT``; ``properties`` keeps raw values of other fields."""
+
+    uid: str | None = None
+    summary: str = ""
+    description: str | None = None
+    location: str | None = None
+    start: datetime | None = None
+    end: datetime | None = None
+    duration: timedelta | None = None
+    all_day: bool = False
+    tzid: str | None = None
+    rrule: str | None = None
+    properties: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def duration_min(self) -> int | None:
+        """Length in minutes; RFC 5545 implies one day for a DATE-only start and
+        zero for a DATE-TIME start that has neither DTEND nor DURATION.
+        """
+        if self.duration is not None:
+            return int(self.duration.total_seconds() // 60)
+        if self.start is not None and self.end is not None:
+            return int((self.end - self.start).total_seconds() // 60)
+        if self.start is None:
+            return None
+        return 24 * 60 if self.all_day else 0
+
+    def occurrences(self, until: datetime) -> Iterator[datetime]:
+        """Starts of the occurrences beginning before ``until``, ``start`` first.
+
+        ``RRULE`` is expanded in the zone of ``DTSTART`` (see ``expand_rrule``);
+        without one, or with an unsupported rule, only ``start`` is yielded.
+        """
+        if self.start is None:
+            return
+        if self.rrule is None:
+            yield self.start
+            return
+        yield from expand_rrule(self.rrule, self.start, until, _zone(self.tzid) if self.tzid else None)
+
+
+def _unescape(value: str) -> str:
+    return (
+        value.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+    )
+
+
+def parse_duration(value: str) -> timedelta:
+    match = _DURATION.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid ICS duration: {value}")
+    parts = {name: int(amount or 0) for name, amount in match.groupdict().items() if name != "sign"}
+    delta = timedelta(**parts)
+    return -delta if match.group("sign") == "-" else delta
+
+
+@lru_cache(maxsize=64)
+def _zone(tzid: str) -> ZoneInfo | None:
+    try:
+        return ZoneInfo(tzid)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def parse_datetime(value: str, params: dict[str, str]) -> tuple[datetime, bool]:
+    """Return ``(moment, is_date)``; floating times are read as UTC."""
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        day = date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+        return datetime.combine(day, time(), tzinfo=timezone.utc), True
+    if len(value) < 15 or value[8] != "T":
+        raise ValueError(f"Invalid ICS date-time: {value}")
+    moment = datetime(
+        int(value[:4]), int(value[4:6]), int(value[6:8]), int(value[9:11]), int(value[11:13]), int(value[13:15])
+    )
+    if value.endswith("Z"):
+        return moment.replace(tzinfo=timezone.utc), False
+    zone = _zone(params["TZID"]) if params.get("TZID") else None
+    if zone is not None:
+        return moment.replace(tzinfo=zone).astimezone(timezone.utc), False
+    return moment.replace(tzinfo=timezone.utc), False
+
+
+def _byday(value: str) -> list[tuple[int | None, int]] | None:
+    days = []
+    for item in value.split(","):
+        match = _BYDAY.match(item.strip().upper())
+        if match is None:
+            return None
+        ordinal = int(match.group("ordinal")) if match.group("ordinal") else None
+        days.append((ordinal, _WEEKDAYS[match.group("weekday")]))
+    return days
+
+
+def _month_days(year: int, month: int, byday: list[tuple[int | None, int]]) -> list[int]:
+    """Days of ``month`` matching ``byday``; ordinals count from either end."""
+    last = calendar.monthrange(year, month)[1]
+    days = set()
+    for ordinal, weekday in byday:
+        matches = [day for day in range(1, last + 1) if date(year, month, day).weekday() == weekday]
+        if ordinal is None:
+            days.update(matches)
+        elif 0 < abs(ordinal) <= len(matches):
+            days.add(matches[ordinal - 1] if ordinal > 0 else matches[ordinal])
+    return sorted(days)
+
+
+def _periods(freq: str, first: date, interval: int, byday, week_start: int) -> Iterator[tuple[date, list[date]]]:
+    """``(period start, candidate days)`` of every ``interval``-th period from the one holding ``first``."""
+    if freq == "DAILY":
+        weekdays = None if byday is None else {weekday for _, weekday in byday}
+        day = first
+        while True:
+            yield day, [day] if weekdays is None or day.weekday() in weekdays else []
+            day += timedelta(days=interval)
+    elif freq == "WEEKLY":
+        week = first - timedelta(days=(first.weekday() - week_start) % 7)
+        offsets = sorted({(weekday - week_start) % 7 for _, weekday in byday or [(None, first.weekday())]})
+        while True:
+            yield week, [week + timedelta(days=offset) for offset in offsets]
+            week += timedelta(weeks=interval)
+    elif freq == "MONTHLY":
+        year, month = first.year, first.month
+        while True:
+            if byday is not None:
+                days = [date(year, month, day) for day in _month_days(year, month, byday)]
+            elif first.day <= calendar.monthrange(year, month)[1]:
+                days = [date(year, month, first.day)]
+            else:
+                days = []  # RFC 5545 skips months without that day
+            yield date(year, month, 1), days
+            year, month = divmod(year * 12 + month - 1 + interval, 12)
+            month += 1
+    else:
+        year = first.year
+        while True:
+            leap_day = (first.month, first.day) == (2, 29)
+            yield date(year, 1, 1), [] if leap_day and not calendar.isleap(year) else [first.replace(year=year)]
+            year += interval
+
+
+def expand_rrule(rule: str, start: datetime, until: datetime, zone=None) -> Iterator[datetime]:
+    """Occurrence starts of ``rule`` that begin before ``until``, ``start`` first.
+
+    Supports ``FREQ`` (daily to yearly), ``INTERVAL``, ``COUNT``, ``UNTIL``,
+    ``WKST`` and ``BYDAY`` (with ordinals for monthly rules). Occurrences keep
+    the wall-clock time of ``start`` in ``zone``, so they follow DST changes.
+    Other rule parts are not expanded: only ``start`` is yielded for them.
+    """
+    parts = dict(part.partition("=")[::2] for part in rule.upper().split(";") if part)
+    freq = parts.get("FREQ")
+    byday = _byday(parts["BYDAY"]) if "BYDAY" in parts else None
+    yield start
+    if (
+        freq not in ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+        or not parts.keys() <= _RRULE_PARTS
+        or ("BYDAY" in parts and (byday is None or freq == "YEARLY"))
+        or (byday and freq != "MONTHLY" and any(ordinal is not None for ordinal, _ in byday))
+    ):
+        return
+    try:
+        interval = max(int(parts.get("INTERVAL", 1)), 1)
+        count = int(parts["COUNT"]) if "COUNT" in parts else None
+        last = parse_datetime(parts["UNTIL"], {})[0] if "UNTIL" in parts else None
+    except ValueError:
+        return
+    zone = zone or timezone.utc
+    local = start.astimezone(zone)
+    produced = 1
+    week_start = _WEEKDAYS.get(parts.get("WKST"), 0)
+    for period, days in _periods(freq, local.date(), interval, byday, week_start):
+        if datetime.combine(period, time(), tzinfo=zone) >= until:
+            return
+        for day in days:
+            moment = datetime.combine(day, local.time(), tzinfo=zone).astimezone(timezone.utc)
+            if moment <= start:
+                continue
+            if moment >= until or (last is not None and moment > last) or (count is not None and produced >= count):
+                return
+            produced += 1
+            yield moment
+
+
+def _split_property(line: str) -> tuple[str, dict[str, str], str]:
+    head, _, value = line.partition(":")
+    name, *raw_params = head.split(";")
+    params = {}
+    for raw in raw_params:
+        key, _, param_value = raw.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+class ICSParser:
+    """Incremental ``VEVENT`` parser.
+
+    Feed raw bytes as they arrive; complete events are yielded as soon as their
+    ``END:VEVENT`` line is read. Only the current partial line and the event
+    being parsed are held in memory, so arbitrarily large exports stream in
+    constant space. Folded lines (continuations starting with a space or tab)
+    are joined before parsing, and properties of nested components such as
+    ``VALARM`` are ignored.
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._partial = ""
+        self._logical: str | None = None
+        self._stack: list[str] = []
+        self._event: ICSEvent | None = None
+
+    def feed(self, chunk: bytes) -> Iterator[ICSEvent]:
+        text = self._partial + self._decoder.decode(chunk)
+        lines = text.split("\n")
+        self._partial = lines.pop()
+        yield from self._consume(lines)
+
+    def close(self) -> Iterator[ICSEvent]:
+        text = self._partial + self._decoder.decode(b"", final=True)
+        self._partial = ""
+        yield from self._consume(text.split("\n"))
+        if self._logical is not None:
+            logical, self._logical = self._logical, None
+            yield from self._handle(logical)
+
+    def _consume(self, lines: list[str]) -> Iterator[ICSEvent]:
+        for raw in lines:
+            raw = raw.rstrip("\r")
+            if raw[:1] in (" ", "\t") and self._logical is not None:
+                self._logical += raw[1:]
+                continue
+            if self._logical is not None:
+                yield from self._handle(self._logical)
+            self._logical = raw or None
+
+    def _handle(self, line: str) -> Iterator[ICSEvent]:
+        name, params, value = _split_property(line)
+        if name == "BEGIN":
+            self._stack.append(value.upper())
+            if self._stack == ["VCALENDAR", "VEVENT"] or self._stack == ["VEVENT"]:
+                self._event = ICSEvent()
+            return
+        if name == "END":
+            component = self._stack.pop() if self._stack else None
+            if component == "VEVENT" and self._event is not None and "VEVENT" not in self._stack:
+                event, self._event = self._event, None
+                yield event
+            return
+        if self._event is None or self._stack[-1:] != ["VEVENT"]:
+            return
+        self._apply(self._event, name, params, value)
+
+    @staticmethod
+    def _apply(event: ICSEvent, name: str, params: dict[str, str], value: str) -> None:
+        try:
+            if name == "UID":
+                event.uid = value
+            elif name == "SUMMARY":
+                event.summary = _unescape(value)
+            elif name == "DESCRIPTION":
+                event.description = _unescape(value)
+            elif name == "LOCATION":
+                event.location = _unescape(value)
+            elif name == "DTSTART":
+                event.start, event.all_day = parse_datetime(value, params)
+                event.tzid = params.get("TZID")
+            elif name == "DTEND":
+                event.end, _ = parse_datetime(value, params)
+            elif name == "DURATION":
+                event.duration = parse_duration(value)
+            elif name == "RRULE":
+                event.rrule = value
+            else:
+                event.properties.setdefault(name, value)
+        except ValueError:
+            event.properties.setdefault(name, value)
@@ -1,41 +1,200 @@
 from __future__ import annotations
 
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, AsyncIterable, Iterable, Iterator
+from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from app.models.event import Event
+from app.core.config import settings
+from app.models.event import Event, window_columns
 from app.models.user import User
+from app.schemas.plan import PlanSolution
+from app.services.planner.rules import TimeUtils
+from app.services.sync.ics_parser import ICSEvent, ICSParser
+from app.services.sync.ics_writer import calendar_footer, calendar_header, chunk_component, event_component
+
+
+def ics_event_values(parsed: ICSEvent, user_id: UUID, source: str = "ics") -> dict[str, Any]:
+    """Column values for a new ``Event`` created from a parsed VEVENT.
+
+    For a recurring event these describe its first occurrence; the ``RRULE``
+    is kept in the metadata and written back on export.
+    """
+    duration = parsed.duration_min
+    time_windows = None
+    if parsed.start is not None and duration is not None and duration >= 0:
+        end = parsed.end or parsed.start + timedelta(minutes=duration)
+        time_windows = [{"start": parsed.start.isoformat(), "end": end.isoformat()}]
+    metadata: dict[str, Any] = {"source": source}
+    if parsed.rrule:
+        metadata["rrule"] = parsed.rrule
+    if parsed.description:
+        metadata["notes"] = parsed.description
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "title": parsed.summary or "Untitled",
+        "type": "fixed",
+        "duration_min": duration if time_windows else 60,
+        "priority": 5,
+        "time_windows": time_windows,
+        **window_columns(time_windows),
+        "location": parsed.location,
+        "travel_time_min": 0,
+        "external_ids": {"ics_uid": parsed.uid} if parsed.uid else None,
+        "metadata_json": metadata,
+        "pomodoro_opt_in": False,
+    }
+
+
+def ics_event_rows(
+    parsed: ICSEvent, user_id: UUID, window_start: datetime, window_end: datetime, source: str = "ics"
+) -> list[dict[str, Any]]:
+    """Rows for a parsed VEVENT and the later occurrences of its ``RRULE``.
+
+    Each occurrence overlapping ``[window_start, window_end)`` becomes a fixed
+    row of its own, so the planner keeps every instance of a recurring meeting.
+
+    Occurrence rows carry a ``recurrence_id`` and are left out of exports,
+    where the rule of the first row already describes them.
+    """
+    values = ics_event_values(parsed, user_id, source)
+    rows = [values]
+    if not parsed.rrule or not values["time_windows"]:
+        return rows
+    length = parsed.end - parsed.start if parsed.end else timedelta(minutes=values["duration_min"])
+    metadata = {key: value for key, value in values["metadata_json"].items() if key != "rrule"}
+    for occurrence in islice(parsed.occurrences(window_end), 1, None):
+        if occurrence + length <= window_start:
+            continue
+        recurrence_id = occurrence.isoformat()
+        time_windows = [{"start": recurrence_id, "end": (occurrence + length).isoformat()}]
+        rows.append(
+            {
+                **values,
+                "id": uuid.uuid4(),
+                "time_windows": time_windows,
+                **window_columns(time_windows),
+                "external_ids": {**(values["external_ids"] or {}), "recurrence_id": recurrence_id},
+                "metadata_json": {**metadata, "recurrence_id": recurrence_id},
+            }
+        )
+    return rows
 
 
 class ICSService:
     """Handle import/export of ICS files.
 
-    For brevity this version performs a naive parse that treats each line starting
-    with `SUMMARY:` as a new event. A production-ready implementation would use the
-    `ics` or `icalendar` libraries and handle two-way synchronisation.
+    Imports stream through :class:`ICSParser`, so uploads are never held in
+    memory as a whole. Parsed events are written with multi-row ``INSERT``
+    statements and committed every ``ics_import_batch_size`` events. Recurring
+    events are expanded up to ``ics_recurrence_window_days`` ahead. Exports
+    are generated component by component from a server-side cursor.
+    ``import_stream`` also accepts an ``AsyncSession`` and then writes each
+    batch through ``run_sync``.
     """
 
-    def __init__(self, db: Session):
+    def __init__(
+        self, db: Session | AsyncSession, batch_size: int | None = None, now: datetime | None = None
+    ):
         self.db = db
+        self.batch_size = batch_size or settings.ics_import_batch_size
+        self.window_start = now or datetime.now(timezone.utc)
+        self.window_end = self.window_start + timedelta(days=settings.ics_recurrence_window_days)
+        self._user_id: UUID | None = None
 
-    def import_ics(self, data: bytes) -> int:
-        text = data.decode("utf-8", errors="ignore")
+    def _resolve_user(self, db: Session) -> UUID:
+        if self._user_id is None:
+            user_id = db.execute(select(User.id).limit(1)).scalar_one_or_none()
+            if user_id is None:
+                raise RuntimeError("User context required for ICS import")
+            self._user_id = user_id
+        return self._user_id
+
+    def _flush(self, batch: list[ICSEvent], db: Session | None = None) -> int:
+        if not batch:
+            return 0
+        db = db or self.db
+        user_id = self._resolve_user(db)
+        rows = [
+            row
+            for parsed in batch
+            for row in ics_event_rows(parsed, user_id, self.window_start, self.window_end)
+        ]
+        db.execute(insert(Event), rows)
+        db.commit()
+        return len(rows)
+
+    async def _flush_async(self, batch: list[ICSEvent]) -> int:
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(lambda session: self._flush(batch, session))
+        return self._flush(batch)
+
+    def import_ics(self, data: bytes | Iterable[bytes]) -> int:
+        """Import an ICS payload given as bytes or as an iterable of byte chunks."""
+        parser = ICSParser()
+        chunks = [data] if isinstance(data, (bytes, bytearray)) else data
+        batch: list[ICSEvent] = []
+        created = 0
+        for chunk in chunks:
+            for parsed in parser.feed(chunk):
+                batch.append(parsed)
+                if len(batch) >= self.batch_size:
+                    created += self._flush(batch)
+                    batch = []
+        batch.extend(parser.close())
+        return created + self._flush(batch)
+
+    async def import_stream(self, stream: AsyncIterable[bytes]) -> int:
+        """Import an ICS upload while it is still being received."""
+        parser = ICSParser()
+        batch: list[ICSEvent] = []
         created = 0
-        for line in text.splitlines():
-            if line.startswith("SUMMARY:"):
-                title = line.split(":", 1)[1]
-                user = self.db.query(User).first()
-                if user is None:
-                    raise RuntimeError("User context required for ICS import")
-                event = Event(
-                    title=title,
-                    type="fixed",
-                    duration_min=60,
-                    priority=5,
-                    user_id=user.id,
-                )
-                self.db.add(event)
-                created += 1
-        self.db.commit()
-        return created
+        async for chunk in stream:
+            for parsed in parser.feed(chunk):
+                batch.append(parsed)
+                if len(batch) >= self.batch_size:
+                    created += await self._flush_async(batch)
+                    batch = []
+        batch.extend(parser.close())
+        return created + await self._flush_async(batch)
+
+    def export_version(self) -> tuple[int, datetime | None]:
+        """Event count and newest ``updated_at``: a cheap validator for exports."""
+        count, last_modified = self.db.execute(select(func.count(Event.id), func.max(Event.updated_at))).one()
+        return count, TimeUtils.as_utc(last_modified) if last_modified is not None else None
+
+    def export_events(self) -> Iterator[str]:
+        """Yield a VCALENDAR of all events that have a place in time."""
+        yield calendar_header()
+        statement = (
+            select(Event)
+            .options(selectinload(Event.dependencies))
+            .order_by(Event.id)
+            .execution_options(yield_per=settings.ics_export_batch_size)
+        )
+        for event in self.db.execute(statement).scalars():
+            component = event_component(event)
+            if component:
+                yield component
+        yield calendar_footer()
+
+    def export_plan(self, solution: PlanSolution) -> Iterator[str]:
+        """Yield a VCALENDAR with one VEVENT per scheduled chunk of ``solution``."""
+        yield calendar_header()
+        event_ids = {chunk.event_id for chunk in solution.scheduled}
+        titles: dict[UUID, str] = {}
+        for event_id, title in self.db.execute(
+            select(Event.id, Event.title)
+            .where(Event.id.in_(event_ids))
+            .execution_options(yield_per=settings.ics_export_batch_size)
+        ):
+            titles[event_id] = title
+        for chunk in solution.scheduled:
+            yield chunk_component(chunk, titles.get(chunk.event_id, "Planned task"))
+        yield calendar_footer()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from app.services.planner.rules import TimeUtils, iter_dependencies, window_bounds
+
+PRODID = "-//Calendar Secretary//Planner//EN"
+
+
+def escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def fold(line: str) -> str:
+    """Fold a content line at 75 octets as RFC 5545 requires, CRLF-terminated."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts: list[str] = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_datetime(value: datetime | str) -> str:
+    return TimeUtils.as_utc(value).strftime("%Y%m%dT%H%M%SZ")
+
+
+def calendar_header(name: str = "Calendar Secretary") -> str:
+    return "".join(
+        fold(line)
+        for line in ("BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN", f"X-WR-CALNAME:{name}")
+    )
+
+
+def calendar_footer() -> str:
+    return fold("END:VCALENDAR")
+
+
+def hashtags(event: Any) -> str:
+    """Family and dependencies as ``#family:`` / ``#dep:`` tags for the description."""
+    tags = []
+    if getattr(event, "family_key", None):
+        tags.append(f"#family:{event.family_key}")
+    tags.extend(f"#dep:{dep_type}({dep_id},{lag})" for dep_id, dep_type, lag in iter_dependencies(event))
+    return " ".join(tags)
+
+
+def vevent(
+    uid: str,
+    summary: str,
+    start: datetime | str,
+    end: datetime | str,
+    stamp: datetime | None = None,
+    description: str | None = None,
+    location: str | None = None,
+    extra: Iterable[str] = (),
+) -> str:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_datetime(stamp or datetime.now(timezone.utc))}",
+        f"DTSTART:{format_datetime(start)}",
+        f"DTEND:{format_datetime(end)}",
+        f"SUMMARY:{escape(summary)}",
+    ]
+    if description:
+        lines.append(f"DESCRIPTION:{escape(description)}")
+    if location:
+        lines.append(f"LOCATION:{escape(location)}")
+    lines.extend(extra)
+    lines.append("END:VEVENT")
+    return "".join(fold(line) for line in lines)
+
+
+def event_component(event: Any) -> str | None:
+    """VEVENT for an event that has a place in time (its first time window).
+
+    Imported occurrences of a recurring event are skipped: the ``RRULE`` on
+    the first one covers them.
+    """
+    metadata = event.metadata_json or {}
+    if not event.time_windows or metadata.get("recurrence_id"):
+        return None
+    start, end = window_bounds(event.time_windows[0])
+    if event.type != "fixed":
+        end = min(end, start + timedelta(minutes=event.duration_min))
+    extra = [f"RRULE:{metadata['rrule']}"] if metadata.get("rrule") else []
+    return vevent(
+        uid=(event.external_ids or {}).get("ics_uid") or f"{event.id}@calendar-secretary",
+        summary=event.title,
+        start=start,
+        end=end,
+        stamp=getattr(event, "updated_at", None),
+        description=" ".join(filter(None, [metadata.get("notes"), hashtags(event)])) or None,
+        location=event.location,
+        extra=extra,
+    )
+
+
+def chunk_component(chunk: Any, title: str, stamp: datetime | None = None) -> str:
+    """VEVENT for one scheduled chunk of a plan."""
+    return vevent(
+        uid=f"{chunk.chunk_id}@calendar-secretary",
+        summary="Break" if chunk.is_break else title,
+        start=chunk.start,
+        end=chunk.end,
+        stamp=stamp,
+        extra=[f"X-CALENDAR-SECRETARY-EVENT:{chunk.event_id}"],
+    )
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Iterable
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core import db as db_module
+from app.core.config import settings
+from app.models.user import CalDAVAccount
+from app.services.sync.caldav_client import CalDAVClient
+
+logger = logging.getLogger(__name__)
+
+SYNC_KINDS = ("pull", "push")
+
+
+def sync_caldav_account(user_id: UUID, kinds: set[str]) -> dict[str, int]:
+    """Run one CalDAV sync pass in its own session (called from a worker thread)."""
+    with db_module.SessionLocal() as session:
+        client = CalDAVClient(session, user_id=user_id)
+        result = {}
+        # Pull first so pushes see the latest remote ETags.
+        for kind in SYNC_KINDS:
+            if kind in kinds:
+                result[kind] = client.pull_events() if kind == "pull" else client.push_events()
+        return result
+
+
+def caldav_account_ids() -> list[UUID]:
+    with db_module.SessionLocal() as session:
+        return list(session.execute(select(CalDAVAccount.user_id)).scalars())
+
+
+@dataclass
+class SyncState:
+    """Scheduling state of one account; ``pending`` collects coalesced triggers."""
+
+    pending: set[str] = field(default_factory=set)
+    task: asyncio.Task | None = None
+    running: bool = False
+    failures: int = 0
+    next_due: float = 0.0
+    last_result: dict[str, int] | None = None
+    last_error: str | None = None
+    last_finished_at: float | None = None
+
+
+class SyncScheduler:
+    """Periodic per-account CalDAV sync on the API event loop.
+
+    Each account is synced every ``interval`` seconds (± ``jitter``, and the
+    first run is spread uniformly over one interval) so load is even rather
+    than bursty. At most ``max_concurrency`` syncs run at once, each in a worker
+    thread. Triggers for an account that is already queued or running are
+    merged into a single follow-up pass. Failed accounts back off
+    exponentially up to ``max_backoff`` seconds.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        jitter: float = 0.0,
+        max_concurrency: int = 4,
+        max_backoff: float = 3600.0,
+        sync_fn: Callable[[Any, set[str]], dict[str, int]] = sync_caldav_account,
+        accounts_fn: Callable[[], Iterable[Any]] = caldav_account_ids,
+        tick: float | None = None,
+    ):
+        self.interval = interval
+        self.jitter = jitter
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_backoff = max_backoff
+        self.sync_fn = sync_fn
+        self.accounts_fn = accounts_fn
+        self.tick = tick if tick is not None else min(max(interval / 10, 1.0), 30.0)
+        self.states: dict[Any, SyncState] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop_task: asyncio.Task | None = None
+        self._random = random.Random()
+
+    def _state(self, account_id: Any) -> SyncState:
+        state = self.states.get(account_id)
+        if state is None:
+            first_run = time.monotonic() + self._random.uniform(0, self.interval)
+            state = self.states[account_id] = SyncState(next_due=first_run)
+        return state
+
+    def _delay(self, failures: int) -> float:
+        if failures:
+            base = min(self.max_backoff, self.interval * 2 ** (failures - 1))
+        else:
+            base = self.interval
+        return max(0.0, base + self._random.uniform(-self.jitter, self.jitter))
+
+    def trigger(self, account_id: Any, kinds: Iterable[str] = SYNC_KINDS) -> bool:
+        """Queue a sync; returns ``False`` when it was merged into a queued or running one."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        state = self._state(account_id)
+        state.pending.update(kinds)
+        if state.task is not None and not state.task.done():
+            return False
+        state.task = asyncio.get_running_loop().create_task(self._run(account_id, state))
+        return True
+
+    async def _run(self, account_id: Any, state: SyncState) -> None:
+        while state.pending:
+            async with self._semaphore:
+                kinds, state.pending = state.pending, set()
+                state.running = True
+                try:
+                    state.last_result = await asyncio.to_thread(self.sync_fn, account_id, kinds)
+                    state.failures = 0
+                    state.last_error = None
+                except Exception as exc:  # noqa: BLE001 - one account must not stop the scheduler
+                    state.failures += 1
+                    state.last_error = str(exc)
+                    logger.warning("CalDAV sync for %s failed (%s in a row): %s", account_id, state.failures, exc)
+                finally:
+                    state.running = False
+                    state.last_finished_at = time.time()
+                    state.next_due = time.monotonic() + self._delay(state.failures)
+            if state.failures:
+                # Retries wait for the backoff deadline instead of hammering the server.
+                state.pending.clear()
+
+    async def _periodic(self) -> None:
+        while True:
+            try:
+                account_ids = await asyncio.to_thread(lambda: list(self.accounts_fn()))
+            except Exception as exc:  # noqa: BLE001 - keep polling after transient DB errors
+                logger.warning("Listing CalDAV accounts failed: %s", exc)
+                account_ids = []
+            now = time.monotonic()
+            for account_id in account_ids:
+                if self._state(account_id).next_due <= now:
+                    self.trigger(account_id)
+            await asyncio.sleep(self.tick)
+
+    def start(self) -> None:
+        if self._loop_task is None or self._loop_task.done():
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop_task = asyncio.get_running_loop().create_task(self._periodic())
+
+    async def stop(self) -> None:
+        tasks = [state.task for state in self.states.values() if state.task is not None]
+        if self._loop_task is not None:
+            tasks.append(self._loop_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._semaphore = None
+        self.states.clear()
+
+    def status(self, account_id: Any) -> dict[str, Any]:
+        state = self.states.get(account_id)
+        if state is None:
+            return {"queued": False, "running": False, "failures": 0}
+        return {
+            "queued": bool(state.pending),
+            "running": state.running,
+            "failures": state.failures,
+            "last_result": state.last_result,
+            "last_error": state.last_error,
+            "last_finished_at": state.last_finished_at,
+            "next_run_in_seconds": max(0.0, state.next_due - time.monotonic()),
+        }
+
+
+@lru_cache()
+def get_sync_scheduler() -> SyncScheduler:
+    return SyncScheduler(
+        interval=settings.caldav_sync_interval_seconds,
+        jitter=settings.caldav_sync_jitter_seconds,
+        max_concurrency=settings.caldav_sync_concurrency,
+        max_backoff=settings.caldav_sync_max_backoff_seconds,
+    )
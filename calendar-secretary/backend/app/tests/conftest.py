@@ -0,0 +1,57 @@
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core import db as db_module
+from app.core.db import Base, async_database_url
+from app.main import app
+from app.models.user import User
+from app.services.planner.cache import get_solve_cache
+
+USER_EMAIL = "user@example.com"
+
+
+@pytest.fixture()
+def session_factory(tmp_path, monkeypatch):
+    """File-backed SQLite database with one user, installed as the app's database.
+
+    The engines and session factories of ``app.core.db`` are patched through
+    ``monkeypatch``, so they are restored when the test ends.
+    """
+    database_url = f"sqlite+pysqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine(database_url, connect_args={"check_same_thread": False}, future=True)
+    async_engine = create_async_engine(async_database_url(database_url), poolclass=NullPool)
+    factory = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
+    monkeypatch.setattr(db_module, "engine", engine)
+    monkeypatch.setattr(db_module, "SessionLocal", factory)
+    monkeypatch.setattr(db_module, "async_engine", async_engine)
+    monkeypatch.setattr(
+        db_module,
+        "AsyncSessionLocal",
+        async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession),
+    )
+    Base.metadata.create_all(bind=engine)
+    with factory() as session:
+        session.add(User(id=uuid4(), email=USER_EMAIL, hashed_password="secret"))
+        session.commit()
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture()
+def user_id(session_factory):
+    with session_factory() as session:
+        return session.execute(select(User.id).where(User.email == USER_EMAIL)).scalar_one()
+
+
+@pytest.fixture()
+def client(session_factory):
+    get_solve_cache().clear()
+    with TestClient(app) as test_client:
+        yield test_client
+    get_solve_cache().clear()
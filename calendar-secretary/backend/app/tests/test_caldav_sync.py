@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+from xml.sax.saxutils import escape
+
+import httpx
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.db import Base
+from app.models.event import Event
+from app.models.user import User
+from app.services.sync.caldav_client import CalDAVClient
+
+CALENDAR_URL = "https://caldav.test/calendars/user/home/"
+
+
+def _vevent(uid: str, summary: str, start: datetime) -> str:
+    return (
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nBEGIN:VEVENT\r\n"
+        f"UID:{uid}\r\nSUMMARY:{summary}\r\n"
+        f"DTSTART:{start:%Y%m%dT%H%M%S}Z\r\nDURATION:PT1H\r\n"
+        "END:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+
+
+class CalDAVStandIn:
+    """In-process CalDAV collection speaking sync-collection, ETags and If-Match."""
+
+    def __init__(self):
+        self.resources: dict[str, tuple[str, str]] = {}
+        self.changes: list[tuple[int, str]] = []
+        self.revision = 0
+        self.requests: list[tuple[str, str]] = []
+
+    def _touch(self, href: str) -> None:
+        self.revision += 1
+        self.changes.append((self.revision, href))
+
+    def put(self, name: str, data: str) -> str:
+        href = f"/calendars/user/home/{name}"
+        etag = f'"{self.revision + 1}"'
+        self.resources[href] = (etag, data)
+        self._touch(href)
+        return href
+
+    def delete(self, href: str) -> None:
+        del self.resources[href]
+        self._touch(href)
+
+    def _multistatus(self, since: int) -> str:
+        changed = {href for revision, href in self.changes if revision > since}
+        members = []
+        for href in sorted(changed):
+            if href in self.resources:
+                etag, data = self.resources[href]
+                members.append(
+                    f"<D:response><D:href>{href}</D:href><D:propstat><D:prop>"
+                    f"<D:getetag>{escape(etag)}</D:getetag><C:calendar-data>{escape(data)}</C:calendar-data>"
+                    "</D:prop><D:status>HTTP/1.1 200 OK</D:status></D:propstat></D:response>"
+                )
+            else:
+                members.append(
+                    f"<D:response><D:href>{href}</D:href><D:status>HTTP/1.1 404 Not Found</D:status></D:response>"
+                )
+        return (
+            '<?xml version="1.0"?><D:multistatus xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">'
+            + "".join(members)
+            + f"<D:sync-token>token-{self.revision}</D:sync-token></D:multistatus>"
+        )
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path))
+        if request.method == "PROPFIND":
+            return httpx.Response(207, text='<D:multistatus xmlns:D="DAV:"/>')
+        if request.method == "REPORT":
+            body = request.content.decode()
+            token = body.split("<D:sync-token>")[1].split("</D:sync-token>")[0]
+            since = int(token.split("-")[1]) if token else 0
+            return httpx.Response(207, text=self._multistatus(since))
+        if request.method == "PUT":
+            current = self.resources.get(request.url.path)
+            if_match = request.headers.get("If-Match")
+            if request.headers.get("If-None-Match") == "*" and current is not None:
+                return httpx.Response(412)
+            if if_match is not None and (current is None or current[0] != if_match):
+                return httpx.Response(412)
+            self.put(request.url.path.rsplit("/", 1)[1], request.content.decode())
+            etag = self.resources[request.url.path][0]
+            return httpx.Response(201 if current is None else 204, headers={"ETag": etag})
+        return httpx.Response(405)
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        future=True,
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
+    with TestingSessionLocal() as database:
+        database.add(User(id=uuid4(), email="user@example.com", hashed_password="secret"))
+        database.commit()
+        yield database
+
+
+@pytest.fixture()
+def server():
+    return CalDAVStandIn()
+
+
+@pytest.fixture()
+def client(session, server, monkeypatch):
+    monkeypatch.setattr(settings, "encryption_key", Fernet.generate_key().decode())
+    caldav = CalDAVClient(session, http=httpx.Client(transport=httpx.MockTransport(server)))
+    caldav.save_credentials({"url": CALENDAR_URL, "username": "user", "password": "app-password"})
+    caldav.verify_connection()
+    return caldav
+
+
+def test_pull_transfers_only_changes_since_sync_token(client, server, session):
+    start = datetime(2024, 1, 8, 9, 0)
+    standup = server.put("standup.ics", _vevent("standup", "Stand-up", start))
+    server.put("review.ics", _vevent("review", "Review", start + timedelta(hours=2)))
+
+    assert client.pull_events() == 2
+    assert session.query(Event).count() == 2
+    assert client.pull_events() == 0
+
+    server.put("standup.ics", _vevent("standup", "Stand-up (moved)", start + timedelta(hours=1)))
+    server.delete("/calendars/user/home/review.ics")
+    assert client.pull_events() == 2
+
+    (event,) = session.query(Event).all()
+    assert event.title == "Stand-up (moved)"
+    assert event.external_ids["caldav_href"].endswith(standup)
+    assert event.external_ids["ics_uid"] == "standup"
+
+
+def test_push_sends_only_local_changes_with_if_match(client, server, session):
+    start = datetime(2024, 1, 8, 9, 0)
+    server.put("standup.ics", _vevent("standup", "Stand-up", start))
+    client.pull_events()
+    user_id = session.query(User.id).scalar()
+    window = {"start": (start + timedelta(hours=3)).isoformat(), "end": (start + timedelta(hours=4)).isoformat()}
+    session.add(Event(user_id=user_id, title="Focus", type="fixed", duration_min=60, time_windows=[window]))
+    session.commit()
+
+    assert client.push_events() == 1
+    assert client.push_events() == 0
+
+    pulled = session.query(Event).filter(Event.title == "Stand-up").one()
+    pulled.title = "Stand-up (local)"
+    session.commit()
+    server.requests.clear()
+    assert client.push_events() == 1
+    assert server.requests == [("PUT", "/calendars/user/home/standup.ics")]
+    assert "Stand-up (local)" in server.resources["/calendars/user/home/standup.ics"][1]
+
+    # A remote edit wins over a stale local copy: the PUT is rejected with 412.
+    server.put("standup.ics", _vevent("standup", "Stand-up (remote)", start))
+    pulled.priority = 9
+    session.commit()
+    assert client.push_events() == 0
+    assert "Stand-up (remote)" in server.resources["/calendars/user/home/standup.ics"][1]
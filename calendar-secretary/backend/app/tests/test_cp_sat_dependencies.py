@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.services.planner.cp_sat_solver import CPSATSolver
+from app.services.planner.precedence import EventSpan, Precedence, critical_path_bounds
+
+START = datetime(2024, 1, 8, 9, 0)
+
+
+class DummyEvent:
+    def __init__(self, duration_min: int, priority: int = 5, depends_on: list | None = None, **extra):
+        self.id = uuid4()
+        self.type = "flexible"
+        self.duration_min = duration_min
+        self.priority = priority
+        self.time_windows = extra.pop("time_windows", [])
+        self.deadline = extra.pop("deadline", None)
+        self.flex = extra.pop("flex", None)
+        self.depends_on = depends_on or []
+
+
+def _link(event: DummyEvent, dep_type: str, lag_min: int = 0) -> list[dict]:
+    return [{"task_id": str(event.id), "type": dep_type, "lag_min": lag_min}]
+
+
+def _spans(solution) -> dict[str, tuple[datetime, datetime]]:
+    spans = {}
+    for chunk in solution.scheduled:
+        start, end = spans.get(str(chunk.event_id), (chunk.start, chunk.end))
+        spans[str(chunk.event_id)] = (min(start, chunk.start), max(end, chunk.end))
+    return spans
+
+
+@pytest.mark.parametrize(
+    ("dep_type", "check"),
+    [
+        ("FS", lambda pred, succ: succ[0] >= pred[1] + timedelta(minutes=20)),
+        ("SS", lambda pred, succ: succ[0] >= pred[0] + timedelta(minutes=20)),
+        ("FF", lambda pred, succ: succ[1] >= pred[1] + timedelta(minutes=20)),
+        ("SF", lambda pred, succ: succ[1] >= pred[0] + timedelta(minutes=20)),
+    ],
+)
+def test_link_types_with_lag(dep_type, check):
+    predecessor = DummyEvent(60, priority=1)
+    successor = DummyEvent(30, priority=10, depends_on=_link(predecessor, dep_type, 20))
+    solution = CPSATSolver().solve([successor, predecessor], {}, None, START, START + timedelta(hours=4))
+
+    spans = _spans(solution)
+    assert check(spans[str(predecessor.id)], spans[str(successor.id)])
+    assert solution.metadata_json["dependencies"] == 1
+
+
+def test_dependent_needs_its_prerequisite():
+    blocker = DummyEvent(60, priority=1, deadline=START + timedelta(minutes=30))
+    dependent = DummyEvent(30, priority=10, depends_on=_link(blocker, "FS"))
+    free = DummyEvent(30, priority=2)
+    solution = CPSATSolver().solve([blocker, dependent, free], {}, None, START, START + timedelta(hours=4))
+
+    assert set(_spans(solution)) == {str(free.id)}
+
+
+def test_chain_that_cannot_fit_keeps_prerequisites():
+    first = DummyEvent(90)
+    second = DummyEvent(60, depends_on=_link(first, "FS", 30))
+    third = DummyEvent(60, depends_on=_link(second, "FS"), deadline=START + timedelta(hours=3))
+    solution = CPSATSolver().solve([first, second, third], {}, None, START, START + timedelta(hours=5))
+
+    spans = _spans(solution)
+    assert set(spans) == {str(first.id), str(second.id)}
+    assert spans[str(second.id)][0] >= spans[str(first.id)][1] + timedelta(minutes=30)
+
+
+def test_split_prerequisite_finishes_before_dependent():
+    window = {"start": START + timedelta(minutes=60), "end": START + timedelta(minutes=90)}
+    meeting = DummyEvent(30, priority=10, time_windows=[window])
+    meeting.type = "fixed"
+    split = DummyEvent(90, flex={"can_split": True, "min_chunk_min": 30, "max_splits": 3})
+    after = DummyEvent(30, depends_on=_link(split, "FS"))
+    solution = CPSATSolver().solve([meeting, split, after], {}, None, START, START + timedelta(hours=4))
+
+    spans = _spans(solution)
+    assert spans[str(after.id)][0] >= spans[str(split.id)][1]
+
+
+def test_critical_path_raises_earliest_starts():
+    spans = {
+        "a": EventSpan(earliest=0, latest=100, min_span=10, rigid=True),
+        "b": EventSpan(earliest=0, latest=100, min_span=20, rigid=True),
+        "c": EventSpan(earliest=0, latest=25, min_span=5, rigid=False),
+        "d": EventSpan(earliest=0, latest=100, min_span=5, rigid=True),
+    }
+    precedences = [
+        Precedence("b", "a", "FS", 2),
+        Precedence("c", "b", "SS", 15),
+        Precedence("d", "missing", "FS", 0),
+    ]
+    impossible = critical_path_bounds(spans, precedences)
+
+    assert spans["b"].earliest == 12
+    assert spans["c"].earliest == 27
+    assert impossible == {"c", "d"}
+
+
+def test_prerequisite_before_the_horizon_releases_its_dependent():
+    yesterday = START - timedelta(days=1)
+    meeting = DummyEvent(60, time_windows=[{"start": yesterday, "end": yesterday + timedelta(hours=1)}])
+    meeting.type = "fixed"
+    follow_up = DummyEvent(30, depends_on=_link(meeting, "FS"))
+    next_day = DummyEvent(30, depends_on=_link(meeting, "FS", lag_min=24 * 60 + 60))
+    wrap_up = DummyEvent(60, depends_on=_link(meeting, "FF", lag_min=24 * 60 + 90), flex={"can_split": True})
+
+    solution = CPSATSolver().solve([meeting, follow_up, next_day, wrap_up], {}, None, START, START + timedelta(hours=4))
+
+    spans = _spans(solution)
+    assert set(spans) == {str(follow_up.id), str(next_day.id), str(wrap_up.id)}
+    assert spans[str(next_day.id)][0] >= START + timedelta(hours=2)
+    assert spans[str(wrap_up.id)][1] >= START + timedelta(hours=2, minutes=30)
@@ -0,0 +1,72 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.services.planner.cp_sat_solver import CPSATSolver
+from app.services.planner.families import DayAxis
+from app.services.planner.rules import TimeGrid
+
+MONDAY = datetime(2024, 1, 8)
+
+
+class DummyEvent:
+    def __init__(self, duration_min: int, family_key: str, priority: int = 5):
+        self.id = uuid4()
+        self.type = "flexible"
+        self.duration_min = duration_min
+        self.priority = priority
+        self.family_key = family_key
+        self.time_windows = []
+
+
+def _family(**targets) -> SimpleNamespace:
+    values = {"weight": 1.0, "min_daily_minutes": None, "max_daily_minutes": None, "weekly_target_minutes": None}
+    return SimpleNamespace(**{**values, **targets})
+
+
+def _minutes_per_day(solution) -> Counter:
+    load = Counter()
+    for chunk in solution.scheduled:
+        load[chunk.start.date()] += (chunk.end - chunk.start) // timedelta(minutes=1)
+    return load
+
+
+def test_daily_maximum_spreads_family_work():
+    families = {"study": _family(max_daily_minutes=60)}
+    events = [DummyEvent(60, "study") for _ in range(3)]
+    solution = CPSATSolver(granularity_min=15).solve(events, families, None, MONDAY, MONDAY + timedelta(days=3))
+
+    assert len(solution.scheduled) == 3
+    assert max(_minutes_per_day(solution).values()) == 60
+    assert solution.metadata_json["families"]["study"]["daily_overuse_min"] == 0
+
+
+def test_daily_minimum_places_work_on_every_day():
+    families = {"health": _family(min_daily_minutes=30)}
+    events = [DummyEvent(30, "health") for _ in range(3)]
+    solution = CPSATSolver(granularity_min=15).solve(events, families, None, MONDAY, MONDAY + timedelta(days=3))
+
+    assert sorted(_minutes_per_day(solution).values()) == [30, 30, 30]
+    assert solution.metadata_json["families"]["health"]["daily_deficit_min"] == 0
+
+
+def test_weekly_target_shortfall_is_reported():
+    families = {"home": _family(weekly_target_minutes=300), "work": SimpleNamespace(weight=2.0)}
+    events = [DummyEvent(60, "home"), DummyEvent(60, "work")]
+    solution = CPSATSolver(granularity_min=15).solve(events, families, None, MONDAY, MONDAY + timedelta(days=7))
+
+    assert len(solution.scheduled) == 2
+    assert solution.metadata_json["families"] == {
+        "home": {"daily_deficit_min": 0, "daily_overuse_min": 0, "weekly_shortfall_min": 240}
+    }
+
+
+def test_day_axis_widens_spans_to_days_and_weeks():
+    grid = TimeGrid(MONDAY + timedelta(days=2, hours=9), 15)
+    axis = DayAxis.for_grid(grid, 96 * 10)
+
+    assert axis.offset == -36
+    assert axis.widen((4, 8), weekly=False) == (-36, 60)
+    assert axis.widen((4, 8), weekly=True) == (-36 - 2 * 96, -36 + 5 * 96)
+    assert axis.share(0) == 0.625
@@ -1,7 +1,9 @@
+from dataclasses import replace
 from datetime import datetime, timedelta
 from uuid import uuid4
 
 from app.services.planner.cp_sat_solver import CPSATSolver
+from app.services.planner.profiles import PROFILES
 
 
 class DummyEvent:
@@ -31,3 +33,19 @@ def test_solver_prioritises_high_weight_when_time_limited():
     assert solution is not None
     assert len(solution.scheduled) == 1
     assert str(solution.scheduled[0].event_id) == str(high_priority.id)
+
+
+def test_solver_reports_profile_metadata():
+    profile = replace(PROFILES["batch"], num_workers=2, random_seed=7)
+    solver = CPSATSolver(profile=profile)
+    start = datetime.utcnow()
+    solution = solver.solve(
+        [DummyEvent(30, priority=5)], families={}, pomodoro=None, start=start, end=start + timedelta(hours=1)
+    )
+
+    assert solution is not None
+    assert solution.metadata_json["profile"]["name"] == "batch"
+    assert solution.metadata_json["profile"]["num_workers"] == 2
+    assert solution.metadata_json["profile"]["random_seed"] == 7
+    assert solution.metadata_json["status"] == "OPTIMAL"
+    assert solution.metadata_json["relative_gap"] == 0
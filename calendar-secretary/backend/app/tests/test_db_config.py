@@ -0,0 +1,20 @@
+from app.core.config import settings
+from app.core.db import async_database_url, pool_options
+
+
+def test_async_url_swaps_driver_and_keeps_credentials():
+    assert (
+        async_database_url("postgresql+psycopg2://postgres:secret@db:5432/calendar")
+        == "postgresql+asyncpg://postgres:secret@db:5432/calendar"
+    )
+    assert async_database_url("sqlite:///./calendar.db") == "sqlite+aiosqlite:///./calendar.db"
+
+
+def test_pool_options_come_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 3)
+    monkeypatch.setattr(settings, "db_pool_recycle_seconds", 60)
+    options = pool_options("postgresql+asyncpg://db/calendar")
+    assert options["pool_size"] == 3
+    assert options["pool_recycle"] == 60
+    assert options["pool_pre_ping"] is True
+    assert pool_options("sqlite+aiosqlite:///./calendar.db") == {}
@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.services.planner.cp_sat_solver import CPSATSolver, _TimeBudget
+from app.services.planner.decomposition import decompose
+
+
+@dataclass
+class SpanChunk:
+    event_id: str
+    size: int
+    earliest: int | None = None
+    latest: int | None = None
+
+
+class DummyEvent:
+    def __init__(self, duration_min: int, windows: list[tuple[datetime, datetime]], depends_on: list | None = None):
+        self.id = uuid4()
+        self.duration_min = duration_min
+        self.priority = 5
+        self.type = "flexible"
+        self.time_windows = [{"start": s.isoformat(), "end": e.isoformat()} for s, e in windows]
+        self.depends_on = depends_on or []
+
+
+def test_decompose_cuts_where_no_span_crosses():
+    morning = SpanChunk("a", size=30, earliest=0, latest=90)
+    overlapping = SpanChunk("b", size=30, earliest=60, latest=120)
+    evening = SpanChunk("c", size=30, earliest=600, latest=700)
+    groups = decompose([evening, morning, overlapping], horizon_end=1440)
+    assert [[chunk.event_id for chunk in group] for group in groups] == [["a", "b"], ["c"]]
+
+
+def test_decompose_keeps_linked_events_together():
+    morning = SpanChunk("a", size=30, earliest=0, latest=90)
+    evening = SpanChunk("c", size=30, earliest=600, latest=700)
+    groups = decompose([morning, evening], horizon_end=1440, links=[("c", "a")])
+    assert len(groups) == 1
+
+
+def test_solver_merges_independent_days():
+    start = datetime(2024, 1, 8, 0, 0)
+    day_one = (start + timedelta(hours=9), start + timedelta(hours=12))
+    day_two = (start + timedelta(days=1, hours=9), start + timedelta(days=1, hours=12))
+    events = [DummyEvent(60, [day_one]), DummyEvent(90, [day_one]), DummyEvent(120, [day_two])]
+
+    solution = CPSATSolver().solve(events, {}, None, start, start + timedelta(days=2))
+
+    assert solution is not None
+    assert len(solution.scheduled) == 3
+    placed = {str(chunk.event_id): chunk for chunk in solution.scheduled}
+    for event in events:
+        window = event.time_windows[0]
+        chunk = placed[str(event.id)]
+        assert chunk.start >= datetime.fromisoformat(window["start"])
+        assert chunk.end <= datetime.fromisoformat(window["end"])
+    assert [chunk.start for chunk in solution.scheduled] == sorted(chunk.start for chunk in solution.scheduled)
+
+
+def test_time_budget_shares_remaining_time_between_queued_components():
+    budget = _TimeBudget(4.0, components=4, concurrency=1)
+    assert 0.9 < budget.claim() <= 1.0
+    # Time the first component did not use carries over to the rest.
+    assert 1.2 < budget.claim() <= 4 / 3
+
+    parallel = _TimeBudget(4.0, components=2, concurrency=2)
+    assert 3.9 < parallel.claim() <= 4.0
+    assert 3.9 < parallel.claim() <= 4.0
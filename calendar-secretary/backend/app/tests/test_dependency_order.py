@@ -0,0 +1,33 @@
+import time
+
+import pytest
+
+from app.services.planner.rules import DependencyGraphError, topological_sort
+
+
+def test_topological_sort_uses_key_for_ready_nodes():
+    edges = {"a": {"c"}, "b": {"c"}, "c": set(), "d": set()}
+    rank = {"a": 2, "b": 1, "c": 0, "d": 3}
+    assert topological_sort(edges.keys(), edges, key=rank.get) == ["b", "a", "c", "d"]
+
+
+def test_topological_sort_names_cycle_nodes():
+    edges = {"a": {"b"}, "b": {"c"}, "c": {"a"}, "d": {"a"}}
+    with pytest.raises(DependencyGraphError) as excinfo:
+        topological_sort(edges.keys(), edges)
+    assert excinfo.value.cycle == ["a", "b", "c"]
+    assert "a -> b -> c -> a" in str(excinfo.value)
+
+
+def test_topological_sort_scales_to_large_graphs():
+    size = 10_000
+    nodes = [str(index) for index in range(size)]
+    edges = {
+        node: {str(child) for child in (index * 2 + 1, index * 2 + 2) if child < size}
+        for index, node in enumerate(nodes)
+    }
+    started = time.perf_counter()
+    order = topological_sort(nodes, edges)
+    assert time.perf_counter() - started < 1.0
+    position = {node: index for index, node in enumerate(order)}
+    assert all(position[source] < position[target] for source, targets in edges.items() for target in targets)
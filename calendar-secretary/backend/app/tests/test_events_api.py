@@ -1,55 +1,8 @@
 from datetime import datetime, timedelta
-from uuid import uuid4
-
-import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from uuid import UUID, uuid4
 
 from app.core import db as db_module
-from app.core.db import Base, get_db
-from app.main import app
-from app.models.event import Event
-from app.models.user import User
-
-
-@pytest.fixture()
-def client():
-    engine = create_engine(
-        "sqlite+pysqlite:///:memory:",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-        future=True,
-    )
-    TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
-
-    db_module.engine = engine
-    db_module.SessionLocal = TestingSessionLocal
-
-    Base.metadata.create_all(bind=engine)
-
-    with TestingSessionLocal() as session:
-        session.add(
-            User(
-                id=uuid4(),
-                email="user@example.com",
-                hashed_password="secret",
-            )
-        )
-        session.commit()
-
-    def override_get_db():
-        database = TestingSessionLocal()
-        try:
-            yield database
-        finally:
-            database.close()
-
-    app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
-        yield test_client
-    app.dependency_overrides.clear()
+from app.models.event import Event, TaskDependency
 
 
 def test_create_event_with_time_window_persists(client):
@@ -89,3 +42,51 @@ def test_create_event_with_time_window_persists(client):
     with db_module.SessionLocal() as session:
         event = session.query(Event).one()
         assert event.time_windows[0]["start"].startswith(start.isoformat())
+
+
+def _task(title: str, depends_on: list | None = None) -> dict:
+    return {"title": title, "type": "flexible", "duration_min": 30, "priority": 5, "depends_on": depends_on or []}
+
+
+def test_single_event_writes_reject_dependency_cycles(client):
+    first = client.post("/api/events", json=_task("First")).json()
+    second = client.post("/api/events", json=_task("Second", [{"task_id": first["id"], "type": "FS"}])).json()
+
+    response = client.patch(f"/api/events/{first['id']}", json={"depends_on": [{"task_id": second["id"], "type": "FS"}]})
+    assert response.status_code == 422
+    assert set(response.json()["detail"]["cycle"]) == {first["id"], second["id"]}
+
+    response = client.patch(f"/api/events/{first['id']}", json={"depends_on": [{"task_id": first["id"], "type": "FS"}]})
+    assert response.status_code == 422
+
+    with db_module.SessionLocal() as session:
+        assert session.query(TaskDependency).count() == 1
+
+
+def test_solve_names_a_stored_dependency_cycle(client):
+    first = client.post("/api/events", json=_task("First")).json()
+    second = client.post("/api/events", json=_task("Second", [{"task_id": first["id"], "type": "FS"}])).json()
+    with db_module.SessionLocal() as session:
+        session.add(TaskDependency(id=uuid4(), task_id=UUID(first["id"]), depends_on_id=UUID(second["id"]), type="FS"))
+        session.commit()
+
+    start = datetime(2024, 1, 8, 9, 0)
+    payload = {"from_dt": start.isoformat(), "to_dt": (start + timedelta(hours=4)).isoformat()}
+    response = client.post("/api/plan/solve", json=payload)
+    assert response.status_code == 422
+    assert set(response.json()["detail"]["cycle"]) == {first["id"], second["id"]}
+    assert client.post("/api/plan/jobs", json=payload).status_code == 422
+
+
+def test_solve_rejects_fixed_events_that_cannot_all_happen(client):
+    start = datetime(2024, 1, 8, 9, 0)
+    for title in ("Board meeting", "Customer call"):
+        window = {"start": start.isoformat(), "end": (start + timedelta(hours=1)).isoformat()}
+        client.post("/api/events", json={"title": title, "type": "fixed", "duration_min": 60, "time_windows": [window]})
+
+    payload = {"from_dt": start.isoformat(), "to_dt": (start + timedelta(hours=4)).isoformat()}
+    response = client.post("/api/plan/solve", json=payload)
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["feasible"] is False
+    assert [(issue["kind"], issue["severity"]) for issue in detail["issues"]] == [("fixed_overlap", "error")]
@@ -0,0 +1,82 @@
+from uuid import UUID, uuid4
+
+from app.models.event import Event, TaskDependency
+from app.models.user import User
+
+
+def _task(title: str, **extra):
+    return {"title": title, "type": "flexible", "duration_min": 30, **extra}
+
+
+def test_batch_creates_chain_and_then_updates_and_deletes(client, session_factory):
+    ids = [str(uuid4()) for _ in range(300)]
+    creates = [
+        _task(f"Task {index}", id=event_id, depends_on=[{"task_id": ids[index - 1]}] if index else [])
+        for index, event_id in enumerate(ids)
+    ]
+    response = client.post("/api/events/batch", json={"create": creates})
+    assert response.status_code == 200
+    assert response.json()["created"] == 300
+    with session_factory() as session:
+        assert session.query(Event).count() == 300
+        assert session.query(TaskDependency).count() == 299
+
+    response = client.post(
+        "/api/events/batch",
+        json={
+            "update": [{"id": ids[1], "priority": 9, "metadata": {"notes": "moved"}, "depends_on": []}],
+            "delete": [ids[0]],
+        },
+    )
+    assert response.status_code == 200
+    assert [(item["op"], item["ok"]) for item in response.json()["results"]] == [("delete", True), ("update", True)]
+    with session_factory() as session:
+        event = session.get(Event, UUID(ids[1]))
+        assert (event.priority, event.title, event.metadata_json["notes"]) == (9, "Task 1", "moved")
+        assert session.query(Event).count() == 299
+        assert session.query(TaskDependency).count() == 298
+
+
+def test_batch_rejects_cycles_and_unknown_ids_atomically(client, session_factory):
+    first, second = str(uuid4()), str(uuid4())
+    client.post("/api/events/batch", json={"create": [_task("A", id=first), _task("B", id=second)]})
+
+    response = client.post(
+        "/api/events/batch",
+        json={
+            "create": [_task("C")],
+            "update": [
+                {"id": first, "depends_on": [{"task_id": second}]},
+                {"id": second, "depends_on": [{"task_id": first}]},
+            ],
+            "delete": [str(uuid4())],
+        },
+    )
+    assert response.status_code == 422
+    body = response.json()
+    assert body["applied"] is False
+    errors = {(item["op"], item["index"]): item["error"] for item in body["results"] if not item["ok"]}
+    assert errors[("delete", 0)] == "Event not found"
+    assert "Dependency graph contains cycles" in errors[("update", 0)]
+    assert ("create", 0) not in errors
+    with session_factory() as session:
+        assert session.query(Event).count() == 2
+        assert session.query(TaskDependency).count() == 0
+
+
+def test_batch_rejects_ids_owned_by_another_user(client, session_factory, user_id):
+    with session_factory() as session:
+        stranger = User(id=uuid4(), email="other@example.com", hashed_password="secret")
+        session.add(stranger)
+        session.flush()
+        foreign = Event(user_id=stranger.id, title="Not mine", type="fixed", duration_min=30)
+        session.add(foreign)
+        session.commit()
+        foreign_id = str(foreign.id)
+
+    response = client.post("/api/events/batch", json={"create": [_task("A"), _task("B", id=foreign_id)]})
+    assert response.status_code == 422
+    errors = {(item["op"], item["index"]): item["error"] for item in response.json()["results"] if not item["ok"]}
+    assert errors == {("create", 1): "Event id already exists"}
+    with session_factory() as session:
+        assert session.query(Event).filter(Event.user_id == user_id).count() == 0
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.models.event import Event
+from app.models.user import User
+
+START = datetime(2024, 1, 8, 9, 0)
+
+
+@pytest.fixture()
+def client(session_factory, user_id, client):
+    with session_factory() as session:
+        stranger = User(id=uuid4(), email="other@example.com", hashed_password="secret")
+        session.add(stranger)
+        session.flush()
+        for index in range(7):
+            session.add(
+                Event(
+                    user_id=user_id,
+                    title=f"Task {index}",
+                    type="flexible" if index % 2 else "fixed",
+                    duration_min=30,
+                    deadline=START + timedelta(days=index) if index < 5 else None,
+                    family_key="work" if index % 3 == 0 else "home",
+                    time_windows=[],
+                    metadata_json={},
+                )
+            )
+        session.add(Event(user_id=stranger.id, title="Not mine", type="fixed", duration_min=30))
+        session.commit()
+    return client
+
+
+def test_keyset_pages_cover_user_events_once(client):
+    titles, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/events", params=params)
+        assert response.status_code == 200
+        titles += [event["title"] for event in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert titles[:5] == [f"Task {index}" for index in range(5)]
+    assert sorted(titles[5:]) == ["Task 5", "Task 6"]
+
+
+def test_filters_and_projection(client):
+    response = client.get(
+        "/api/events",
+        params={
+            "from": (START + timedelta(days=1)).isoformat(),
+            "to": (START + timedelta(days=4)).isoformat(),
+            "type": "flexible",
+            "fields": "title,deadline",
+        },
+    )
+    assert response.status_code == 200
+    assert [sorted(item) for item in response.json()] == [["deadline", "id", "title"]] * 2
+    assert [item["title"] for item in response.json()] == ["Task 1", "Task 3"]
+
+    by_family = client.get("/api/events", params={"family_key": "work", "fields": "family_key"}).json()
+    assert {item["family_key"] for item in by_family} == {"work"}
+    assert len(by_family) == 3
+
+    assert client.get("/api/events", params={"fields": "password"}).status_code == 422
+
+
+def test_range_filter_matches_time_windows(client, session_factory, user_id):
+    meeting = {"start": START + timedelta(days=2, hours=1), "end": START + timedelta(days=2, hours=2)}
+    with session_factory() as session:
+        session.add(
+            Event(
+                user_id=user_id,
+                title="Standup",
+                type="fixed",
+                duration_min=60,
+                time_windows=[{key: value.isoformat() for key, value in meeting.items()}],
+            )
+        )
+        session.commit()
+
+    def titles(start, end):
+        params = {"from": start.isoformat(), "to": end.isoformat(), "fields": "title"}
+        return [item["title"] for item in client.get("/api/events", params=params).json()]
+
+    assert "Standup" in titles(START + timedelta(days=2), START + timedelta(days=3))
+    assert "Standup" not in titles(START + timedelta(days=3), START + timedelta(days=4))
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.services.planner.heuristic_solver import HeuristicPlanner
+from app.services.planner.timeline import FreeTimeline
+
+
+class DummyEvent:
+    def __init__(self, duration_min: int, priority: int = 5, **attrs):
+        self.id = uuid4()
+        self.duration_min = duration_min
+        self.priority = priority
+        self.family_key = None
+        self.type = "flexible"
+        self.time_windows = []
+        self.deadline = None
+        self.flex = None
+        for name, value in attrs.items():
+            setattr(self, name, value)
+
+
+def _window(start: datetime, end: datetime) -> dict:
+    return {"start": start.isoformat(), "end": end.isoformat()}
+
+
+def test_timeline_earliest_and_best_fit():
+    timeline = FreeTimeline(0, 100, busy=[(10, 20), (50, 90)])
+    assert timeline.earliest_fit(10) == 0
+    assert timeline.earliest_fit(15) == 20
+    assert timeline.earliest_fit(15, not_before=40) is None
+    assert timeline.best_fit(10) == 0
+    assert timeline.best_fit(10, not_before=5) == 90
+
+    timeline.reserve(20, 35)
+    assert timeline.earliest_fit(15) == 35
+    timeline.free(20, 35)
+    assert timeline.earliest_fit(30) == 20
+
+
+def test_heuristic_respects_fixed_events_windows_and_deadlines():
+    start = datetime(2024, 1, 8, 9, 0)
+    meeting = DummyEvent(
+        60, type="fixed", time_windows=[_window(start + timedelta(minutes=30), start + timedelta(minutes=90))]
+    )
+    windowed = DummyEvent(30, priority=9, time_windows=[_window(start + timedelta(hours=3), start + timedelta(hours=4))])
+    urgent = DummyEvent(45, priority=1, deadline=start + timedelta(hours=3))
+    too_long = DummyEvent(600)
+
+    plan = HeuristicPlanner().solve([meeting, windowed, urgent, too_long], {}, None, start, start + timedelta(hours=5))
+    placed = {str(chunk.event_id): chunk for chunk in plan.scheduled}
+
+    assert placed[str(meeting.id)].start == start + timedelta(minutes=30)
+    assert placed[str(windowed.id)].start == start + timedelta(hours=3)
+    assert placed[str(urgent.id)].start == start + timedelta(minutes=90)
+    assert plan.metadata_json["unscheduled"] == [str(too_long.id)]
+    for first, second in zip(plan.scheduled, plan.scheduled[1:]):
+        assert first.end <= second.start
+
+
+def test_heuristic_splits_tasks_around_busy_time():
+    start = datetime(2024, 1, 8, 9, 0)
+    meeting = DummyEvent(60, type="fixed", time_windows=[_window(start + timedelta(minutes=60), start + timedelta(minutes=120))])
+    task = DummyEvent(120, flex={"can_split": True, "min_chunk_min": 30})
+
+    plan = HeuristicPlanner().solve([meeting, task], {}, None, start, start + timedelta(hours=3))
+    pieces = [chunk for chunk in plan.scheduled if str(chunk.event_id) == str(task.id)]
+
+    assert [(chunk.start, chunk.end) for chunk in pieces] == [
+        (start, start + timedelta(minutes=60)),
+        (start + timedelta(minutes=120), start + timedelta(minutes=180)),
+    ]
+
+
+def test_heuristic_handles_thousands_of_tasks():
+    start = datetime(2024, 1, 8, 0, 0)
+    meetings = [
+        DummyEvent(60, type="fixed", time_windows=[_window(start + timedelta(hours=h), start + timedelta(hours=h + 1))])
+        for h in range(0, 24 * 30, 5)
+    ]
+    tasks = [DummyEvent(10 + (index % 2) * 5, priority=index % 10) for index in range(2000)]
+
+    plan = HeuristicPlanner().solve(meetings + tasks, {}, None, start, start + timedelta(days=30))
+
+    assert not plan.metadata_json["unscheduled"]
+    for first, second in zip(plan.scheduled, plan.scheduled[1:]):
+        assert first.end <= second.start
+
+
+def test_heuristic_treats_prerequisites_before_the_horizon_as_done():
+    start = datetime(2024, 1, 8, 9, 0)
+    yesterday = start - timedelta(days=1)
+    meeting = DummyEvent(60, type="fixed", time_windows=[_window(yesterday, yesterday + timedelta(hours=1))])
+    follow_up = DummyEvent(30, depends_on=[{"task_id": meeting.id, "type": "FS", "lag_min": 0}])
+    late = DummyEvent(30, depends_on=[{"task_id": meeting.id, "type": "FS", "lag_min": 24 * 60 + 60}])
+
+    solution = HeuristicPlanner().solve([meeting, follow_up, late], {}, None, start, start + timedelta(hours=8))
+
+    starts = {str(chunk.event_id): chunk.start for chunk in solution.scheduled}
+    assert starts == {str(follow_up.id): start, str(late.id): start + timedelta(hours=2)}
+    assert solution.metadata_json["unscheduled"] == []
+
+
+def test_heuristic_keeps_a_meeting_across_the_horizon_start_busy():
+    start = datetime(2024, 1, 8, 9, 0)
+    meeting = DummyEvent(
+        60, type="fixed", time_windows=[_window(start - timedelta(minutes=30), start + timedelta(minutes=30))]
+    )
+    task = DummyEvent(30)
+
+    solution = HeuristicPlanner().solve([meeting, task], {}, None, start, start + timedelta(hours=8))
+
+    starts = {str(chunk.event_id): chunk.start for chunk in solution.scheduled}
+    assert starts[str(task.id)] == start + timedelta(minutes=30)
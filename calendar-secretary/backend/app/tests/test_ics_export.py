@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import db as db_module
+from app.models.event import Event
+from app.services.sync.ics_parser import ICSParser
+
+
+@pytest.fixture()
+def client(session_factory, user_id, client):
+    start = datetime(2024, 1, 8, 9, 0)
+    with session_factory() as session:
+        session.add(
+            Event(
+                user_id=user_id,
+                title="Review, planning",
+                type="fixed",
+                duration_min=60,
+                time_windows=[{"start": start.isoformat(), "end": (start + timedelta(hours=1)).isoformat()}],
+                family_key="work",
+            )
+        )
+        session.add(Event(user_id=user_id, title="Unscheduled", type="flexible", duration_min=30))
+        session.commit()
+    return client
+
+
+def _parse(body: bytes):
+    parser = ICSParser()
+    return [*parser.feed(body), *parser.close()]
+
+
+def test_export_streams_events_with_metadata(client):
+    response = client.get("/api/sync/export.ics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/calendar")
+
+    (event,) = _parse(response.content)
+    assert event.summary == "Review, planning"
+    assert event.description == "#family:work"
+    assert event.start == datetime.fromisoformat("2024-01-08T09:00:00+00:00")
+    assert event.duration_min == 60
+
+
+def test_export_answers_304_until_events_change(client):
+    first = client.get("/api/sync/export.ics")
+    etag = first.headers["etag"]
+    assert client.get("/api/sync/export.ics", headers={"If-None-Match": etag}).status_code == 304
+    assert (
+        client.get("/api/sync/export.ics", headers={"If-Modified-Since": first.headers["last-modified"]}).status_code
+        == 304
+    )
+
+    with db_module.SessionLocal() as session:
+        event = session.query(Event).filter(Event.title == "Unscheduled").one()
+        event.priority = 9
+        session.commit()
+
+    changed = client.get("/api/sync/export.ics", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_export_plan_lists_scheduled_chunks(client):
+    response = client.get(
+        "/api/sync/export.ics",
+        params={"plan": "true", "from": "2024-01-08T08:00:00", "to": "2024-01-08T12:00:00"},
+    )
+    assert response.status_code == 200
+    summaries = sorted(event.summary for event in _parse(response.content))
+    assert summaries == ["Review, planning", "Unscheduled"]
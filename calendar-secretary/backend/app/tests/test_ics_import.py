@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.core import db as db_module
+from app.models.event import Event
+from app.services.sync.ics_parser import ICSParser
+from app.services.sync.ics_service import ics_event_rows, ics_event_values
+
+CALENDAR = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:standup@example.com\r\n"
+    "SUMMARY:Daily stand-up with a very long title that the exporter folds acr\r\n"
+    " oss two lines #family:work\r\n"
+    "DTSTART;TZID=Europe/Helsinki:20240108T093000\r\n"
+    "DURATION:PT15M\r\n"
+    "RRULE:FREQ=DAILY;COUNT=5\r\n"
+    "BEGIN:VALARM\r\n"
+    "SUMMARY:Reminder\r\n"
+    "TRIGGER:-PT5M\r\n"
+    "END:VALARM\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:lunch@example.com\r\n"
+    "SUMMARY:Обед\r\n"
+    "DTSTART:20240108T100000Z\r\n"
+    "DTEND:20240108T110000Z\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+).encode("utf-8")
+
+
+def test_parser_handles_folding_durations_and_split_chunks():
+    parser = ICSParser()
+    events = []
+    for offset in range(0, len(CALENDAR), 7):
+        events.extend(parser.feed(CALENDAR[offset : offset + 7]))
+    events.extend(parser.close())
+
+    standup, lunch = events
+    assert standup.summary.endswith("folds across two lines #family:work")
+    assert standup.start == datetime(2024, 1, 8, 7, 30, tzinfo=timezone.utc)
+    assert standup.duration_min == 15
+    assert standup.rrule == "FREQ=DAILY;COUNT=5"
+    assert lunch.summary == "Обед"
+    assert lunch.duration_min == 60
+
+
+def test_start_without_end_follows_rfc_5545():
+    body = (
+        "BEGIN:VEVENT\r\nUID:holiday\r\nDTSTART;VALUE=DATE:20240108\r\nEND:VEVENT\r\n"
+        "BEGIN:VEVENT\r\nUID:reminder\r\nDTSTART:20240108T120000Z\r\nEND:VEVENT\r\n"
+    ).encode()
+    parser = ICSParser()
+    holiday, reminder = [*parser.feed(body), *parser.close()]
+    assert holiday.duration_min == 24 * 60
+
+    values = ics_event_values(reminder, uuid4())
+    assert values["duration_min"] == 0
+    assert values["time_windows"] == [
+        {"start": "2024-01-08T12:00:00+00:00", "end": "2024-01-08T12:00:00+00:00"}
+    ]
+
+
+def test_recurring_events_expand_within_the_window():
+    body = (
+        "BEGIN:VEVENT\r\nUID:sync\r\nSUMMARY:Weekly sync\r\n"
+        "DTSTART;TZID=Europe/Helsinki:20240311T093000\r\nDURATION:PT30M\r\n"
+        "RRULE:FREQ=WEEKLY;BYDAY=MO,TH;UNTIL=20240405T000000Z\r\nEND:VEVENT\r\n"
+    ).encode()
+    parser = ICSParser()
+    (weekly,) = [*parser.feed(body), *parser.close()]
+    window_start = datetime(2024, 3, 20, tzinfo=timezone.utc)
+    rows = ics_event_rows(weekly, uuid4(), window_start, window_start + timedelta(days=21))
+
+    starts = [row["time_windows"][0]["start"] for row in rows]
+    assert starts == [
+        "2024-03-11T07:30:00+00:00",
+        "2024-03-21T07:30:00+00:00",
+        "2024-03-25T07:30:00+00:00",
+        "2024-03-28T07:30:00+00:00",
+        "2024-04-01T06:30:00+00:00",
+        "2024-04-04T06:30:00+00:00",
+    ]
+    assert rows[0]["metadata_json"]["rrule"].startswith("FREQ=WEEKLY")
+    assert all("rrule" not in row["metadata_json"] for row in rows[1:])
+    assert rows[1]["external_ids"] == {"ics_uid": "sync", "recurrence_id": starts[1]}
+    assert len({row["id"] for row in rows}) == len(rows)
+
+
+def test_import_streams_body_into_batched_inserts(client):
+    start = datetime(2024, 1, 8, 9, 0)
+    lines = ["BEGIN:VCALENDAR"]
+    for index in range(2500):
+        moment = start + timedelta(minutes=30 * index)
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{index}@example.com",
+            f"SUMMARY:Event {index}",
+            f"DTSTART:{moment:%Y%m%dT%H%M%S}Z",
+            "DURATION:PT30M",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    body = ("\r\n".join(lines) + "\r\n").encode()
+
+    def chunks():
+        for offset in range(0, len(body), 4096):
+            yield body[offset : offset + 4096]
+
+    response = client.post("/api/sync/import/ics", content=chunks(), headers={"Content-Type": "text/calendar"})
+    assert response.status_code == 200
+    assert response.json() == {"created": 2500}
+
+    with db_module.SessionLocal() as session:
+        assert session.query(Event).count() == 2500
+        event = session.query(Event).filter(Event.title == "Event 1").one()
+        assert event.duration_min == 30
+        assert event.external_ids == {"ics_uid": "1@example.com"}
+        assert event.time_windows[0]["start"].startswith("2024-01-08T09:30:00")
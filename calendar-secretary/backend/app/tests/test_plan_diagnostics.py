@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.services.planner.diagnostics import PlanDiagnostics
+
+START = datetime(2024, 1, 8, 9, 0)
+END = START + timedelta(hours=8)
+
+
+class DummyEvent:
+    def __init__(self, duration_min: int, type: str = "flexible", offset_min: int | None = None):
+        self.id = uuid4()
+        self.title = f"event {duration_min}"
+        self.type = type
+        self.duration_min = duration_min
+        self.priority = 5
+        self.time_windows = []
+        if offset_min is not None:
+            self.window(offset_min, offset_min + duration_min)
+
+    def window(self, start_min: int, end_min: int) -> "DummyEvent":
+        self.time_windows.append(
+            {"start": START + timedelta(minutes=start_min), "end": START + timedelta(minutes=end_min)}
+        )
+        return self
+
+
+def _kinds(diagnosis) -> list[str]:
+    return [issue.kind for issue in diagnosis.issues]
+
+
+def test_feasible_calendar_has_no_issues():
+    events = [DummyEvent(60, "fixed", offset_min=0), DummyEvent(120), DummyEvent(90).window(60, 240)]
+    diagnosis = PlanDiagnostics(START, END).diagnose(events)
+
+    assert diagnosis.feasible
+    assert diagnosis.issues == []
+
+
+def test_overlapping_fixed_events_and_blocked_window_are_reported():
+    first, second = DummyEvent(60, "fixed", offset_min=60), DummyEvent(60, "fixed", offset_min=90)
+    squeezed = DummyEvent(45).window(60, 150)
+    diagnosis = PlanDiagnostics(START, END).diagnose([first, second, squeezed])
+
+    assert not diagnosis.feasible
+    assert _kinds(diagnosis) == ["fixed_overlap", "no_slot"]
+    overlap, no_slot = diagnosis.issues
+    assert overlap.event_ids == [first.id, second.id]
+    assert overlap.end - overlap.start == timedelta(minutes=30)
+    assert no_slot.event_ids == [squeezed.id]
+    assert no_slot.available_min == 0
+
+
+def test_split_task_fits_into_several_gaps():
+    meeting = DummyEvent(60, "fixed", offset_min=60)
+    task = DummyEvent(90).window(0, 180)
+    task.flex = {"can_split": True, "min_chunk_min": 30, "max_splits": 3}
+
+    assert PlanDiagnostics(START, END).diagnose([meeting, task]).feasible
+    task.flex = None
+    assert _kinds(PlanDiagnostics(START, END).diagnose([meeting, task])) == ["no_slot"]
+
+
+def test_dependency_chain_misses_deadline():
+    first = DummyEvent(180)
+    second = DummyEvent(120)
+    second.deadline = START + timedelta(hours=4)
+    second.depends_on = [{"task_id": first.id, "type": "FS", "lag_min": 30}]
+    diagnosis = PlanDiagnostics(START, END).diagnose([first, second])
+
+    assert _kinds(diagnosis) == ["dependency"]
+    assert [str(event_id) for event_id in diagnosis.issues[0].event_ids] == [str(second.id), str(first.id)]
+
+
+def test_demand_above_free_time_is_an_overload():
+    meeting = DummyEvent(240, "fixed", offset_min=0)
+    tasks = [DummyEvent(120), DummyEvent(90), DummyEvent(60)]
+    diagnosis = PlanDiagnostics(START, END).diagnose([meeting, *tasks])
+
+    assert _kinds(diagnosis) == ["overload"]
+    assert diagnosis.issues[0].required_min == 270
+    assert diagnosis.issues[0].available_min == 240
+
+
+def test_tasks_confined_to_one_day_overload_it():
+    start, end = START, START + timedelta(days=2)
+    tasks = [DummyEvent(300).window(0, 480), DummyEvent(300).window(0, 480), DummyEvent(300).window(1440, 1920)]
+    diagnosis = PlanDiagnostics(start, end).diagnose(tasks)
+
+    assert "day_overload" in _kinds(diagnosis)
+    day_issue = next(issue for issue in diagnosis.issues if issue.kind == "day_overload")
+    assert set(day_issue.event_ids) == {tasks[0].id, tasks[1].id}
+    assert day_issue.available_min == 480
+
+
+def test_history_is_left_out_and_releases_its_dependents():
+    overdue = DummyEvent(60)
+    overdue.deadline = START - timedelta(hours=1)
+    meeting = DummyEvent(60, "fixed", offset_min=-1440)
+    follow_up = DummyEvent(60)
+    follow_up.deadline = START + timedelta(hours=2)
+    follow_up.depends_on = [{"task_id": meeting.id, "type": "FS", "lag_min": 60}]
+    diagnosis = PlanDiagnostics(START, END).diagnose([overdue, meeting, follow_up])
+
+    assert diagnosis.feasible
+    assert diagnosis.issues == []
+
+
+def test_overload_is_a_warning_and_contradictions_are_errors():
+    tasks = [DummyEvent(120) for _ in range(5)]
+    diagnosis = PlanDiagnostics(START, END).diagnose(tasks)
+
+    assert diagnosis.feasible
+    assert [(issue.kind, issue.severity) for issue in diagnosis.issues] == [("overload", "warning")]
+
+    first, second = DummyEvent(60), DummyEvent(60)
+    first.depends_on = [{"task_id": second.id, "type": "FS", "lag_min": 0}]
+    second.depends_on = [{"task_id": first.id, "type": "FS", "lag_min": 0}]
+    meetings = [DummyEvent(60, "fixed", offset_min=0), DummyEvent(60, "fixed", offset_min=30)]
+    diagnosis = PlanDiagnostics(START, END).diagnose([first, second, *meetings])
+
+    assert not diagnosis.feasible
+    assert [(issue.kind, issue.severity) for issue in diagnosis.issues] == [
+        ("cycle", "error"),
+        ("fixed_overlap", "error"),
+    ]
+    assert {str(event_id) for event_id in diagnosis.issues[0].event_ids} == {str(first.id), str(second.id)}
+
+
+def test_fixed_events_that_cannot_happen_are_errors():
+    meeting = DummyEvent(240, "fixed", offset_min=0)
+    workshop = DummyEvent(120, "fixed").window(0, 300)
+    review = DummyEvent(90, "fixed").window(240, 480)
+    task = DummyEvent(120).window(0, 300)
+    diagnosis = PlanDiagnostics(START, END).diagnose([meeting, workshop, review, task])
+
+    assert not diagnosis.feasible
+    assert [(issue.kind, issue.severity) for issue in diagnosis.issues] == [
+        ("no_slot", "error"),
+        ("no_slot", "warning"),
+    ]
+    assert [issue.event_ids for issue in diagnosis.issues] == [[workshop.id], [task.id]]
+
+    start, end = START, START + timedelta(days=2)
+    calls = [DummyEvent(300, "fixed").window(0, 480), DummyEvent(300, "fixed").window(0, 480)]
+    diagnosis = PlanDiagnostics(start, end).diagnose([*calls, DummyEvent(60).window(0, 480)])
+
+    assert not diagnosis.feasible
+    day_issue = next(issue for issue in diagnosis.issues if issue.kind == "day_overload")
+    assert day_issue.severity == "error"
+    assert set(day_issue.event_ids) == {calls[0].id, calls[1].id}
@@ -0,0 +1,62 @@
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.schemas.plan import PlanSolution
+from app.services.planner.cp_sat_solver import CPSATSolver
+from app.services.planner.jobs import PlanJobStore
+from app.services.planner.pool import SolverPool
+
+
+class DummyEvent:
+    def __init__(self, duration_min: int, priority: int):
+        self.id = uuid4()
+        self.duration_min = duration_min
+        self.priority = priority
+        self.type = "flexible"
+        self.time_windows = []
+
+
+def _empty_solution(objective: float) -> PlanSolution:
+    now = datetime.utcnow()
+    return PlanSolution(horizon_start=now, horizon_end=now, scheduled=[], objective_value=objective, solver="test")
+
+
+def _fake_solve(objectives, on_solution=None):
+    for objective in objectives:
+        on_solution(_empty_solution(objective))
+    return _empty_solution(objectives[-1])
+
+
+def test_job_reports_incumbents_and_final_solution():
+    pool = SolverPool(kind="thread", max_workers=1, queue_limit=1)
+    store = PlanJobStore(max_incumbents=2)
+    try:
+        job = store.submit(pool, _fake_solve, [1.0, 2.0, 3.0])
+        deadline = time.monotonic() + 5
+        while job.finished_at is None and time.monotonic() < deadline:
+            time.sleep(0.001)
+        first = store.get(job.id).snapshot()
+        assert first.status == "succeeded"
+        assert [s.objective_value for s in first.incumbents] == [2.0, 3.0]
+        assert first.next_cursor == 3
+        assert first.result.objective_value == 3.0
+        assert store.get(job.id).snapshot(since=first.next_cursor).incumbents == []
+    finally:
+        pool.shutdown(wait=True)
+
+
+def test_cp_sat_streams_incumbents():
+    start = datetime.utcnow()
+    incumbents: list[PlanSolution] = []
+    solution = CPSATSolver().solve(
+        [DummyEvent(30, priority=3), DummyEvent(30, priority=7)],
+        families={},
+        pomodoro=None,
+        start=start,
+        end=start + timedelta(hours=1),
+        on_solution=incumbents.append,
+    )
+    assert solution is not None
+    assert incumbents
+    assert incumbents[-1].objective_value <= solution.objective_value
@@ -0,0 +1,78 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.services.planner.cp_sat_solver import CPSATSolver
+from app.services.planner.portfolio import solve_portfolio
+from app.services.planner.profiles import PROFILES
+from app.services.planner.snapshot import PlannerSnapshot
+
+START = datetime(2024, 1, 8, 9, 0)
+END = START + timedelta(hours=6)
+
+
+class DummyEvent:
+    def __init__(self, duration_min: int, priority: int = 5):
+        self.id = uuid4()
+        self.type = "flexible"
+        self.duration_min = duration_min
+        self.priority = priority
+        self.time_windows = []
+
+
+def _snapshot() -> PlannerSnapshot:
+    return PlannerSnapshot([DummyEvent(60, priority=3), DummyEvent(90, priority=8), DummyEvent(30)])
+
+
+def test_heuristic_plan_seeds_cp_sat():
+    incumbents = []
+    solution = solve_portfolio(_snapshot(), START, END, on_solution=incumbents.append)
+
+    assert solution.solver == "cp-sat"
+    assert incumbents[0].solver == "heuristic"
+    portfolio = solution.metadata_json["portfolio"]
+    assert portfolio["engine"] == "cp-sat"
+    assert portfolio["hinted_chunks"] == 3
+    assert portfolio["cp_sat_status"] == "OPTIMAL"
+    assert len(solution.scheduled) == 3
+
+
+def test_heuristic_plan_returned_when_budget_is_spent():
+    profile = replace(PROFILES["interactive"], max_time_in_seconds=0.0)
+    solution = solve_portfolio(_snapshot(), START, END, profile=profile)
+
+    assert solution.solver == "heuristic"
+    assert solution.metadata_json["portfolio"]["cp_sat_status"] == "skipped"
+    assert len(solution.scheduled) == 3
+
+
+def test_heuristic_plan_returned_when_cp_sat_finds_nothing(monkeypatch):
+    monkeypatch.setattr(CPSATSolver, "solve", lambda self, *args, **kwargs: None)
+    solution = solve_portfolio(_snapshot(), START, END)
+
+    assert solution.solver == "heuristic"
+    assert solution.metadata_json["portfolio"]["cp_sat_status"] == "NO_SOLUTION"
+    assert solution.metadata_json["unscheduled"] == []
+
+
+def test_multi_chunk_tasks_and_overlapping_meetings_keep_hints_valid():
+    split = DummyEvent(240)
+    split.flex = {"can_split": True, "min_chunk_min": 30, "max_splits": 3}
+    meetings = [DummyEvent(60), DummyEvent(60)]
+    for offset, meeting in zip((60, 90), meetings):
+        meeting.type = "fixed"
+        window_start = START + timedelta(minutes=offset)
+        meeting.time_windows = [{"start": window_start, "end": window_start + timedelta(minutes=60)}]
+    focus = DummyEvent(50, priority=9)
+    focus.pomodoro_opt_in = True
+    pomodoro = SimpleNamespace(
+        enabled=True, pomodoro_len_min=25, short_break_min=5, long_break_min=15, long_break_every=4
+    )
+    profile = replace(PROFILES["interactive"], num_workers=1)
+    snapshot = PlannerSnapshot([split, focus, *meetings], None, pomodoro)
+    solution = solve_portfolio(snapshot, START, END, profile=profile)
+
+    assert solution.solver == "cp-sat"
+    assert solution.metadata_json["portfolio"]["hinted_chunks"] >= 2
+    assert sum(str(chunk.event_id) == str(focus.id) for chunk in solution.scheduled) == 3
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.api import plan as plan_api
+from app.models.event import Event
+from app.services.planner.heuristic_solver import HeuristicPlanner
+
+NOW = datetime(2024, 1, 8, 9, 0)
+
+
+class DummyEvent:
+    def __init__(self, duration_min: int, priority: int = 5, type: str = "flexible", **extra):
+        self.id = uuid4()
+        self.type = type
+        self.duration_min = duration_min
+        self.priority = priority
+        self.family_key = extra.pop("family_key", None)
+        self.deadline = extra.pop("deadline", None)
+        self.time_windows = extra.pop("time_windows", [])
+        self.depends_on = extra.pop("depends_on", [])
+
+
+def _meeting(start: datetime, minutes: int) -> DummyEvent:
+    window = {"start": start, "end": start + timedelta(minutes=minutes)}
+    return DummyEvent(minutes, type="fixed", time_windows=[window])
+
+
+def _by_event(response):
+    grouped = {}
+    for proposal in response.proposals:
+        grouped.setdefault(str(proposal.event_id), []).append(proposal)
+    return grouped
+
+
+def test_proposals_avoid_fixed_events_and_respect_windows():
+    meeting = _meeting(NOW, 120)
+    afternoon = {"start": NOW + timedelta(hours=5), "end": NOW + timedelta(hours=8)}
+    task = DummyEvent(60)
+    windowed = DummyEvent(30, time_windows=[afternoon])
+    response = HeuristicPlanner().propose([meeting, task, windowed], {}, None, now=NOW, horizon=timedelta(hours=10))
+
+    grouped = _by_event(response)
+    assert str(meeting.id) not in grouped
+    assert len(grouped[str(task.id)]) == 3
+    for proposal in grouped[str(task.id)]:
+        assert proposal.suggested_start >= NOW + timedelta(hours=2)
+        assert proposal.suggested_end - proposal.suggested_start == timedelta(minutes=60)
+    for proposal in grouped[str(windowed.id)]:
+        assert afternoon["start"] <= proposal.suggested_start and proposal.suggested_end <= afternoon["end"]
+
+
+def test_proposals_rank_by_priority_family_and_deadline():
+    families = {"work": SimpleNamespace(weight=2.0)}
+    low = DummyEvent(30, priority=3)
+    weighted = DummyEvent(30, priority=3, family_key="work")
+    urgent = DummyEvent(30, priority=3, deadline=NOW + timedelta(hours=2))
+    response = HeuristicPlanner().propose([low, weighted, urgent], families, None, now=NOW, k=1)
+
+    order = [str(proposal.event_id) for proposal in response.proposals]
+    assert order.index(str(weighted.id)) < order.index(str(low.id))
+    assert order.index(str(urgent.id)) < order.index(str(low.id))
+    assert "before deadline" in response.proposals[order.index(str(urgent.id))].reasoning
+
+
+def test_proposals_honour_horizon_dependencies_and_k():
+    first = DummyEvent(120)
+    second = DummyEvent(30, depends_on=[{"task_id": str(first.id), "type": "FS", "lag_min": 0}])
+    too_long = DummyEvent(600)
+    response = HeuristicPlanner().propose(
+        [first, second, too_long], {}, None, now=NOW, horizon=timedelta(hours=4), k=2
+    )
+
+    grouped = _by_event(response)
+    assert str(too_long.id) not in grouped
+    assert len(grouped[str(second.id)]) == 2
+    assert all(proposal.suggested_start >= NOW + timedelta(hours=2) for proposal in grouped[str(second.id)])
+    assert all(proposal.suggested_end <= NOW + timedelta(hours=4) for proposal in response.proposals)
+
+
+@pytest.fixture()
+def client(session_factory, user_id, client):
+    with session_factory() as session:
+        session.add(Event(id=uuid4(), user_id=user_id, title="Report", type="flexible", duration_min=60, priority=5))
+        session.commit()
+    return client
+
+
+def test_cached_proposals_are_reused_until_the_ttl_bucket_changes(client, monkeypatch):
+    clock = {"now": datetime(2030, 1, 7, 9, 1, 10)}
+
+    class Clock(datetime):
+        @classmethod
+        def utcnow(cls):
+            return clock["now"]
+
+    monkeypatch.setattr(plan_api, "datetime", Clock)
+    monkeypatch.setattr(plan_api.settings, "planner_cache_ttl_seconds", 300.0)
+    first = client.get("/api/plan/proposals", params={"k": 3, "horizon_hours": 4})
+    assert first.status_code == 200
+    starts = sorted(datetime.fromisoformat(item["suggested_start"]) for item in first.json()["proposals"])
+    assert len(starts) == 3
+    assert starts[0] == datetime(2030, 1, 7, 9, 5)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("proposals should come from the cache")
+
+    clock["now"] = datetime(2030, 1, 7, 9, 4, 59)
+    with monkeypatch.context() as patch:
+        patch.setattr(HeuristicPlanner, "propose", fail)
+        second = client.get("/api/plan/proposals", params={"k": 3, "horizon_hours": 4})
+    assert second.json() == first.json()
+
+    clock["now"] = datetime(2030, 1, 7, 9, 5, 1)
+    third = client.get("/api/plan/proposals", params={"k": 3, "horizon_hours": 4})
+    starts = sorted(datetime.fromisoformat(item["suggested_start"]) for item in third.json()["proposals"])
+    assert len(starts) == 3
+    assert starts[0] == datetime(2030, 1, 7, 9, 10)
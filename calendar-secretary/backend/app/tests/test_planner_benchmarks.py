@@ -0,0 +1,43 @@
+from app.services.planner.rules import iter_dependencies, topological_sort
+from benchmarks.generators import synthetic_calendar
+from benchmarks.planner import CaseResult, compare, run_case
+
+
+def test_synthetic_calendar_is_seeded_and_acyclic():
+    events, families, pomodoro, start, end = synthetic_calendar(300, seed=7)
+    again, *_ = synthetic_calendar(300, seed=7)
+    assert [(e.id, e.type, e.duration_min, e.depends_on) for e in events] == [
+        (e.id, e.type, e.duration_min, e.depends_on) for e in again
+    ]
+    assert {"fixed", "flexible"} == {event.type for event in events}
+    assert set(families) >= {event.family_key for event in events} - {None}
+    assert pomodoro.enabled and end > start
+
+    edges = {str(event.id): {dep_id for dep_id, _, _ in iter_dependencies(event)} for event in events}
+    assert sum(map(len, edges.values())) > 0
+    assert len(topological_sort(edges.keys(), edges)) == len(events)
+
+
+def test_compare_flags_slowdowns_and_objective_drops():
+    baseline = {
+        "cases": {
+            "heuristic/100": {"wall_time": 0.010, "objective": 90.0},
+            "cp-sat/100": {"wall_time": 1.0, "objective": 1000.0},
+        }
+    }
+    results = [
+        CaseResult("heuristic", 100, 0.013, 90.0, None, 10, 90),
+        CaseResult("cp-sat", 100, 2.0, 900.0, 0.1, 10, 90),
+        CaseResult("heuristic", 1000, 9.0, 1.0, None, 10, 1),
+    ]
+    assert compare(results, baseline) == [
+        "cp-sat/100: wall time 1.000s -> 2.000s",
+        "cp-sat/100: objective 1000.0 -> 900.0",
+    ]
+
+
+def test_run_case_records_metrics():
+    result = run_case("heuristic", 20, repeat=1)
+    assert result.key == "heuristic/20"
+    assert result.objective == result.scheduled or result.scheduled >= result.objective
+    assert result.peak_memory_kb > 0
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.db import Base
+from app.models.event import Event, TaskDependency, TaskFamily, UserPomodoroSettings
+from app.models.user import User
+from app.services.planner.context import load_planner_snapshot
+from app.services.planner.heuristic_solver import HeuristicPlanner
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        future=True,
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def _seed(session, size: int) -> list[Event]:
+    user = User(id=uuid4(), email="user@example.com", hashed_password="secret")
+    session.add(user)
+    session.add(TaskFamily(key="work", name="Work"))
+    session.add(UserPomodoroSettings(user_id=user.id))
+    events = [
+        Event(id=uuid4(), user_id=user.id, title=f"Task {index}", type="flexible", duration_min=30, family_key="work")
+        for index in range(size)
+    ]
+    session.add_all(events)
+    session.flush()
+    session.add_all(
+        TaskDependency(task_id=later.id, depends_on_id=earlier.id, type="FS", lag_min=5)
+        for earlier, later in zip(events, events[1:])
+    )
+    session.commit()
+    return events
+
+
+@pytest.mark.parametrize("size", [3, 60])
+def test_context_loads_in_constant_queries(engine, size):
+    session_factory = sessionmaker(bind=engine, future=True)
+    with session_factory() as session:
+        _seed(session, size)
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with session_factory() as session:
+            snapshot = load_planner_snapshot(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert len(statements) == 4
+    assert len(snapshot) == size
+    assert snapshot.families["work"].weight == 1.0
+    assert snapshot.pomodoro.pomodoro_len_min == 25
+
+
+def test_context_is_detached_and_indexed(engine):
+    session_factory = sessionmaker(bind=engine, future=True)
+    with session_factory() as session:
+        first, second, third = (str(item.id) for item in _seed(session, 3))
+        snapshot = load_planner_snapshot(session)
+
+    row = snapshot.events[snapshot.index(second)]
+    assert not hasattr(row, "__dict__")
+    assert row.depends_on == ((first, "FS", 5),)
+    assert snapshot.dependents()[first] == [second]
+
+    start = datetime(2024, 1, 8, 9, 0)
+    solution = HeuristicPlanner().solve(snapshot, None, None, start, start + timedelta(hours=4))
+    starts = {str(chunk.event_id): chunk.start for chunk in solution.scheduled}
+    assert starts[first] < starts[second] < starts[third]
@@ -0,0 +1,73 @@
+import pickle
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.services.planner.cp_sat_solver import CPSATSolver
+from app.services.planner.heuristic_solver import HeuristicPlanner
+from app.services.planner.snapshot import PlannerSnapshot
+
+START = datetime(2024, 1, 8, 9, 0)
+
+
+class DummyEvent:
+    def __init__(self, duration_min: int, priority: int = 5, depends_on=None, time_windows=None):
+        self.id = uuid4()
+        self.title = f"Task {duration_min}"
+        self.duration_min = duration_min
+        self.priority = priority
+        self.family_key = "work"
+        self.type = "flexible"
+        self.deadline = START + timedelta(days=1)
+        self.time_windows = time_windows or []
+        self.depends_on = depends_on or []
+
+
+class DummyFamily:
+    weight = 2.0
+    min_daily_minutes = None
+    weekly_target_minutes = 120
+    max_daily_minutes = None
+
+
+def _events():
+    first = DummyEvent(30, time_windows=[{"start": START.isoformat(), "end": (START + timedelta(hours=2)).isoformat()}])
+    second = DummyEvent(45, priority=8, depends_on=[{"task_id": str(first.id), "type": "FS", "lag_min": 15}])
+    return [first, second]
+
+
+def test_snapshot_columns_round_trip_rows():
+    first, second = _events()
+    snapshot = PlannerSnapshot([first, second], {"work": DummyFamily()})
+
+    assert list(snapshot.durations) == [30, 45]
+    assert snapshot.windows(0) == [(START.astimezone(), START.astimezone() + timedelta(hours=2))]
+    assert snapshot.dependencies(snapshot.index(second.id)) == ((str(first.id), "FS", 15),)
+    row = snapshot.events[1]
+    assert (row.priority, row.family_key, row.deadline) == (8, "work", (START + timedelta(days=1)).astimezone())
+    with pytest.raises(AttributeError):
+        snapshot.ids = ()
+
+
+def test_snapshot_pickles_and_hashes_by_content():
+    events = _events()
+    snapshot = PlannerSnapshot(events, {"work": DummyFamily()})
+    restored = pickle.loads(pickle.dumps(snapshot))
+
+    assert restored.content_hash == snapshot.content_hash
+    assert [row.depends_on for row in restored.events] == [row.depends_on for row in snapshot.events]
+    assert PlannerSnapshot(reversed(events), {"work": DummyFamily()}).content_hash == snapshot.content_hash
+    assert snapshot.cache_key(START) != snapshot.cache_key(START + timedelta(days=1))
+
+    events[1].depends_on[0]["lag_min"] = 30
+    assert PlannerSnapshot(events, {"work": DummyFamily()}).content_hash != snapshot.content_hash
+
+
+def test_solvers_accept_snapshot():
+    first, second = _events()
+    snapshot = PlannerSnapshot([first, second], {"work": DummyFamily()})
+    for solver in (CPSATSolver(), HeuristicPlanner()):
+        solution = solver.solve(snapshot, None, None, START, START + timedelta(hours=4))
+        starts = {str(chunk.event_id): chunk.start for chunk in solution.scheduled}
+        assert starts[str(second.id)] >= starts[str(first.id)] + timedelta(minutes=45)
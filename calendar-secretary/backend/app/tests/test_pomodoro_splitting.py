@@ -3,7 +3,9 @@ from uuid import uuid4
 
 from types import SimpleNamespace
 
+from app.services.planner.cp_sat_solver import CPSATSolver
 from app.services.planner.heuristic_solver import HeuristicPlanner
+from app.services.planner.splitting import plan_chunks
 
 
 class DummyEvent:
@@ -15,9 +17,66 @@ class DummyEvent:
         self.pomodoro_opt_in = pomodoro_opt_in
 
 
+class DummySolverEvent(DummyEvent):
+    def __init__(self, duration_min: int, pomodoro_opt_in: bool = False, type_: str = "flexible", flex=None):
+        super().__init__(duration_min, pomodoro_opt_in)
+        self.type = type_
+        self.time_windows = []
+        self.flex = flex
+
+
+def _pomodoro_settings() -> SimpleNamespace:
+    return SimpleNamespace(enabled=True, pomodoro_len_min=25, short_break_min=5, long_break_min=15, long_break_every=4)
+
+
 def test_pomodoro_flag_is_acknowledged():
-    settings = SimpleNamespace(enabled=True, pomodoro_len_min=25, short_break_min=5, long_break_min=15, long_break_every=4)
+    settings = _pomodoro_settings()
     event = DummyEvent(180, pomodoro_opt_in=True)
     solver = HeuristicPlanner()
     plan = solver.solve([event], {}, settings, datetime.utcnow(), datetime.utcnow() + timedelta(hours=6))
     assert str(plan.scheduled[0].event_id) == str(event.id)
+
+
+def test_pomodoro_chunks_alternate_work_and_breaks():
+    specs = plan_chunks(DummyEvent(110, pomodoro_opt_in=True), _pomodoro_settings(), max_chunks=16)
+    assert [(spec.duration, spec.is_break) for spec in specs] == [
+        (25, False), (5, True), (25, False), (5, True), (25, False), (5, True), (25, False), (15, True), (10, False)
+    ]
+
+
+def test_pomodoro_chunk_count_is_capped():
+    specs = plan_chunks(DummyEvent(360, pomodoro_opt_in=True), _pomodoro_settings(), max_chunks=9)
+    work = [spec for spec in specs if not spec.is_break]
+    assert len(specs) <= 9
+    assert sum(spec.duration for spec in work) == 360
+
+
+def test_cp_sat_schedules_breaks_right_after_sessions():
+    event = DummySolverEvent(60, pomodoro_opt_in=True)
+    start = datetime(2024, 1, 8, 9, 0)
+    solution = CPSATSolver().solve([event], {}, _pomodoro_settings(), start, start + timedelta(hours=2))
+
+    assert solution is not None
+    chunks = sorted(solution.scheduled, key=lambda chunk: chunk.start)
+    assert [chunk.is_break for chunk in chunks] == [False, True, False, True, False]
+    for session, pause in zip(chunks[::2], chunks[1::2]):
+        assert pause.start == session.end
+    assert sum((c.end - c.start for c in chunks if not c.is_break), timedelta()) == timedelta(minutes=60)
+
+
+def test_cp_sat_splits_task_around_fixed_event():
+    start = datetime(2024, 1, 8, 9, 0)
+    meeting_start = start + timedelta(minutes=45)
+    meeting = DummySolverEvent(30, type_="fixed")
+    meeting.time_windows = [
+        {"start": meeting_start.isoformat(), "end": (meeting_start + timedelta(minutes=30)).isoformat()}
+    ]
+    task = DummySolverEvent(90, flex={"can_split": True, "min_chunk_min": 30, "max_splits": 2})
+
+    solution = CPSATSolver().solve([meeting, task], {}, None, start, start + timedelta(hours=2))
+
+    assert solution is not None
+    pieces = [chunk for chunk in solution.scheduled if str(chunk.event_id) == str(task.id)]
+    assert len(pieces) >= 2
+    assert sum((piece.end - piece.start for piece in pieces), timedelta()) == timedelta(minutes=90)
+    assert all(piece.end - piece.start >= timedelta(minutes=30) for piece in pieces)
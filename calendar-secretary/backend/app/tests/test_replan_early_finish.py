@@ -1,7 +1,9 @@
 from datetime import datetime, timedelta
 from uuid import uuid4
 
+from app.services.planner.cp_sat_solver import CPSATSolver
 from app.services.planner.heuristic_solver import HeuristicPlanner
+from app.services.planner.replan import build_warm_start
 
 
 class DummyEvent:
@@ -19,3 +21,31 @@ def test_replan_moves_next_event():
     plan = solver.solve(events, {}, None, now, now + timedelta(hours=2))
     assert plan.scheduled[0].start == now
     assert plan.scheduled[1].start == now + timedelta(minutes=30)
+
+
+class DummyFlexibleEvent(DummyEvent):
+    def __init__(self, duration_min: int):
+        super().__init__(duration_min)
+        self.type = "flexible"
+        self.time_windows = []
+
+
+def test_cp_sat_replan_keeps_chunks_outside_neighbourhood():
+    events = [DummyFlexibleEvent(30) for _ in range(3)]
+    start = datetime(2024, 1, 8, 9, 0)
+    end = start + timedelta(hours=4)
+    solver = CPSATSolver()
+    previous = solver.solve(events, {}, None, start, end)
+    assert previous is not None
+
+    edited = events[2]
+    edited.duration_min = 45
+    warm_start = build_warm_start(previous, [str(edited.id)], now=start, neighbourhood_minutes=0)
+    replanned = solver.solve(events, {}, None, start, end, warm_start=warm_start)
+
+    assert replanned is not None
+    before = {str(chunk.event_id): chunk.start for chunk in previous.scheduled}
+    after = {str(chunk.event_id): chunk for chunk in replanned.scheduled}
+    for event in events[:2]:
+        assert after[str(event.id)].start == before[str(event.id)]
+    assert after[str(edited.id)].end - after[str(edited.id)].start == timedelta(minutes=45)
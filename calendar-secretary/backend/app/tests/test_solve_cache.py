@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.services.planner.cache import SolveCache, plan_content_hash
+from app.services.planner.cp_sat_solver import CPSATSolver
+from app.services.planner.heuristic_solver import HeuristicPlanner
+
+
+class DummyEvent:
+    def __init__(self, duration_min: int, priority: int = 5):
+        self.id = uuid4()
+        self.duration_min = duration_min
+        self.priority = priority
+        self.family_key = None
+        self.type = "flexible"
+        self.time_windows = []
+
+
+def test_identical_inputs_produce_identical_chunk_ids():
+    events = [DummyEvent(30), DummyEvent(45, priority=8)]
+    start = datetime(2024, 1, 8, 9, 0)
+    end = start + timedelta(hours=3)
+    for solver in (CPSATSolver(), HeuristicPlanner()):
+        first = solver.solve(events, {}, None, start, end)
+        second = solver.solve(events, {}, None, start, end)
+        assert [c.chunk_id for c in first.scheduled] == [c.chunk_id for c in second.scheduled]
+        assert {c.chunk_id for c in first.scheduled} == {f"{event.id}:0" for event in events}
+
+
+def test_content_hash_ignores_order_and_tracks_changes():
+    events = [DummyEvent(30), DummyEvent(45)]
+    start = datetime(2024, 1, 8, 9, 0)
+    baseline = plan_content_hash(events, {}, None, start)
+    assert plan_content_hash(list(reversed(events)), {}, None, start) == baseline
+    events[0].duration_min = 35
+    assert plan_content_hash(events, {}, None, start) != baseline
+    assert plan_content_hash(events, {}, None, start + timedelta(days=1)) != plan_content_hash(
+        events, {}, None, start
+    )
+
+
+def test_cache_evicts_least_recently_used_and_expired_entries():
+    cache = SolveCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    expired = SolveCache(max_entries=2, ttl_seconds=0)
+    expired.set("a", 1)
+    assert expired.get("a") is None
@@ -0,0 +1,45 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.planner.pool import SolverPool, SolverPoolBusy, SolverPoolTimeout
+
+
+def _wait_until_idle(pool: SolverPool) -> None:
+    deadline = time.monotonic() + 5
+    while pool.pending and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_pool_rejects_submissions_beyond_queue_limit():
+    pool = SolverPool(kind="thread", max_workers=1, queue_limit=1)
+    release = threading.Event()
+    try:
+        running = pool.submit(release.wait)
+        queued = pool.submit(release.wait)
+        with pytest.raises(SolverPoolBusy):
+            pool.submit(release.wait)
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        _wait_until_idle(pool)
+        assert pool.submit(lambda: 42).result(timeout=5) == 42
+    finally:
+        release.set()
+        pool.shutdown(wait=True)
+
+
+def test_pool_run_enforces_deadline():
+    pool = SolverPool(kind="thread", max_workers=1, queue_limit=0)
+    release = threading.Event()
+    try:
+        with pytest.raises(SolverPoolTimeout):
+            asyncio.run(pool.run(release.wait, timeout=0.05))
+        release.set()
+        _wait_until_idle(pool)
+        assert asyncio.run(pool.run(lambda value: value * 2, 21, timeout=5)) == 42
+    finally:
+        release.set()
+        pool.shutdown(wait=True)
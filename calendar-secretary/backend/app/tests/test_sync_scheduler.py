@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+from app.services.sync.scheduler import SyncScheduler
+
+
+class RecordingSync:
+    def __init__(self, delay: float = 0.05, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls: list[tuple[str, set[str]]] = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, account_id, kinds):
+        with self._lock:
+            self.calls.append((account_id, set(kinds)))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if self.fail:
+            raise RuntimeError("server unavailable")
+        return {kind: 1 for kind in kinds}
+
+
+async def _drain(scheduler: SyncScheduler) -> None:
+    await asyncio.gather(*(state.task for state in scheduler.states.values() if state.task))
+
+
+def test_duplicate_triggers_are_coalesced():
+    sync = RecordingSync()
+
+    async def scenario():
+        scheduler = SyncScheduler(interval=60, sync_fn=sync, accounts_fn=list)
+        assert scheduler.trigger("alice", {"pull"})
+        await asyncio.sleep(0.01)
+        results = [scheduler.trigger("alice", {kind}) for kind in ("pull", "push", "pull")]
+        await _drain(scheduler)
+        return results
+
+    assert asyncio.run(scenario()) == [False, False, False]
+    assert sync.calls == [("alice", {"pull"}), ("alice", {"pull", "push"})]
+
+
+def test_concurrency_is_bounded_across_accounts():
+    sync = RecordingSync()
+
+    async def scenario():
+        scheduler = SyncScheduler(interval=60, max_concurrency=2, sync_fn=sync, accounts_fn=list)
+        for index in range(6):
+            scheduler.trigger(f"user-{index}")
+        await _drain(scheduler)
+
+    asyncio.run(scenario())
+    assert len(sync.calls) == 6
+    assert sync.peak == 2
+
+
+def test_failures_back_off_exponentially():
+    sync = RecordingSync(delay=0, fail=True)
+
+    async def scenario():
+        scheduler = SyncScheduler(interval=10, max_backoff=25, sync_fn=sync, accounts_fn=list)
+        delays = []
+        for _ in range(3):
+            scheduler.trigger("alice")
+            await _drain(scheduler)
+            delays.append(scheduler.states["alice"].next_due - time.monotonic())
+        return scheduler.status("alice"), delays
+
+    status, delays = asyncio.run(scenario())
+    assert status["failures"] == 3
+    assert status["last_error"] == "server unavailable"
+    assert [round(delay) for delay in delays] == [10, 20, 25]
+
+
+def test_periodic_loop_spreads_accounts_and_runs_due_ones():
+    sync = RecordingSync(delay=0)
+
+    async def scenario():
+        scheduler = SyncScheduler(interval=0.2, sync_fn=sync, accounts_fn=lambda: ["alice", "bob"], tick=0.02)
+        scheduler.start()
+        await asyncio.sleep(0.5)
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    accounts = [account for account, _ in sync.calls]
+    assert accounts.count("alice") >= 1 and accounts.count("bob") >= 1
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.services.planner.cp_sat_solver import CPSATSolver
+from app.services.planner.rules import TimeGrid
+
+
+class DummyEvent:
+    def __init__(self, duration_min: int, type_: str = "flexible", time_windows: list | None = None):
+        self.id = uuid4()
+        self.duration_min = duration_min
+        self.priority = 5
+        self.type = type_
+        self.time_windows = time_windows or []
+
+
+def test_grid_round_trips_slots_relative_to_origin():
+    origin = datetime(2024, 1, 8, 9, 0, tzinfo=timezone.utc)
+    grid = TimeGrid(origin, granularity_min=15)
+    assert grid.to_slot(origin) == 0
+    assert grid.to_slot(origin + timedelta(minutes=20)) == 1
+    assert grid.to_slot(origin + timedelta(minutes=20), round_up=True) == 2
+    assert grid.to_datetime(grid.to_slot(origin + timedelta(hours=3))) == origin + timedelta(hours=3)
+    assert grid.to_slot("2024-01-08T10:00:00") == 4
+    assert grid.duration_slots(50) == 4
+
+
+def test_coarse_grid_keeps_fixed_events_exact():
+    start = datetime(2024, 1, 8, 9, 0)
+    meeting_start = start + timedelta(minutes=10)
+    meeting = DummyEvent(
+        30,
+        type_="fixed",
+        time_windows=[
+            {"start": meeting_start.isoformat(), "end": (meeting_start + timedelta(minutes=30)).isoformat()}
+        ],
+    )
+    task = DummyEvent(50)
+    solution = CPSATSolver(granularity_min=15).solve([meeting, task], {}, None, start, start + timedelta(hours=2))
+
+    assert solution is not None
+    by_event = {str(chunk.event_id): chunk for chunk in solution.scheduled}
+    assert by_event[str(meeting.id)].start == meeting_start
+    assert by_event[str(meeting.id)].end == meeting_start + timedelta(minutes=30)
+    placed = by_event[str(task.id)]
+    assert placed.end - placed.start == timedelta(minutes=50)
+    assert (placed.start - start) % timedelta(minutes=15) == timedelta(0)
+    assert placed.start >= meeting_start + timedelta(minutes=30) or placed.end <= meeting_start
+
+
+def test_meeting_across_the_horizon_start_keeps_its_slots_busy():
+    start = datetime(2024, 1, 8, 9, 0)
+    meeting_start = start - timedelta(minutes=30)
+    meeting = DummyEvent(
+        60,
+        type_="fixed",
+        time_windows=[
+            {"start": meeting_start.isoformat(), "end": (meeting_start + timedelta(hours=1)).isoformat()}
+        ],
+    )
+    task = DummyEvent(
+        30, time_windows=[{"start": start.isoformat(), "end": (start + timedelta(hours=1)).isoformat()}]
+    )
+    solution = CPSATSolver().solve([meeting, task], {}, None, start, start + timedelta(hours=2))
+
+    assert solution is not None
+    by_event = {str(chunk.event_id): chunk for chunk in solution.scheduled}
+    assert by_event[str(meeting.id)].start == meeting_start
+    assert by_event[str(task.id)].start == start + timedelta(minutes=30)
@@ -0,0 +1,94 @@
+"""Seeded synthetic calendars for planner benchmarks."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import UUID
+
+FAMILIES = {
+    "work": (1.5, 120, 600),
+    "study": (1.2, 30, 240),
+    "health": (1.0, 30, 180),
+    "home": (0.8, None, 120),
+}
+
+
+def synthetic_calendar(
+    size: int,
+    seed: int = 0,
+    start: datetime = datetime(2024, 1, 8, 8, 0),
+    days: int | None = None,
+    fixed_share: float = 0.25,
+    dependency_share: float = 0.3,
+) -> tuple[list[SimpleNamespace], dict[str, SimpleNamespace], SimpleNamespace, datetime, datetime]:
+    """Return ``(events, families, pomodoro, start, end)`` for ``size`` events.
+
+    The horizon grows with the calendar (about 15 events per day) so load stays
+    comparable across sizes. Fixed meetings sit inside 09:00-18:00 working
+    hours. Flexible tasks get deadlines, optional windows, splitting and
+    pomodoro opt-in, and a ``dependency_share`` of them depend on up to two
+    earlier flexible tasks, so the dependency graph is always a DAG.
+    """
+    rng = random.Random(seed)
+    days = days or max(1, -(-size // 15))
+    horizon_end = start + timedelta(days=days)
+    family_keys = list(FAMILIES)
+    events: list[SimpleNamespace] = []
+    flexible_ids: list[str] = []
+    for index in range(size):
+        day = start.replace(hour=0, minute=0) + timedelta(days=rng.randrange(days))
+        event = SimpleNamespace(
+            id=UUID(int=seed * 10_000_000 + index),
+            title=f"Event {index}",
+            priority=rng.randint(1, 10),
+            family_key=rng.choice(family_keys) if rng.random() < 0.8 else None,
+            deadline=None,
+            time_windows=[],
+            flex=None,
+            pomodoro_opt_in=False,
+            depends_on=[],
+        )
+        if rng.random() < fixed_share:
+            meeting_start = day + timedelta(hours=rng.randint(9, 16), minutes=rng.choice((0, 15, 30, 45)))
+            event.type = "fixed"
+            event.duration_min = rng.choice((15, 30, 30, 45, 60, 90))
+            event.time_windows = [
+                {"start": meeting_start, "end": meeting_start + timedelta(minutes=event.duration_min)}
+            ]
+        else:
+            event.type = "flexible"
+            event.duration_min = rng.choice((15, 25, 30, 45, 60, 90, 120))
+            if rng.random() < 0.6:
+                event.deadline = min(horizon_end, day + timedelta(days=rng.randint(1, 3), hours=18))
+            if rng.random() < 0.3:
+                window_start = day + timedelta(hours=rng.randint(8, 14))
+                event.time_windows = [{"start": window_start, "end": window_start + timedelta(hours=rng.randint(3, 6))}]
+            if event.duration_min >= 60 and rng.random() < 0.5:
+                event.flex = {"can_split": True, "min_chunk_min": 30, "max_splits": 3}
+            event.pomodoro_opt_in = event.duration_min >= 45 and rng.random() < 0.3
+            if flexible_ids and rng.random() < dependency_share:
+                parents = rng.sample(flexible_ids[-50:], min(len(flexible_ids[-50:]), rng.randint(1, 2)))
+                event.depends_on = [
+                    {"task_id": parent, "type": rng.choice(("FS", "FS", "SS")), "lag_min": rng.choice((0, 0, 15))}
+                    for parent in parents
+                ]
+            flexible_ids.append(str(event.id))
+        events.append(event)
+
+    families = {
+        key: SimpleNamespace(
+            key=key,
+            name=key.title(),
+            weight=weight,
+            min_daily_minutes=min_daily,
+            weekly_target_minutes=None,
+            max_daily_minutes=max_daily,
+        )
+        for key, (weight, min_daily, max_daily) in FAMILIES.items()
+    }
+    pomodoro = SimpleNamespace(
+        enabled=True, pomodoro_len_min=25, short_break_min=5, long_break_min=15, long_break_every=4
+    )
+    return events, families, pomodoro, start, horizon_end
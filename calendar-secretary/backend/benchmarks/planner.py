@@ -0,0 +1,170 @@
+"""Measure planner scaling on synthetic calendars and compare with a baseline.
+
+Usage::
+
+    cd backend
+    python -m benchmarks.planner                      # compare with benchmarks/baseline.json
+    python -m benchmarks.planner --update             # record a new baseline
+    python -m benchmarks.planner --sizes 10 100 --solvers heuristic
+
+Every case records wall time (best of ``--repeat``), objective, CP-SAT gap and
+peak Python heap (``tracemalloc``; native OR-Tools memory is not included). The
+exit status is 1 when a case is slower than the baseline by more than
+``--time-tolerance`` or its objective dropped by more than
+``--objective-tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Callable
+
+from app.services.planner.cp_sat_solver import CPSATSolver
+from app.services.planner.heuristic_solver import HeuristicPlanner
+from app.services.planner.profiles import resolve_profile
+from app.services.planner.rules import iter_dependencies, topological_sort
+from benchmarks.generators import synthetic_calendar
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+SOLVERS = ("topological_sort", "heuristic", "cp-sat")
+# Wall-time changes below this many seconds are timer noise, not regressions.
+MIN_TIME_DELTA = 0.005
+
+
+@dataclass
+class CaseResult:
+    solver: str
+    size: int
+    wall_time: float
+    objective: float | None
+    gap: float | None
+    peak_memory_kb: int
+    scheduled: int | None
+
+    @property
+    def key(self) -> str:
+        return f"{self.solver}/{self.size}"
+
+
+def _runner(solver: str, size: int, seed: int, time_limit: float | None) -> Callable[[], Any]:
+    events, families, pomodoro, start, horizon_end = synthetic_calendar(size, seed)
+    if solver == "topological_sort":
+        edges = {str(event.id): {dep_id for dep_id, _, _ in iter_dependencies(event)} for event in events}
+        return lambda: topological_sort(edges.keys(), edges)
+    if solver == "heuristic":
+        return lambda: HeuristicPlanner().solve(events, families, pomodoro, start, horizon_end)
+    profile = resolve_profile("interactive")
+    if time_limit is not None:
+        profile = replace(profile, max_time_in_seconds=time_limit)
+    return lambda: CPSATSolver(profile=profile).solve(events, families, pomodoro, start, horizon_end)
+
+
+def run_case(solver: str, size: int, seed: int = 0, repeat: int = 3, time_limit: float | None = None) -> CaseResult:
+    run = _runner(solver, size, seed, time_limit)
+    timings = []
+    outcome = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        outcome = run()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    objective = gap = scheduled = None
+    if solver != "topological_sort" and outcome is not None:
+        objective = outcome.objective_value
+        gap = (outcome.metadata_json or {}).get("relative_gap")
+        scheduled = len(outcome.scheduled)
+    return CaseResult(solver, size, min(timings), objective, gap, peak // 1024, scheduled)
+
+
+def compare(
+    results: list[CaseResult],
+    baseline: dict[str, Any],
+    time_tolerance: float = 0.25,
+    objective_tolerance: float = 0.01,
+) -> list[str]:
+    """Describe every case that regressed against ``baseline["cases"]``."""
+    regressions = []
+    cases = baseline.get("cases", {})
+    for result in results:
+        reference = cases.get(result.key)
+        if reference is None:
+            continue
+        slower = result.wall_time - reference["wall_time"]
+        if slower > MIN_TIME_DELTA and result.wall_time > reference["wall_time"] * (1 + time_tolerance):
+            regressions.append(f"{result.key}: wall time {reference['wall_time']:.3f}s -> {result.wall_time:.3f}s")
+        if result.objective is not None and reference.get("objective") is not None:
+            floor = reference["objective"] - abs(reference["objective"]) * objective_tolerance
+            if result.objective < floor:
+                regressions.append(f"{result.key}: objective {reference['objective']:.1f} -> {result.objective:.1f}")
+    return regressions
+
+
+def _environment() -> dict[str, Any]:
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count()}
+
+
+def _format(value: float | int | None, pattern: str) -> str:
+    return "-" if value is None else format(value, pattern)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10_000])
+    parser.add_argument("--solvers", nargs="+", choices=SOLVERS, default=list(SOLVERS))
+    parser.add_argument("--max-cp-sat-size", type=int, default=1000, help="skip larger CP-SAT cases")
+    parser.add_argument("--time-limit", type=float, default=None, help="CP-SAT time limit per solve")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    parser.add_argument("--objective-tolerance", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'case':<24}{'wall s':>10}{'objective':>12}{'gap':>8}{'peak KiB':>10}{'chunks':>8}")
+    for solver in args.solvers:
+        for size in args.sizes:
+            if solver == "cp-sat" and size > args.max_cp_sat_size:
+                continue
+            result = run_case(solver, size, args.seed, args.repeat, args.time_limit)
+            results.append(result)
+            print(
+                f"{result.key:<24}{result.wall_time:>10.3f}{_format(result.objective, '.1f'):>12}"
+                f"{_format(result.gap, '.3f'):>8}{result.peak_memory_kb:>10}{_format(result.scheduled, 'd'):>8}"
+            )
+
+    if args.update:
+        payload = {
+            "environment": _environment(),
+            "seed": args.seed,
+            "cases": {result.key: asdict(result) for result in results},
+        }
+        args.baseline.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update to record one")
+        return 0
+    regressions = compare(
+        results, json.loads(args.baseline.read_text()), args.time_tolerance, args.objective_tolerance
+    )
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())